@@ -0,0 +1,128 @@
+# Benchmark analitik armada: AnalitikArmada.hitung atas 1M booking di BukuBesarBooking.
+#
+#   python benchmarks/bench_analitik.py --booking 1000000 --mobil 10000 --json hasil.json
+#
+# Ledger diisi langsung per kolom (tanpa objek Booking) dengan riwayat dua tahun. Diukur hitungan dingin
+# (tanpa cache) untuk jendela 30 hari, 365 hari dan seluruh riwayat, serta hitungan ulang dari cache.
+# Total pendapatan, utilisasi dan pendapatan per metode dicocokkan dengan hitungan loop Python biasa;
+# benchmark gagal bila satu hitungan dingin melebihi --batas-detik.
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import BukuBesarBooking, StatusBooking, Hatchback, Sedan, SUV
+from renex.analitik import AnalitikArmada
+
+AWAL = datetime.date(2025, 1, 1)
+HARI_RIWAYAT = 730
+
+class RiwayatLedger:
+    # Cukup antarmuka yang dipakai AnalitikArmada: booking_service.ledger
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+class Armada:
+    def __init__(self, daftar_mobil):
+        self.daftar_mobil = daftar_mobil
+
+    def get_all_mobil(self):
+        return self.daftar_mobil
+
+def isi_ledger(jumlah, armada, rng):
+    ledger = BukuBesarBooking()
+    for mobil in armada:
+        ledger._kode_untuk(mobil.id)
+    durasi = rng.integers(1, 8, jumlah)
+    status = rng.choice([BukuBesarBooking.DAFTAR_STATUS.index(s) for s in StatusBooking], jumlah,
+                        p=[0.2, 0.65, 0.05, 0.1])
+    kolom = {
+        "booking_id": np.arange(1, jumlah + 1),
+        "user_id": rng.integers(1, 50_000, jumlah),
+        "kendaraan": rng.integers(0, len(armada), jumlah),
+        "tgl_sewa": AWAL.toordinal() + rng.integers(0, HARI_RIWAYAT, jumlah),
+        "durasi_hari": durasi,
+        "total_biaya": durasi * rng.integers(200, 1500, jumlah) * 1000,
+        "status": status,
+        "metode": rng.integers(-1, len(BukuBesarBooking.DAFTAR_METODE), jumlah),
+    }
+    kolom["tgl_kembali"] = kolom["tgl_sewa"] + durasi
+    for nama, nilai in kolom.items():
+        tujuan = getattr(ledger, nama)
+        tujuan.frombytes(np.asarray(nilai, dtype=tujuan.typecode).tobytes())
+    ledger.versi += 1
+    return ledger
+
+def periksa(hasil, ledger, jumlah_mobil, tgl_dari, tgl_sampai):
+    # Hitung ulang dengan loop Python per booking (pendapatan dibagi rata per hari sewa)
+    awal, akhir = tgl_dari.toordinal(), tgl_sampai.toordinal() + 1
+    valid = {BukuBesarBooking.DAFTAR_STATUS.index(s) for s in (StatusBooking.ACTIVE, StatusBooking.COMPLETED)}
+    total, hari, per_metode = 0.0, 0, {}
+    for mulai, lama, biaya, status, metode in zip(ledger.tgl_sewa, ledger.durasi_hari, ledger.total_biaya,
+                                                  ledger.status, ledger.metode):
+        if status not in valid:
+            continue
+        terpakai = min(mulai + lama, akhir) - max(mulai, awal)
+        if terpakai <= 0:
+            continue
+        pendapatan = biaya / lama * terpakai
+        total += pendapatan
+        hari += terpakai
+        if metode >= 0:
+            per_metode[metode] = per_metode.get(metode, 0.0) + pendapatan
+    assert np.isclose(hasil["total_pendapatan"], total), "total pendapatan berbeda"
+    assert np.isclose(hasil["utilisasi"], hari / (jumlah_mobil * (akhir - awal))), "utilisasi berbeda"
+    assert np.allclose(hasil["per_metode"].to_numpy(),
+                       [per_metode.get(i, 0.0) for i in range(len(BukuBesarBooking.DAFTAR_METODE))])
+    assert np.isclose(hasil["harian"]["Pendapatan"].sum(), total), "kurva harian tidak sama dengan total"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analitik armada atas ledger besar")
+    parser.add_argument("--booking", type=int, default=1_000_000)
+    parser.add_argument("--mobil", type=int, default=10_000)
+    parser.add_argument("--batas-detik", type=float, default=5.0, help="batas waktu satu hitungan dingin")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    armada = [kelas[i % 3][0](f"C{i:05d}", f"Mobil {i}", f"L {i:05d} XX", 300000, "", kelas[i % 3][1])
+              for i in range(args.mobil)]
+    ledger = isi_ledger(args.booking, armada, rng)
+    inventory = Armada(armada)
+
+    jendela = {
+        "30_hari": (AWAL + datetime.timedelta(days=400), AWAL + datetime.timedelta(days=429)),
+        "365_hari": (AWAL + datetime.timedelta(days=200), AWAL + datetime.timedelta(days=564)),
+        "seluruh_riwayat": (AWAL, AWAL + datetime.timedelta(days=HARI_RIWAYAT + 7)),
+    }
+    hasil = {"booking": args.booking, "mobil": args.mobil}
+    for nama, (tgl_dari, tgl_sampai) in jendela.items():
+        analitik = AnalitikArmada(RiwayatLedger(ledger), inventory)
+        t0 = time.perf_counter()
+        keluaran = analitik.hitung(tgl_dari, tgl_sampai)
+        dingin = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        analitik.hitung(tgl_dari, tgl_sampai)
+        cache = time.perf_counter() - t0
+        periksa(keluaran, ledger, args.mobil, tgl_dari, tgl_sampai)
+        hasil[nama] = {"dingin_s": dingin, "cache_ms": cache * 1000, "utilisasi": keluaran["utilisasi"]}
+        assert dingin <= args.batas_detik, f"{nama}: {dingin:.2f} s melebihi batas {args.batas_detik} s"
+
+    print(f"{args.booking:,} booking, {args.mobil:,} mobil")
+    for nama, nilai in hasil.items():
+        if isinstance(nilai, dict):
+            print(f"{nama:<18}" + "  ".join(f"{k}={v:,.3f}" for k, v in nilai.items()))
+    print(f"OK: hasil cocok dengan loop Python, setiap hitungan dingin <= {args.batas_detik} s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
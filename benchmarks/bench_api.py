@@ -0,0 +1,258 @@
+# Load generator API RENEX: requests per detik dan latensi p50/p95/p99 per endpoint.
+#
+#   python benchmarks/bench_api.py --koneksi 32 --durasi 20 --json hasil.json
+#   python benchmarks/bench_api.py --url http://127.0.0.1:8501     # server yang sudah berjalan
+#
+# Tanpa --url, server headless (server.py --headless) dijalankan di subprocess dengan database sementara
+# berisi --mobil unit dan kunci API --kunci / --kunci-admin. Setiap koneksi login sekali (POST /api/masuk)
+# dan memakai tokennya untuk booking; selesai & laporan memakai kunci admin. Setiap koneksi memakai
+# HTTP/1.1 keep-alive dan mengirim request berikutnya begitu respons diterima (closed loop). Campuran beban diatur lewat --campuran.
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+AKAR_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_SERVER = os.path.join(AKAR_REPO, "server.py")
+
+CAMPURAN_DEFAULT = "cari=55,kutipan=25,booking=12,selesai=5,laporan=3"
+
+# --- Klien HTTP/1.1 minimal di atas asyncio streams (tanpa dependensi tambahan) ---
+class KoneksiHttp:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def buka(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def tutup(self):
+        if self.writer:
+            self.writer.close()
+
+    async def minta(self, metode, path, data=None, headers=None):
+        body = json.dumps(data).encode() if data is not None else b""
+        tambahan = "".join(f"{nama}: {nilai}\r\n" for nama, nilai in (headers or {}).items())
+        self.writer.write(
+            f"{metode} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n{tambahan}"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        kepala = await self.reader.readuntil(b"\r\n\r\n")
+        baris = kepala.decode("latin-1").split("\r\n")
+        status = int(baris[0].split(" ", 2)[1])
+        panjang = 0
+        for header in baris[1:]:
+            nama, _, nilai = header.partition(":")
+            if nama.lower() == "content-length":
+                panjang = int(nilai)
+        isi = await self.reader.readexactly(panjang) if panjang else b""
+        return status, isi
+
+# --- Server lokal ---
+def port_bebas():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def isi_armada(path_db, jumlah):
+    sys.path.insert(0, AKAR_REPO)
+    from renex import Database, InventoryManager, KELAS_KENDARAAN
+
+    atribut = {"Hatchback": 250, "Sedan": "High", "SUV": True}
+    daftar_kelas = list(KELAS_KENDARAAN)
+    inv = InventoryManager(Database(path_db))
+    armada = []
+    for i in range(1, jumlah + 1):
+        kelas = daftar_kelas[i % len(daftar_kelas)]
+        armada.append(KELAS_KENDARAAN[kelas](f"C{i:04d}", f"Mobil {i}", f"L {i:04d} BN",
+                                             300000 + 50000 * (i % 10), "", atribut[kelas]))
+    inv.tambah_unit_batch(armada)
+
+def mulai_server(folder, jumlah_mobil, kunci, kunci_admin):
+    path_db = os.path.join(folder, "bench_api.db")
+    isi_armada(path_db, jumlah_mobil)
+    port = port_bebas()
+    env = dict(os.environ, RENEX_DB_PATH=path_db, RENEX_LATENSI_GATEWAY="0",
+               RENEX_API_KEYS=kunci, RENEX_API_ADMIN_KEYS=kunci_admin)
+    proses = subprocess.Popen([sys.executable, SCRIPT_SERVER, "--headless", "--port", str(port)],
+                              env=env, cwd=folder, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    batas = time.monotonic() + 60
+    while time.monotonic() < batas:
+        try:
+            urllib.request.urlopen(urllib.request.Request(f"{url}/api/status", headers={"X-API-Key": kunci}),
+                                   timeout=1).read()
+            return proses, url
+        except OSError:
+            if proses.poll() is not None:
+                raise RuntimeError("server berhenti sebelum siap")
+            time.sleep(0.2)
+    proses.terminate()
+    raise RuntimeError("server tidak siap dalam 60 detik")
+
+# --- Beban ---
+class Beban:
+    def __init__(self, daftar_mobil, campuran, seed):
+        self.daftar_mobil = daftar_mobil
+        self.operasi = list(campuran)
+        self.bobot = list(campuran.values())
+        self.random = random.Random(seed)
+        # Booking yang dibuat selama benchmark, kandidat untuk diselesaikan
+        self.booking_dibuat = []
+        self.hari_ini = datetime.date.today()
+
+    def rentang(self):
+        mulai = self.hari_ini + datetime.timedelta(days=self.random.randint(1, 365))
+        return mulai, mulai + datetime.timedelta(days=self.random.randint(1, 4))
+
+    def request_berikut(self, id_klien):
+        # -> (nama operasi, metode, path, body)
+        operasi = self.random.choices(self.operasi, self.bobot)[0]
+        if operasi == "selesai" and not self.booking_dibuat:
+            operasi = "cari"
+        mulai, selesai = self.rentang()
+        if operasi == "cari":
+            query = {"tgl_mulai": mulai.isoformat(), "tgl_selesai": selesai.isoformat(), "limit": 20,
+                     "urutan": self.random.choice(["harga_asc", "harga_desc", "merk"])}
+            if self.random.random() < 0.5:
+                query["kelas"] = self.random.choice(["Hatchback", "Sedan", "SUV"])
+            return operasi, "GET", "/api/mobil?" + urllib.parse.urlencode(query), None
+        if operasi == "kutipan":
+            query = {"kendaraan_id": self.random.choice(self.daftar_mobil),
+                     "tgl_mulai": mulai.isoformat(), "tgl_selesai": selesai.isoformat()}
+            return operasi, "GET", "/api/kutipan?" + urllib.parse.urlencode(query), None
+        if operasi == "booking":
+            return operasi, "POST", "/api/booking", {
+                "metode_bayar": self.random.choice(["QRIS", "Virtual Account", "Transfer Bank"]),
+                "kendaraan_id": self.random.choice(self.daftar_mobil),
+                "tgl_mulai": mulai.isoformat(), "tgl_selesai": selesai.isoformat(),
+            }
+        if operasi == "selesai":
+            booking_id = self.booking_dibuat.pop(self.random.randrange(len(self.booking_dibuat)))
+            return operasi, "POST", f"/api/booking/{booking_id}/selesai", None
+        return operasi, "GET", "/api/laporan", None
+
+# Operasi yang memakai kunci admin; booking memakai token user milik koneksi
+OPERASI_ADMIN = ("selesai", "laporan")
+
+async def klien(id_klien, host, port, beban, waktu, hasil, kunci, kunci_admin):
+    # waktu = (mulai_ukur, selesai); hasil[operasi] = list latensi (ms), hasil["_status"][kode] = jumlah
+    koneksi = KoneksiHttp(host, port)
+    await koneksi.buka()
+    mulai_ukur, selesai = waktu
+    try:
+        # Login sekali per koneksi (PBKDF2 di server), di luar pengukuran
+        status, isi = await koneksi.minta("POST", "/api/masuk", {
+            "nama": f"Klien {id_klien}", "email": f"klien{id_klien}@bench.renex.id",
+            "password": f"rahasia-{id_klien}",
+        }, {"X-API-Key": kunci})
+        if status != 200:
+            raise RuntimeError(f"login klien {id_klien} gagal: HTTP {status}")
+        header_user = {"X-API-Key": kunci, "Authorization": f"Bearer {json.loads(isi)['token']}"}
+        header_admin = {"X-API-Key": kunci_admin}
+        while True:
+            sekarang = time.perf_counter()
+            if sekarang >= selesai:
+                break
+            operasi, metode, path, body = beban.request_berikut(id_klien)
+            status, isi = await koneksi.minta(metode, path, body,
+                                              header_admin if operasi in OPERASI_ADMIN else header_user)
+            akhir = time.perf_counter()
+            if operasi == "booking" and status == 201:
+                beban.booking_dibuat.extend(b["booking_id"] for b in json.loads(isi)["booking"])
+            if sekarang >= mulai_ukur:
+                hasil.setdefault(operasi, []).append((akhir - sekarang) * 1000)
+                kunci = f"{operasi}:{status}"
+                hasil["_status"][kunci] = hasil["_status"].get(kunci, 0) + 1
+    finally:
+        koneksi.tutup()
+
+def statistik(sampel, durasi):
+    urut = sorted(sampel)
+    n = len(urut)
+
+    def persentil(p):
+        return urut[min(n - 1, int(n * p))]
+
+    return {"n": n, "rps": n / durasi, "p50_ms": persentil(0.50), "p95_ms": persentil(0.95),
+            "p99_ms": persentil(0.99), "maks_ms": urut[-1]}
+
+async def jalankan_beban(url, args):
+    alamat = urllib.parse.urlsplit(url)
+    host, port = alamat.hostname, alamat.port or 80
+    permintaan = urllib.request.Request(f"{url}/api/mobil?limit=200", headers={"X-API-Key": args.kunci})
+    with urllib.request.urlopen(permintaan) as respons:
+        daftar_mobil = [mobil["id"] for mobil in json.loads(respons.read())["mobil"]]
+    if not daftar_mobil:
+        raise RuntimeError("armada kosong: tidak ada mobil untuk di-booking")
+
+    campuran = {}
+    for bagian in args.campuran.split(","):
+        nama, _, bobot = bagian.partition("=")
+        campuran[nama.strip()] = float(bobot)
+    beban = Beban(daftar_mobil, campuran, args.seed)
+
+    hasil = {"_status": {}}
+    mulai = time.perf_counter()
+    waktu = (mulai + args.pemanasan, mulai + args.pemanasan + args.durasi)
+    await asyncio.gather(*(klien(i, host, port, beban, waktu, hasil, args.kunci, args.kunci_admin)
+                           for i in range(args.koneksi)))
+
+    semua = [latensi for operasi, sampel in hasil.items() if operasi != "_status" for latensi in sampel]
+    ringkasan = {"total": statistik(semua, args.durasi)}
+    for operasi in campuran:
+        if hasil.get(operasi):
+            ringkasan[operasi] = statistik(hasil[operasi], args.durasi)
+    return ringkasan, dict(sorted(hasil["_status"].items()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator API RENEX")
+    parser.add_argument("--url", help="URL server yang sudah berjalan (default: jalankan server headless lokal)")
+    parser.add_argument("--mobil", type=int, default=200, help="jumlah unit di server lokal")
+    parser.add_argument("--koneksi", type=int, default=32, help="jumlah koneksi keep-alive paralel")
+    parser.add_argument("--durasi", type=float, default=20, help="detik pengukuran")
+    parser.add_argument("--pemanasan", type=float, default=2, help="detik awal yang tidak diukur")
+    parser.add_argument("--campuran", default=CAMPURAN_DEFAULT, help="bobot operasi, mis. cari=55,booking=12")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--kunci", default="bench-klien", help="X-API-Key klien (RENEX_API_KEYS server)")
+    parser.add_argument("--kunci-admin", default="bench-admin", help="X-API-Key admin (RENEX_API_ADMIN_KEYS server)")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    proses = None
+    folder = tempfile.TemporaryDirectory(prefix="renex_api_")
+    try:
+        url = args.url
+        if not url:
+            proses, url = mulai_server(folder.name, args.mobil, args.kunci, args.kunci_admin)
+        ringkasan, per_status = asyncio.run(jalankan_beban(url.rstrip("/"), args))
+    finally:
+        if proses:
+            proses.terminate()
+            proses.wait()
+        folder.cleanup()
+
+    print(f"{'operasi':<12}{'n':>9}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'maks':>9}  (ms)")
+    for nama, stat in ringkasan.items():
+        print(f"{nama:<12}{stat['n']:>9,}{stat['rps']:>10.1f}{stat['p50_ms']:>9.1f}{stat['p95_ms']:>9.1f}"
+              f"{stat['p99_ms']:>9.1f}{stat['maks_ms']:>9.1f}")
+    print("status: " + ", ".join(f"{kunci}={jumlah:,}" for kunci, jumlah in per_status.items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"koneksi": args.koneksi, "durasi": args.durasi, "hasil": ringkasan, "status": per_status},
+                      f, indent=2)
+
+if __name__ == "__main__":
+    main()
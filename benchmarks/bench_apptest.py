@@ -0,0 +1,136 @@
+# Benchmark startup & rerun RENEX memakai AppTest Streamlit (tanpa browser).
+#
+#   python benchmarks/bench_apptest.py --booking 500 --ulang 20 --json hasil.json
+#
+# - "cold start": modul renex dibuang dari sys.modules dan cache_resource dikosongkan,
+#   lalu diukur waktu run pertama sampai halaman login selesai dirender.
+# - "rerun": latensi satu rerun per halaman / tab admin untuk sesi yang sudah login.
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+AKAR_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_APP = os.path.join(AKAR_REPO, "streamlit_app.py")
+
+# (menu, tab admin) yang diukur per rerun
+SKENARIO = [
+    ("Katalog Mobil", None),
+    ("Pesanan Saya", None),
+    ("Admin Dashboard", "Manajemen Pesanan"),
+    ("Admin Dashboard", "Tambah Unit Mobil"),
+    ("Admin Dashboard", "Laporan Keuangan"),
+]
+
+def statistik(sampel):
+    urut = sorted(sampel)
+    return {
+        "n": len(urut),
+        "min_ms": urut[0],
+        "median_ms": statistics.median(urut),
+        "p95_ms": urut[min(len(urut) - 1, int(len(urut) * 0.95))],
+        "maks_ms": urut[-1],
+    }
+
+def jalankan(at):
+    t0 = time.perf_counter()
+    at.run()
+    durasi = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return durasi
+
+def isi_data(jumlah_booking):
+    import renex
+
+    db = renex.Database(os.environ["RENEX_DB_PATH"])
+    inv = renex.InventoryManager(db)
+    service = renex.BookingService(inv, db)
+    user = db.get_user_by_email("bench@renex.id") or db.buat_user("Benchmark", "bench@renex.id")
+
+    # Satu booking per hari per mobil agar jadwal tidak bentrok
+    armada = [mobil.id for mobil in inv.get_all_mobil()] or ["C01", "C02", "C03"]
+    awal = datetime.date.today() + datetime.timedelta(days=1)
+    for i in range(jumlah_booking):
+        tgl = awal + datetime.timedelta(days=i // len(armada))
+        service.buat_pesanan(user, armada[i % len(armada)], tgl, tgl + datetime.timedelta(days=1),
+                             list(renex.MetodeBayar)[i % len(renex.MetodeBayar)])
+    return user
+
+def buang_modul_app():
+    for nama in list(sys.modules):
+        if nama == "renex" or nama.startswith("renex.") or nama == "streamlit_app":
+            del sys.modules[nama]
+
+def ukur(args):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    hasil = {}
+
+    # --- Cold start: sampai halaman login tampil ---
+    sampel = []
+    for _ in range(args.cold):
+        buang_modul_app()
+        st.cache_resource.clear()
+        sampel.append(jalankan(AppTest.from_file(SCRIPT_APP, default_timeout=120)))
+    hasil["cold_start"] = statistik(sampel)
+
+    # --- Rerun per halaman untuk sesi yang sudah login ---
+    user = isi_data(args.booking)
+    # Service per proses (renex.layanan) dibuat ulang agar memuat booking yang baru diisi
+    buang_modul_app()
+    st.cache_resource.clear()
+    at = AppTest.from_file(SCRIPT_APP, default_timeout=120)
+    at.session_state["user"] = user
+    hasil["login_pertama"] = statistik([jalankan(at)])
+
+    for menu, tab in SKENARIO:
+        sampel = []
+        for _ in range(args.ulang):
+            at.session_state["menu"] = menu
+            # AppTest tidak bisa mengklik tab; pilihan tab diset ulang sebelum setiap run
+            if tab:
+                at.session_state["tab_admin"] = tab
+            sampel.append(jalankan(at))
+        hasil[f"rerun:{menu}" + (f"/{tab}" if tab else "")] = statistik(sampel)
+    return hasil
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup & rerun RENEX (AppTest)")
+    parser.add_argument("--cold", type=int, default=5, help="jumlah sampel cold start")
+    parser.add_argument("--ulang", type=int, default=20, help="jumlah rerun per skenario")
+    parser.add_argument("--booking", type=int, default=200, help="jumlah booking contoh yang diisi")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    # App dijalankan dari folder sementara: database dan thumbnail GambarStore ("car_images") ikut dihapus
+    # setelah benchmark dan tidak mengotori repo
+    cwd_awal = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="renex_bench_", ignore_cleanup_errors=True) as folder:
+        try:
+            os.chdir(folder)
+            os.environ["RENEX_DB_PATH"] = os.path.join(folder, "bench.db")
+            os.environ.setdefault("RENEX_LATENSI_GATEWAY", "0")
+            # User benchmark harus admin agar tab Admin Dashboard ikut diukur
+            os.environ["RENEX_ADMIN_EMAILS"] = "bench@renex.id"
+            sys.path.insert(0, AKAR_REPO)
+            hasil = ukur(args)
+        finally:
+            os.chdir(cwd_awal)
+
+    print(f"{'skenario':<45}{'n':>4}{'min':>10}{'median':>10}{'p95':>10}{'maks':>10}  (ms)")
+    for nama, stat in hasil.items():
+        print(f"{nama:<45}{stat['n']:>4}{stat['min_ms']:>10.1f}{stat['median_ms']:>10.1f}"
+              f"{stat['p95_ms']:>10.1f}{stat['maks_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"booking": args.booking, "hasil": hasil}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
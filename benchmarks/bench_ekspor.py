@@ -0,0 +1,119 @@
+# Benchmark ekspor laporan: cara lama (list dict + csv_data += row di streamlit_app) dibandingkan
+# EksporLaporan.ke_csv / ke_parquet, termasuk konversi ke bytes yang dilakukan st.download_button.
+#
+#   python benchmarks/bench_ekspor.py --booking 1000000 --json hasil.json
+#
+# Waktu diukur tanpa tracemalloc; puncak memori (tracemalloc) diukur di putaran terpisah dan dihitung
+# relatif terhadap memori sebelum ekspor, jadi riwayat booking itu sendiri tidak ikut terhitung.
+# Puncak memori ekspor baru kira-kira sebesar file hasil: Streamlit menyimpan seluruh payload di memori.
+import argparse
+import datetime
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from renex import Booking, Pembayaran, User, MetodeBayar, StatusBooking, Hatchback, Sedan, SUV
+from renex.ekspor import EksporLaporan, pa
+
+class RiwayatBooking:
+    # Cukup antarmuka yang dipakai EksporLaporan
+    def __init__(self, bookings):
+        self.bookings = bookings
+
+    def get_all_bookings(self):
+        return self.bookings
+
+def buat_riwayat(jumlah):
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    armada = [kelas[i % 3][0](f"C{i:04d}", f"Mobil {i}", f"L {i:04d} XX", 300000 + 1000 * i, "", kelas[i % 3][1])
+              for i in range(1, 1001)]
+    users = [User(i, f"Penyewa {i}", f"user{i}@bench.renex.id") for i in range(1, 5001)]
+    metode = list(MetodeBayar)
+    awal = datetime.date(2025, 1, 1)
+    bookings = []
+    for i in range(1, jumlah + 1):
+        mulai = awal + datetime.timedelta(days=i % 700)
+        mobil = armada[i % len(armada)]
+        booking = Booking(i, users[i % len(users)], mobil, mulai, mulai + datetime.timedelta(days=1 + i % 5),
+                          total_biaya=mobil.harga_sewa * (1 + i % 5))
+        booking.set_pembayaran(Pembayaran(i, booking.total_biaya, metode[i % 3]))
+        booking.status_booking = StatusBooking.COMPLETED if i % 4 else StatusBooking.ACTIVE
+        bookings.append(booking)
+    return bookings
+
+def csv_lama(bookings):
+    # Salinan logika baseline streamlit_app.py (sebelum EksporLaporan)
+    valid_bookings = [b for b in bookings if b.status_booking in ["Active", "Completed"]]
+    laporan_data = []
+    for b in valid_bookings:
+        laporan_data.append({
+            "ID Booking": b.booking_id,
+            "Tanggal Sewa": b.tgl_sewa.strftime("%Y-%m-%d"),
+            "Penyewa": b.user.nama,
+            "Mobil": f"{b.kendaraan.merk} ({b.kendaraan.nopol})",
+            "Durasi": f"{b.durasi_hari} Hari",
+            "Metode Bayar": b.pembayaran.metode if b.pembayaran else "N/A",
+            "Total Biaya": f"Rp {b.total_biaya:,.0f}",
+            "Status": b.status_booking
+        })
+    csv_header = "ID,Tanggal,Penyewa,Mobil,Total,Status\n"
+    csv_data = csv_header
+    for item in laporan_data:
+        row = f"{item['ID Booking']},{item['Tanggal Sewa']},{item['Penyewa']},{item['Mobil']},{item['Total Biaya']},{item['Status']}\n"
+        csv_data += row
+    return csv_data
+
+def download(fungsi):
+    # Yang dikerjakan st.download_button dengan data callable
+    data, _ = convert_data_to_bytes_and_infer_mime(fungsi(), RuntimeError("tipe data tidak didukung"))
+    return data
+
+def ukur(fungsi):
+    gc.collect()
+    t0 = time.perf_counter()
+    data = download(fungsi)
+    detik = time.perf_counter() - t0
+    ukuran = len(data)
+    del data
+    gc.collect()
+    tracemalloc.start()
+    dasar = tracemalloc.get_traced_memory()[0]
+    download(fungsi)
+    puncak = tracemalloc.get_traced_memory()[1] - dasar
+    tracemalloc.stop()
+    return {"detik": detik, "ukuran_mb": ukuran / 2**20, "puncak_memori_mb": puncak / 2**20,
+            "puncak_per_ukuran": puncak / ukuran}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ekspor laporan CSV / Parquet")
+    parser.add_argument("--booking", type=int, default=1_000_000)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    bookings = buat_riwayat(args.booking)
+    eksportir = EksporLaporan(RiwayatBooking(bookings))
+    hasil = {
+        "csv_lama": ukur(lambda: csv_lama(bookings)),
+        "ke_csv": ukur(eksportir.ke_csv),
+    }
+    if pa is not None:
+        hasil["ke_parquet"] = ukur(eksportir.ke_parquet)
+
+    print(f"{args.booking:,} booking")
+    print(f"{'cara':<12}{'detik':>9}{'ukuran MB':>12}{'puncak MB':>12}{'puncak/ukuran':>15}")
+    for nama, stat in hasil.items():
+        print(f"{nama:<12}{stat['detik']:>9.2f}{stat['ukuran_mb']:>12.1f}{stat['puncak_memori_mb']:>12.1f}"
+              f"{stat['puncak_per_ukuran']:>15.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"booking": args.booking, "hasil": hasil}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Benchmark log event RENEX: throughput append, group commit, dan waktu replay saat start.
+#
+#   python benchmarks/bench_eventlog.py --jumlah 10000000 --json hasil.json
+#
+# Beban: armada & user terdaftar, lalu siklus booking dibuat -> pembayaran diverifikasi -> booking selesai
+# (3 event per booking). Startup diukur dua kali: replay seluruh log tanpa snapshot, dan snapshot + ekor.
+import argparse
+import datetime
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import JenisEvent, LogEvent, EventStore, StatusBooking, MetodeBayar
+
+JUMLAH_MOBIL = 500
+JUMLAH_USER = 10_000
+DAFTAR_METODE = list(MetodeBayar)
+
+def event_awal():
+    yield JenisEvent.KENDARAAN_DITAMBAH, {"kendaraan": [{
+        "id": f"C{i:04d}", "kelas": "Sedan", "merk": "Honda Civic", "nopol": f"L {i:04d} BM",
+        "harga_sewa": 500000, "image_url": "", "atribut": "High", "is_available": True,
+    } for i in range(1, JUMLAH_MOBIL + 1)]}
+    for user_id in range(1, JUMLAH_USER + 1):
+        yield JenisEvent.USER_TERDAFTAR, {"user_id": user_id, "nama": f"User {user_id}", "email": f"u{user_id}@renex.id"}
+
+def event_booking(booking_id):
+    # Tiga event untuk satu booking; pay_id mengikuti booking_id
+    tgl = datetime.date(2025, 1, 1) + datetime.timedelta(days=booking_id // JUMLAH_MOBIL)
+    metode = DAFTAR_METODE[booking_id % len(DAFTAR_METODE)]
+    yield JenisEvent.BOOKING_DIBUAT, {"booking": [{
+        "booking_id": booking_id, "user_id": booking_id % JUMLAH_USER + 1,
+        "nama": f"User {booking_id % JUMLAH_USER + 1}", "email": f"u{booking_id % JUMLAH_USER + 1}@renex.id",
+        "kendaraan_id": f"C{booking_id % JUMLAH_MOBIL + 1:04d}",
+        "tgl_sewa": tgl.isoformat(), "tgl_kembali": (tgl + datetime.timedelta(days=1)).isoformat(),
+        "durasi_hari": 1, "total_biaya": 500000, "status": StatusBooking.PENDING,
+        "pembayaran": {"pay_id": booking_id, "jumlah": 500000, "metode": metode,
+                       "tgl_bayar": f"{tgl.isoformat()}T10:00:00", "status_sukses": False},
+    }]}
+    yield JenisEvent.PEMBAYARAN_DIVERIFIKASI, {"booking_id": booking_id, "status": StatusBooking.ACTIVE, "sukses": True}
+    yield JenisEvent.BOOKING_SELESAI, {"booking_id": booking_id}
+
+def isi_log(log, jumlah, booking_awal, ukuran_batch):
+    # -> (jumlah event, booking_id berikutnya)
+    ditulis, booking_id = 0, booking_awal
+    batch = []
+    sumber = event_awal() if booking_awal == 1 else iter(())
+    while ditulis + len(batch) < jumlah:
+        event = next(sumber, None)
+        if event is None:
+            sumber = event_booking(booking_id)
+            booking_id += 1
+            continue
+        batch.append(event)
+        if len(batch) >= ukuran_batch:
+            log.tambah_batch(batch)
+            ditulis += len(batch)
+            batch = []
+    if batch:
+        log.tambah_batch(batch)
+        ditulis += len(batch)
+    log.tunggu(log.seq_terakhir)
+    return ditulis, booking_id
+
+def ukur_group_commit(folder, jumlah_thread, per_thread):
+    # Banyak penulis yang masing-masing menunggu fsync: berapa event per fsync yang tercapai
+    log = LogEvent(folder)
+    fsync_awal = log.jumlah_fsync
+
+    def penulis():
+        for _ in range(per_thread):
+            log.tunggu(log.tambah(JenisEvent.STATUS_KENDARAAN, {"id": "C0001", "is_available": True}))
+
+    threads = [threading.Thread(target=penulis) for _ in range(jumlah_thread)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    durasi = time.perf_counter() - t0
+    jumlah_fsync = log.jumlah_fsync - fsync_awal
+    log.tutup()
+    total = jumlah_thread * per_thread
+    return {"event": total, "detik": durasi, "event_per_detik": total / durasi,
+            "fsync": jumlah_fsync, "event_per_fsync": total / max(jumlah_fsync, 1)}
+
+def rss_maks_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def ukuran_folder(folder):
+    return sum(os.path.getsize(os.path.join(folder, nama)) for nama in os.listdir(folder))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log event RENEX")
+    parser.add_argument("--jumlah", type=int, default=10_000_000, help="jumlah event di log")
+    parser.add_argument("--ekor", type=int, default=100_000, help="jumlah event setelah snapshot")
+    parser.add_argument("--batch", type=int, default=1000, help="ukuran batch append")
+    parser.add_argument("--folder", help="folder log (default: folder sementara, dihapus setelah selesai)")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    folder = args.folder or tempfile.mkdtemp(prefix="renex_eventlog_")
+    hasil = {"jumlah_event": args.jumlah}
+    try:
+        hasil["group_commit"] = ukur_group_commit(os.path.join(folder, "group"), 8, 500)
+
+        folder_log = os.path.join(folder, "log")
+        log = LogEvent(folder_log)
+        t0 = time.perf_counter()
+        ditulis, booking_berikut = isi_log(log, args.jumlah, 1, args.batch)
+        durasi = time.perf_counter() - t0
+        log.tutup()
+        hasil["append"] = {"event": ditulis, "detik": durasi, "event_per_detik": ditulis / durasi,
+                           "fsync": log.jumlah_fsync, "mb": ukuran_folder(folder_log) / 2**20}
+
+        # Startup tanpa snapshot: replay seluruh log
+        t0 = time.perf_counter()
+        store = EventStore(folder_log, interval_snapshot=2**62)
+        hasil["replay_penuh"] = {"detik": time.perf_counter() - t0, "event": store.jumlah_replay,
+                                 "booking": len(store._bookings), "rss_maks_mb": rss_maks_mb()}
+
+        t0 = time.perf_counter()
+        store.buat_snapshot()
+        hasil["buat_snapshot"] = {"detik": time.perf_counter() - t0}
+        isi_log(store.log, args.ekor, booking_berikut, args.batch)
+        store.tutup()
+        del store
+
+        # Startup normal: snapshot terbaru + ekor log
+        t0 = time.perf_counter()
+        store = EventStore(folder_log, interval_snapshot=2**62)
+        hasil["replay_snapshot"] = {"detik": time.perf_counter() - t0, "event": store.jumlah_replay,
+                                    "booking": len(store._bookings), "rss_maks_mb": rss_maks_mb()}
+        store.tutup()
+    finally:
+        if not args.folder:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    for nama, nilai in hasil.items():
+        if isinstance(nilai, dict):
+            print(f"{nama:<16}" + "  ".join(f"{k}={v:,.2f}" if isinstance(v, float) else f"{k}={v:,}"
+                                          for k, v in nilai.items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
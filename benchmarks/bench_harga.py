@@ -0,0 +1,124 @@
+# Benchmark mesin harga: latensi kutipan untuk 10k kendaraan dengan tanggal mulai tersebar di horizon 365 hari.
+#
+#   python benchmarks/bench_harga.py --mobil 10000 --json hasil.json
+#
+# - kompilasi: set_aturan + kutipan pertama (menyusun prefix-sum per tipe untuk seluruh horizon)
+# - kutipan:   satu mobil, rentang acak (memo dikosongkan agar yang diukur lookup prefix, bukan memo)
+# - kutipan_memo: rentang yang sama diulang (jalur memo, seperti rerun halaman katalog)
+# - kutipan_batch: seluruh armada untuk satu rentang (halaman / API katalog)
+# - loop_harian: aturan yang sama dievaluasi per hari dengan loop Python, sebagai pembanding dan
+#   sekaligus pemeriksa: setiap kutipan sampel harus sama persis dengan hasil loop harian.
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import ATURAN_HARGA, MesinHarga, Hatchback, Sedan, SUV
+
+def kutipan_loop_harian(aturan, kendaraan, tgl_mulai, tgl_selesai):
+    durasi = max((tgl_selesai - tgl_mulai).days, 1)
+    libur = aturan["hari_libur"]
+    total = 0.0
+    for i in range(durasi):
+        tgl = tgl_mulai + datetime.timedelta(days=i)
+        pengali = 1.0
+        if tgl.weekday() >= 5:
+            pengali *= 1 + aturan["tambahan_akhir_pekan"]
+        if tgl in libur or (tgl.month, tgl.day) in libur:
+            pengali *= 1 + aturan["tambahan_hari_libur"]
+        for kelas, mulai, selesai, faktor in aturan["musim"]:
+            if (kelas is None or kelas == type(kendaraan).__name__) and mulai <= tgl <= selesai:
+                pengali *= faktor
+        total += pengali
+    diskon = max((d for minimum, d in aturan["diskon_sewa_panjang"] if durasi >= minimum), default=0)
+    return int(round(kendaraan.harga_sewa * round(total, MesinHarga.PRESISI_PENGALI) * (1 - diskon)))
+
+def persentil_us(sampel):
+    urut = sorted(sampel)
+    return {"median_us": statistics.median(urut) / 1000, "p99_us": urut[int(len(urut) * 0.99)] / 1000}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latensi kutipan harga")
+    parser.add_argument("--mobil", type=int, default=10_000)
+    parser.add_argument("--sampel", type=int, default=20_000, help="jumlah kutipan per pengukuran")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    hari_ini = datetime.date.today()
+    # Aturan bawaan ditambah musim per tipe agar semua jenis aturan ikut dievaluasi
+    aturan = dict(ATURAN_HARGA, musim=[
+        (None, hari_ini + datetime.timedelta(days=60), hari_ini + datetime.timedelta(days=90), 1.25),
+        ("SUV", hari_ini + datetime.timedelta(days=150), hari_ini + datetime.timedelta(days=200), 1.4),
+    ])
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    armada = [kelas[i % 3][0](f"C{i:05d}", f"Mobil {i}", f"L {i:05d} XX", 200000 + 5000 * (i % 200), "",
+                              kelas[i % 3][1]) for i in range(args.mobil)]
+    mesin = MesinHarga()
+    hasil = {"mobil": args.mobil, "horizon_hari": mesin.horizon_hari}
+
+    t0 = time.perf_counter_ns()
+    mesin.set_aturan(aturan)
+    mesin.kutipan(armada[0], hari_ini, hari_ini + datetime.timedelta(days=1))
+    hasil["kompilasi_ms"] = (time.perf_counter_ns() - t0) / 1e6
+
+    def rentang():
+        mulai = hari_ini + datetime.timedelta(days=rng.randrange(mesin.horizon_hari))
+        durasi = rng.choice((1, 2, 3, 5, 7, 14, 30)) if rng.random() < 0.95 else rng.randint(31, 365)
+        return mulai, mulai + datetime.timedelta(days=durasi)
+
+    permintaan = [(rng.choice(armada), *rentang()) for _ in range(args.sampel)]
+
+    sampel = []
+    for mobil, mulai, selesai in permintaan:
+        mesin._memo.clear()
+        t0 = time.perf_counter_ns()
+        mesin.kutipan(mobil, mulai, selesai)
+        sampel.append(time.perf_counter_ns() - t0)
+    hasil["kutipan"] = persentil_us(sampel)
+
+    sampel = []
+    for mobil, mulai, selesai in permintaan[:1000] * 10:
+        t0 = time.perf_counter_ns()
+        mesin.kutipan(mobil, mulai, selesai)
+        sampel.append(time.perf_counter_ns() - t0)
+    hasil["kutipan_memo"] = persentil_us(sampel)
+
+    sampel = []
+    for _ in range(200):
+        mulai, selesai = rentang()
+        t0 = time.perf_counter_ns()
+        mesin.kutipan_batch(armada, mulai, selesai)
+        sampel.append(time.perf_counter_ns() - t0)
+    hasil["kutipan_batch_armada"] = persentil_us(sampel)
+
+    sampel = []
+    for mobil, mulai, selesai in permintaan[:2000]:
+        t0 = time.perf_counter_ns()
+        harapan = kutipan_loop_harian(aturan, mobil, mulai, selesai)
+        sampel.append(time.perf_counter_ns() - t0)
+        if mesin.kutipan(mobil, mulai, selesai) != harapan:
+            raise AssertionError(f"kutipan {mobil.id} {mulai} - {selesai} berbeda dengan loop harian")
+    hasil["loop_harian"] = persentil_us(sampel)
+    mulai, selesai = rentang()
+    batch = mesin.kutipan_batch(armada, mulai, selesai).tolist()
+    if batch != [mesin.kutipan(mobil, mulai, selesai) for mobil in armada]:
+        raise AssertionError("kutipan_batch berbeda dengan kutipan per mobil")
+
+    print(f"{args.mobil:,} mobil, horizon {mesin.horizon_hari} hari, kompilasi {hasil['kompilasi_ms']:.2f} ms")
+    for nama, nilai in hasil.items():
+        if isinstance(nilai, dict):
+            print(f"{nama:<22}" + "  ".join(f"{k}={v:,.1f}" for k, v in nilai.items()))
+    print("kutipan cocok dengan loop harian (2,000 sampel) dan kutipan_batch")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Benchmark impor armada massal: 100k unit dari file CSV / JSON sampai tersimpan di SQLite dan ter-index.
+#
+#   python benchmarks/bench_impor.py --unit 100000 --json hasil.json
+#
+# Per format diukur tahap baca (parse pandas), validasi (kolom vektor + konstruksi objek) dan
+# tambah_unit_batch (satu transaksi + satu pembaruan index) ke database baru. Sebagai pembanding,
+# --pembanding unit dimasukkan satu per satu lewat tambah_unit (jalur form "Tambah Unit Mobil").
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import Database, InventoryManager
+from renex.impor import ImportArmada
+
+def buat_baris(jumlah):
+    atribut = {"Hatchback": lambda i: str(150 + i % 200), "Sedan": lambda i: ["Standard", "High", "Luxury"][i % 3],
+               "SUV": lambda i: ["ya", "tidak"][i % 2]}
+    kelas = list(atribut)
+    for i in range(1, jumlah + 1):
+        k = kelas[i % 3]
+        yield {"kelas": k, "merk": f"Mobil {i}", "nopol": f"L {i:06d} XX", "harga_sewa": str(200000 + 1000 * (i % 500)),
+               "atribut": atribut[k](i), "image_url": ""}
+
+def file_csv(jumlah):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["kelas", "merk", "nopol", "harga_sewa", "atribut", "image_url"])
+    writer.writeheader()
+    writer.writerows(buat_baris(jumlah))
+    return buffer.getvalue().encode("utf-8")
+
+def file_json(jumlah):
+    return json.dumps(list(buat_baris(jumlah))).encode("utf-8")
+
+def ukur_impor(data, nama_file, folder):
+    path = os.path.join(folder, f"{nama_file}.db")
+    inv = InventoryManager(Database(path))
+    importer = ImportArmada(inv)
+    hasil = {}
+    t0 = time.perf_counter()
+    df = importer.baca(data, nama_file)
+    hasil["baca_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    kendaraan, kesalahan = importer.validasi(df)
+    hasil["validasi_s"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    if not importer.simpan(kendaraan):
+        raise AssertionError("simpan impor gagal")
+    hasil["simpan_index_s"] = time.perf_counter() - t0
+    if kesalahan or len(inv.get_all_mobil()) != len(df):
+        raise AssertionError(f"impor tidak lengkap: {len(kesalahan)} baris ditolak")
+    hasil["total_s"] = hasil["baca_s"] + hasil["validasi_s"] + hasil["simpan_index_s"]
+    hasil["unit_per_detik"] = len(df) / hasil["total_s"]
+    # Dimuat ulang dari database: semua unit harus ada
+    if len(InventoryManager(Database(path)).get_all_mobil()) != len(df):
+        raise AssertionError("jumlah unit di database tidak sama")
+    return hasil
+
+def ukur_satu_per_satu(jumlah, folder):
+    inv = InventoryManager(Database(os.path.join(folder, "satu.db")))
+    importer = ImportArmada(inv)
+    kendaraan, _ = importer.validasi(importer.baca(file_csv(jumlah), "satu.csv"))
+    t0 = time.perf_counter()
+    for unit in kendaraan:
+        unit.id = inv.alokasi_id()[0]
+        inv.tambah_unit(unit)
+    durasi = time.perf_counter() - t0
+    return {"total_s": durasi, "unit_per_detik": jumlah / durasi}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark impor armada massal")
+    parser.add_argument("--unit", type=int, default=100_000)
+    parser.add_argument("--pembanding", type=int, default=5_000, help="jumlah unit untuk jalur tambah_unit")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="renex_impor_")
+    try:
+        hasil = {
+            "csv": ukur_impor(file_csv(args.unit), "armada.csv", folder),
+            "json": ukur_impor(file_json(args.unit), "armada.json", folder),
+            "tambah_unit": ukur_satu_per_satu(args.pembanding, folder),
+        }
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(f"{args.unit:,} unit (tambah_unit: {args.pembanding:,} unit)")
+    for nama, stat in hasil.items():
+        print(f"{nama:<12}" + "  ".join(f"{k}={v:,.2f}" for k, v in stat.items()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"unit": args.unit, "hasil": hasil}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
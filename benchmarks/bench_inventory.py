@@ -0,0 +1,81 @@
+# Micro-benchmark index InventoryManager: biaya lookup per operasi saat armada tumbuh dari 10 ke 100k unit.
+#
+#   python benchmarks/bench_inventory.py --json hasil.json
+#
+# Lookup id/nopol dan range harga sempit seharusnya datar (O(1) / O(log n)).
+# Kolom "scan_linear" adalah cara lama (loop daftar_mobil) sebagai pembanding.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import InventoryManager, Hatchback, Sedan, SUV
+
+UKURAN_ARMADA = [10, 100, 1_000, 10_000, 100_000]
+
+def buat_armada(jumlah):
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    armada = []
+    for i in range(1, jumlah + 1):
+        cls, atribut = kelas[i % 3]
+        armada.append(cls(f"C{i:06d}", f"Mobil {i}", f"L {i:06d} XX", 100000 + 10 * i, "", atribut))
+    inv = InventoryManager()
+    inv.tambah_unit_batch(armada)
+    return inv
+
+def ns_per_op(fungsi, argumen):
+    # Ambil waktu terbaik dari 3 putaran agar tidak terpengaruh noise
+    terbaik = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter_ns()
+        for arg in argumen:
+            fungsi(arg)
+        terbaik = min(terbaik, (time.perf_counter_ns() - t0) / len(argumen))
+    return terbaik
+
+def scan_linear(inv, id_k):
+    for mobil in inv.daftar_mobil:
+        if mobil.id == id_k:
+            return mobil
+    return None
+
+def ukur(jumlah, jumlah_op, rng):
+    inv = buat_armada(jumlah)
+    ids = [f"C{rng.randint(1, jumlah):06d}" for _ in range(jumlah_op)]
+    nopols = [f"L {rng.randint(1, jumlah):06d} XX" for _ in range(jumlah_op)]
+    # Rentang harga selebar 10 unit: hasilnya berukuran tetap, sehingga yang diukur hanya biaya pencarian
+    harga = [100000 + 10 * rng.randint(1, max(jumlah - 10, 1)) for _ in range(jumlah_op)]
+    # Scan linear dibatasi jumlah sampelnya karena O(n)
+    ids_scan = ids[:max(10, jumlah_op * 10 // max(jumlah, 1))]
+    return {
+        "armada": jumlah,
+        "get_mobil_by_id_ns": ns_per_op(inv.get_mobil_by_id, ids),
+        "get_mobil_by_nopol_ns": ns_per_op(inv.get_mobil_by_nopol, nopols),
+        "range_harga_10_unit_ns": ns_per_op(lambda h: inv.get_mobil_by_harga(h, h + 90), harga),
+        "scan_linear_ns": ns_per_op(lambda id_k: scan_linear(inv, id_k), ids_scan),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark index InventoryManager")
+    parser.add_argument("--op", type=int, default=20_000, help="jumlah operasi per pengukuran")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    hasil = [ukur(jumlah, args.op, rng) for jumlah in UKURAN_ARMADA]
+
+    kolom = [k for k in hasil[0] if k != "armada"]
+    print(f"{'armada':>8}" + "".join(f"{k.removesuffix('_ns'):>24}" for k in kolom) + "  (ns/op)")
+    for baris in hasil:
+        print(f"{baris['armada']:>8,}" + "".join(f"{baris[k]:>24,.0f}" for k in kolom))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
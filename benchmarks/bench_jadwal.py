@@ -0,0 +1,102 @@
+# Benchmark jadwal sewa (JadwalSewa per kendaraan): 100k booking tersebar di 10k kendaraan.
+#
+#   python benchmarks/bench_jadwal.py --mobil 10000 --booking 100000 --json hasil.json
+#
+# Mengukur throughput reservasi (termasuk penolakan overlap), latensi is_tersedia per kendaraan, dan
+# query "mobil mana yang bebas dari X sampai Y" untuk seluruh armada. Hasil query dicocokkan dengan
+# scan naif atas semua booking (cara lama) sekaligus sebagai pembanding waktu.
+# Query seluruh armada berbiaya O(armada * log booking_per_mobil), scan naif O(total booking): pada
+# ~10 booking per mobil keduanya setara, dengan --booking 1000000 scan naif sudah dua kali lebih lambat.
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import InventoryManager, Sedan
+
+AWAL = datetime.date(2026, 1, 1)
+HORIZON_HARI = 730
+
+def rentang_acak(rng):
+    mulai = AWAL + datetime.timedelta(days=rng.randrange(HORIZON_HARI))
+    return mulai, mulai + datetime.timedelta(days=rng.randint(1, 7))
+
+def tersedia_naif(armada, bookings, tgl_mulai, tgl_selesai):
+    # Cara lama: telusuri semua booking untuk mencari mobil yang terpakai di rentang tersebut
+    terpakai = {id_k for id_k, mulai, selesai in bookings if mulai < tgl_selesai and selesai > tgl_mulai}
+    return [mobil.id for mobil in armada if mobil.id not in terpakai]
+
+def persentil_us(sampel):
+    urut = sorted(sampel)
+    return {"median_us": statistics.median(urut) / 1000, "p99_us": urut[int(len(urut) * 0.99)] / 1000}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jadwal sewa per kendaraan")
+    parser.add_argument("--mobil", type=int, default=10_000)
+    parser.add_argument("--booking", type=int, default=100_000, help="jumlah percobaan reservasi")
+    parser.add_argument("--query", type=int, default=50, help="jumlah query ketersediaan seluruh armada")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    inv = InventoryManager()
+    inv.tambah_unit_batch([Sedan(f"C{i:05d}", f"Mobil {i}", f"L {i:05d} XX", 500000, "", "High")
+                           for i in range(1, args.mobil + 1)])
+    armada = inv.get_all_mobil()
+    hasil = {"mobil": args.mobil}
+
+    # --- Reservasi ---
+    bookings = []
+    t0 = time.perf_counter()
+    for booking_id in range(1, args.booking + 1):
+        id_k = f"C{rng.randint(1, args.mobil):05d}"
+        mulai, selesai = rentang_acak(rng)
+        if inv.reservasi(id_k, mulai, selesai, booking_id):
+            bookings.append((id_k, mulai, selesai))
+    durasi = time.perf_counter() - t0
+    hasil["reservasi"] = {"percobaan": args.booking, "diterima": len(bookings),
+                          "ditolak_overlap": args.booking - len(bookings),
+                          "per_detik": args.booking / durasi}
+
+    # --- is_tersedia satu kendaraan ---
+    sampel = []
+    for _ in range(20_000):
+        id_k = f"C{rng.randint(1, args.mobil):05d}"
+        mulai, selesai = rentang_acak(rng)
+        t0 = time.perf_counter_ns()
+        inv.is_tersedia(id_k, mulai, selesai)
+        sampel.append(time.perf_counter_ns() - t0)
+    hasil["is_tersedia"] = persentil_us(sampel)
+
+    # --- Seluruh armada: bebas dari X sampai Y ---
+    sampel, sampel_naif = [], []
+    for _ in range(args.query):
+        mulai, selesai = rentang_acak(rng)
+        t0 = time.perf_counter_ns()
+        bebas = [mobil.id for mobil in inv.get_mobil_tersedia_antara(mulai, selesai)]
+        sampel.append(time.perf_counter_ns() - t0)
+        t0 = time.perf_counter_ns()
+        bebas_naif = tersedia_naif(armada, bookings, mulai, selesai)
+        sampel_naif.append(time.perf_counter_ns() - t0)
+        if bebas != bebas_naif:
+            raise AssertionError(f"hasil berbeda dengan scan naif untuk {mulai} - {selesai}")
+    hasil["tersedia_antara_armada"] = persentil_us(sampel)
+    hasil["tersedia_antara_naif"] = persentil_us(sampel_naif)
+
+    for nama, nilai in hasil.items():
+        if isinstance(nilai, dict):
+            print(f"{nama:<24}" + "  ".join(f"{k}={v:,.1f}" if isinstance(v, float) else f"{k}={v:,}"
+                                          for k, v in nilai.items()))
+    print(f"hasil query cocok dengan scan naif ({args.query} query)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
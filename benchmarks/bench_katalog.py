@@ -0,0 +1,117 @@
+# Benchmark rerun halaman Katalog Mobil (AppTest) saat armada tumbuh: 100, 10k dan 100k unit.
+#
+#   python benchmarks/bench_katalog.py --ulang 20 --json hasil.json
+#
+# Per ukuran armada dibuat database baru, app dimuat dingin (proses baru menurut renex.layanan), lalu:
+# - "rerun":        filter tidak berubah (hasil cari_mobil dari cache)
+# - "ganti filter": kelas / urutan / rentang harga berganti setiap rerun (cache miss, query index)
+# - "tanggal":      rentang tanggal ketersediaan berganti setiap rerun (cache miss + cek jadwal per unit)
+# - "halaman":      pindah halaman katalog (hasil dari cache, kartu yang dirender berbeda)
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+AKAR_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_APP = os.path.join(AKAR_REPO, "streamlit_app.py")
+
+from bench_apptest import statistik, jalankan, buang_modul_app
+
+UKURAN_ARMADA = [100, 10_000, 100_000]
+
+def isi_armada(path_db, path_gambar, jumlah):
+    import renex
+
+    db = renex.Database(path_db)
+    inv = renex.InventoryManager(db)
+    atribut = {"Hatchback": 250, "Sedan": "High", "SUV": True}
+    daftar_kelas = list(renex.KELAS_KENDARAAN)
+    armada = []
+    for i in range(1, jumlah + 1):
+        kelas = daftar_kelas[i % len(daftar_kelas)]
+        armada.append(renex.KELAS_KENDARAAN[kelas](f"C{i:06d}", f"Mobil {i}", f"L {i:06d} XX",
+                                                   200000 + 50000 * (i % 37), path_gambar, atribut[kelas]))
+    inv.tambah_unit_batch(armada)
+    return db.get_user_by_email("bench@renex.id") or db.buat_user("Benchmark", "bench@renex.id")
+
+def ukur_armada(jumlah, args, rng):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from PIL import Image
+
+    # App dijalankan dari folder sementara: thumbnail GambarStore ("car_images") tidak mengotori repo.
+    # Semua unit memakai satu foto lokal agar tidak ada unduhan jaringan.
+    folder = tempfile.mkdtemp(prefix="renex_katalog_")
+    cwd_awal = os.getcwd()
+    try:
+        os.chdir(folder)
+        Image.new("RGB", (1200, 800), (40, 90, 160)).save("mobil.png")
+        os.environ["RENEX_DB_PATH"] = os.path.join(folder, "bench.db")
+        user = isi_armada(os.environ["RENEX_DB_PATH"], os.path.join(folder, "mobil.png"), jumlah)
+        buang_modul_app()
+        st.cache_resource.clear()
+        at = AppTest.from_file(SCRIPT_APP, default_timeout=600)
+        at.session_state["user"] = user
+        at.session_state["menu"] = "Katalog Mobil"
+        hasil = {"armada": jumlah, "muat_awal": statistik([jalankan(at)])}
+
+        hasil["rerun"] = statistik([jalankan(at) for _ in range(args.ulang)])
+
+        harga_min, harga_max = 200000, 200000 + 50000 * 36
+        urutan = list(at.selectbox(key="urutan_katalog").options)
+        sampel = []
+        for i in range(args.ulang):
+            at.session_state["filter_kelas_katalog"] = ["Semua", "Hatchback", "Sedan", "SUV"][i % 4]
+            at.session_state["urutan_katalog"] = urutan[i % len(urutan)]
+            bawah = harga_min + 50000 * rng.randrange(18)
+            at.session_state["filter_harga_katalog"] = (bawah, min(bawah + 50000 * 18, harga_max))
+            sampel.append(jalankan(at))
+        hasil["ganti_filter"] = statistik(sampel)
+
+        hari_ini = datetime.date.today()
+        sampel = []
+        for i in range(args.ulang):
+            mulai = hari_ini + datetime.timedelta(days=1 + i)
+            at.session_state["filter_tgl_katalog"] = (mulai, mulai + datetime.timedelta(days=3))
+            sampel.append(jalankan(at))
+        hasil["tanggal"] = statistik(sampel)
+
+        sampel = []
+        for i in range(args.ulang):
+            at.session_state["halaman_katalog"] = 1 + i % 5
+            sampel.append(jalankan(at))
+        hasil["halaman"] = statistik(sampel)
+        return hasil
+    finally:
+        os.chdir(cwd_awal)
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rerun Katalog Mobil per ukuran armada (AppTest)")
+    parser.add_argument("--ulang", type=int, default=20, help="jumlah rerun per skenario")
+    parser.add_argument("--armada", type=int, nargs="+", default=UKURAN_ARMADA)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RENEX_LATENSI_GATEWAY", "0")
+    sys.path.insert(0, AKAR_REPO)
+    rng = random.Random(1)
+    semua = [ukur_armada(jumlah, args, rng) for jumlah in args.armada]
+
+    print(f"{'armada':>8}  {'skenario':<14}{'n':>4}{'min':>10}{'median':>10}{'p95':>10}{'maks':>10}  (ms)")
+    for hasil in semua:
+        for nama, stat in hasil.items():
+            if nama != "armada":
+                print(f"{hasil['armada']:>8,}  {nama:<14}{stat['n']:>4}{stat['min_ms']:>10.1f}"
+                      f"{stat['median_ms']:>10.1f}{stat['p95_ms']:>10.1f}{stat['maks_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(semua, f, indent=2)
+
+if __name__ == "__main__":
+    main()
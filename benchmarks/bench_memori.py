@@ -0,0 +1,200 @@
+# Benchmark memori model domain: bytes per booking dan per kendaraan, sebelum dan sesudah model ringkas.
+#
+#   python benchmarks/bench_memori.py --booking 1000000 --mobil 1000000 --json hasil.json
+#
+# "lama" adalah salinan kelas baseline (objek ber-__dict__, id str(uuid4())[:8], status "Active" string
+# biasa); "baru" adalah kelas renex (__slots__, id integer, StatusBooking / MetodeBayar enum).
+# "ledger" adalah baris yang sama di BukuBesarBooking (kolom array.array) untuk riwayat massal.
+# "service" adalah angka yang sebenarnya dipakai aplikasi: semua yang ditahan BookingService per booking
+# (objek Booking + Pembayaran, baris ledger, agregat, index per id / user / aktif, dan interval di JadwalSewa).
+# Angka ini lebih besar dari "baru" saja, dan bisa melebihi "lama": model lama tidak punya index maupun jadwal.
+# Memori diukur dengan tracemalloc sebagai selisih sebelum/sesudah membangun N objek, termasuk semua
+# objek turunan yang dibuat per record (string id, tanggal, Pembayaran, dst).
+import argparse
+import datetime
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import uuid
+from abc import ABC, abstractmethod
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import (Booking, Pembayaran, User, MetodeBayar, StatusBooking, BukuBesarBooking, BookingService,
+                   InventoryManager, Hatchback, Sedan, SUV)
+
+# --- Model lama (salinan baseline streamlit_app.py) ---
+class KendaraanLama(ABC):
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url):
+        self.id = id_k
+        self.merk = merk
+        self.nopol = nopol
+        self.harga_sewa = harga_sewa
+        self.image_url = image_url
+        self.is_available = True
+
+    @abstractmethod
+    def get_detail_info(self):
+        pass
+
+class SedanLama(KendaraanLama):
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, tingkat_kenyamanan):
+        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
+        self.tingkat_kenyamanan = tingkat_kenyamanan
+
+    def get_detail_info(self):
+        return f"Sedan - Kenyamanan: {self.tingkat_kenyamanan}"
+
+class UserLama:
+    def __init__(self, user_id, nama, email):
+        self.user_id = user_id
+        self.nama = nama
+        self.email = email
+
+class PembayaranLama:
+    def __init__(self, pay_id, jumlah, metode):
+        self.pay_id = pay_id
+        self.jumlah = jumlah
+        self.metode = metode
+        self.tgl_bayar = datetime.datetime.now()
+        self.status_sukses = False
+
+class BookingLama:
+    def __init__(self, booking_id, user, kendaraan, tgl_mulai, tgl_selesai):
+        self.booking_id = booking_id
+        self.user = user
+        self.kendaraan = kendaraan
+        self.tgl_sewa = tgl_mulai
+        self.tgl_kembali = tgl_selesai
+        delta = tgl_selesai - tgl_mulai
+        self.durasi_hari = delta.days if delta.days > 0 else 1
+        self.total_biaya = self.kendaraan.harga_sewa * self.durasi_hari
+        self.status_booking = "Active"
+        self.pembayaran = None
+
+AWAL_ORDINAL = datetime.date(2026, 1, 1).toordinal()
+METODE_LAMA = ["QRIS", "Virtual Account", "Transfer Bank"]
+
+def ukur(bangun, jumlah):
+    # -> (bytes per record, objek hasil agar tetap hidup selama pengukuran)
+    gc.collect()
+    tracemalloc.start()
+    dasar = tracemalloc.get_traced_memory()[0]
+    hasil = bangun(jumlah)
+    terpakai = tracemalloc.get_traced_memory()[0] - dasar
+    tracemalloc.stop()
+    return terpakai / jumlah, hasil
+
+def mobil_lama(jumlah):
+    return [SedanLama(f"C{i:07d}", f"Mobil {i}", f"L {i:07d} XX", 500000, "https://contoh.renex.id/mobil.png",
+                      "High") for i in range(1, jumlah + 1)]
+
+def mobil_baru(jumlah):
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    return [kelas[i % 3][0](f"C{i:07d}", f"Mobil {i}", f"L {i:07d} XX", 500000, "https://contoh.renex.id/mobil.png",
+                            kelas[i % 3][1]) for i in range(1, jumlah + 1)]
+
+def booking_lama(armada, users):
+    def bangun(jumlah):
+        hasil = []
+        for i in range(jumlah):
+            mulai = datetime.date.fromordinal(AWAL_ORDINAL + i % 700)
+            booking = BookingLama(str(uuid.uuid4())[:8], users[i % len(users)], armada[i % len(armada)],
+                                  mulai, mulai + datetime.timedelta(days=1 + i % 5))
+            booking.pembayaran = PembayaranLama(f"PAY-{str(uuid.uuid4())[:6]}", booking.total_biaya,
+                                                METODE_LAMA[i % 3])
+            booking.pembayaran.status_sukses = True
+            hasil.append(booking)
+        return hasil
+    return bangun
+
+def booking_baru(armada, users):
+    metode = list(MetodeBayar)
+
+    def bangun(jumlah):
+        hasil = []
+        for i in range(jumlah):
+            mulai = datetime.date.fromordinal(AWAL_ORDINAL + i % 700)
+            mobil = armada[i % len(armada)]
+            booking = Booking(i + 1, users[i % len(users)], mobil, mulai, mulai + datetime.timedelta(days=1 + i % 5),
+                              total_biaya=mobil.harga_sewa * (1 + i % 5))
+            booking.set_pembayaran(Pembayaran(i + 1, booking.total_biaya, metode[i % 3]))
+            booking.pembayaran.verifikasi()
+            booking.status_booking = StatusBooking.COMPLETED if i % 4 else StatusBooking.ACTIVE
+            hasil.append(booking)
+        return hasil
+    return bangun
+
+def service_penuh(armada, users):
+    # Jalur yang sama dengan buat_pesanan tanpa storage: reservasi jadwal lalu _catat ke semua index.
+    # Setiap mobil mendapat interval berurutan (maks 5 hari, jarak 6 hari) sehingga tidak ada yang bentrok.
+    inv = InventoryManager()
+    inv.tambah_unit_batch(armada)
+    service = BookingService(inv)
+    metode = list(MetodeBayar)
+
+    def bangun(jumlah):
+        for i in range(jumlah):
+            mobil = armada[i % len(armada)]
+            mulai = datetime.date.fromordinal(AWAL_ORDINAL + 6 * (i // len(armada)))
+            booking = Booking(i + 1, users[i % len(users)], mobil, mulai, mulai + datetime.timedelta(days=1 + i % 5),
+                              total_biaya=mobil.harga_sewa * (1 + i % 5))
+            booking.set_pembayaran(Pembayaran(i + 1, booking.total_biaya, metode[i % 3]))
+            booking.pembayaran.verifikasi()
+            inv.reservasi(mobil.id, booking.tgl_sewa, booking.tgl_kembali, booking.booking_id)
+            service._catat(booking)
+            # Tiga dari empat booking selesai (seperti booking_baru) dan melepas jadwalnya
+            if i % 4:
+                service.selesaikan_pesanan(booking)
+        return service
+    return bangun
+
+def ledger(bookings):
+    def bangun(jumlah):
+        buku = BukuBesarBooking()
+        for booking in bookings[:jumlah]:
+            buku.tambah(booking)
+        return buku
+    return bangun
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memori model domain (lama vs baru)")
+    parser.add_argument("--booking", type=int, default=1_000_000)
+    parser.add_argument("--mobil", type=int, default=1_000_000)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    hasil = {"booking": args.booking, "mobil": args.mobil}
+    hasil["mobil_lama"], _ = ukur(mobil_lama, args.mobil)
+    hasil["mobil_baru"], _ = ukur(mobil_baru, args.mobil)
+
+    # Booking merujuk ke armada & user yang sama (tidak ikut dihitung per booking)
+    armada_lama, armada_baru = mobil_lama(10_000), mobil_baru(10_000)
+    users_lama = [UserLama(str(uuid.uuid4())[:8], f"User {i}", f"user{i}@renex.id") for i in range(10_000)]
+    users_baru = [User(i, f"User {i}", f"user{i}@renex.id") for i in range(10_000)]
+    hasil["booking_lama"], bookings = ukur(booking_lama(armada_lama, users_lama), args.booking)
+    del bookings
+    hasil["booking_baru"], bookings = ukur(booking_baru(armada_baru, users_baru), args.booking)
+    hasil["ledger_per_booking"], buku = ukur(ledger(bookings), args.booking)
+    hasil["ledger_kolom_per_booking"] = buku.ukuran_bytes() / args.booking
+    del bookings, buku
+    hasil["service_per_booking"], _ = ukur(service_penuh(armada_baru, users_baru), args.booking)
+
+    print(f"{args.mobil:,} kendaraan, {args.booking:,} booking (bytes per record)")
+    print(f"{'':<18}{'lama':>10}{'baru':>10}{'hemat':>9}")
+    for nama in ("mobil", "booking"):
+        lama, baru = hasil[f"{nama}_lama"], hasil[f"{nama}_baru"]
+        print(f"{nama:<18}{lama:>10,.0f}{baru:>10,.0f}{1 - baru / lama:>9.0%}")
+    print(f"{'ledger (kolom)':<18}{'':>10}{hasil['ledger_per_booking']:>10,.0f}"
+          f"   (buffer array {hasil['ledger_kolom_per_booking']:.0f} bytes/baris)")
+    service = hasil["service_per_booking"]
+    print(f"{'BookingService':<18}{hasil['booking_lama']:>10,.0f}{service:>10,.0f}"
+          f"{1 - service / hasil['booking_lama']:>9.0%}   (total per booking yang ditahan aplikasi)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
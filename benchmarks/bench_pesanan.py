@@ -0,0 +1,87 @@
+# Benchmark "Pesanan Saya" dan daftar booking aktif saat total riwayat tumbuh sampai 1M booking.
+#
+#   python benchmarks/bench_pesanan.py --json hasil.json
+#
+# Satu user "pengamat" memiliki riwayat tetap; booking user lain terus ditambahkan (sebagian
+# diselesaikan) sampai tiap ukuran tercapai. Per ukuran diukur latensi halaman pertama riwayat user,
+# halaman pertama booking aktif (tab Manajemen Pesanan) beserta jumlahnya, dibandingkan dengan filter
+# lama atas seluruh all_bookings (dibatasi sampelnya karena O(total booking)).
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import BookingService, InventoryManager, User, MetodeBayar, StatusBooking, Sedan
+
+UKURAN = [1_000, 10_000, 100_000, 1_000_000]
+AWAL = datetime.date(2026, 1, 1)
+
+def median_us(fungsi, ulang):
+    sampel = []
+    for _ in range(ulang):
+        t0 = time.perf_counter_ns()
+        fungsi()
+        sampel.append(time.perf_counter_ns() - t0)
+    return statistics.median(sampel) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Pesanan Saya & booking aktif vs total riwayat")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN, help="total booking per pengukuran")
+    parser.add_argument("--mobil", type=int, default=10_000)
+    parser.add_argument("--user", type=int, default=10_000)
+    parser.add_argument("--ulang", type=int, default=200)
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    inv = InventoryManager()
+    inv.tambah_unit_batch([Sedan(f"C{i:05d}", f"Mobil {i}", f"L {i:05d} XX", 500000, "", "High")
+                           for i in range(args.mobil)])
+    service = BookingService(inv)
+    users = [User(i, f"User {i}", f"user{i}@bench.renex.id") for i in range(1, args.user + 1)]
+    pengamat = users[0]
+    metode = list(MetodeBayar)
+
+    hasil = []
+    dibuat = 0
+    for ukuran in sorted(args.ukuran):
+        # Booking ke-i: mobil i % armada, tiap putaran armada bergeser 2 hari -> tidak pernah bentrok
+        while dibuat < ukuran:
+            mulai = AWAL + datetime.timedelta(days=2 * (dibuat // args.mobil))
+            user = pengamat if dibuat < 30 else users[dibuat % args.user]
+            booking = service.buat_pesanan(user, f"C{dibuat % args.mobil:05d}", mulai,
+                                           mulai + datetime.timedelta(days=1), metode[dibuat % 3])
+            if dibuat % 4:
+                service.selesaikan_pesanan(booking)
+            dibuat += 1
+
+        semua = service.get_all_bookings()
+        ulang_naif = max(3, args.ulang * 1000 // ukuran)
+        baris = {
+            "total_booking": ukuran,
+            "booking_aktif": service.jumlah_bookings_aktif(),
+            "pesanan_saya_us": median_us(lambda: service.get_bookings_user(pengamat.user_id, 0, 10), args.ulang),
+            "aktif_halaman_us": median_us(lambda: (service.jumlah_bookings_aktif(),
+                                                   service.get_bookings_aktif(0, 20)), args.ulang),
+            "pesanan_saya_naif_us": median_us(
+                lambda: [b for b in semua if b.user.user_id == pengamat.user_id][::-1][:10], ulang_naif),
+            "aktif_naif_us": median_us(
+                lambda: [b for b in semua if b.status_booking == StatusBooking.ACTIVE][:20], ulang_naif),
+        }
+        hasil.append(baris)
+
+    kolom = [k for k in hasil[0] if k not in ("total_booking", "booking_aktif")]
+    print(f"{'total':>10}{'aktif':>9}" + "".join(f"{k.removesuffix('_us'):>22}" for k in kolom) + "  (µs, median)")
+    for baris in hasil:
+        print(f"{baris['total_booking']:>10,}{baris['booking_aktif']:>9,}"
+              + "".join(f"{baris[k]:>22,.1f}" for k in kolom))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+if __name__ == "__main__":
+    main()
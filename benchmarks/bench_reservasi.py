@@ -0,0 +1,115 @@
+# Stress test reservasi paralel: thread pool yang membuat, menyelesaikan dan membaca booking pada
+# sekumpulan kecil mobil "favorit" sekaligus (banyak bentrok, banyak perebutan lock per kendaraan).
+#
+#   python benchmarks/bench_reservasi.py --worker 16 --operasi 200000 --json hasil.json
+#
+# Sebagian worker hanya membaca (is_tersedia, sedang_disewa, get_jadwal, cari_mobil) selama penulis
+# mengubah jadwal; exception apa pun di pembaca maupun penulis membuat benchmark gagal. Di akhir
+# dipastikan tidak ada double booking: booking Active per mobil tidak saling tumpang tindih dan jadwal
+# di inventory berisi persis booking Active tersebut.
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import InventoryManager, BookingService, Sedan, User, MetodeBayar, StatusBooking
+
+AWAL = datetime.date(2026, 1, 1)
+
+def rentang_acak(rng, horizon):
+    mulai = AWAL + datetime.timedelta(days=rng.randrange(horizon))
+    return mulai, mulai + datetime.timedelta(days=rng.randint(1, 5))
+
+def penulis(nomor, args, service, inv, ids_mobil):
+    rng = random.Random(nomor)
+    user = User(nomor, f"User {nomor}", f"user{nomor}@bench.renex.id")
+    dibuat = diselesaikan = 0
+    for _ in range(args.operasi // args.worker):
+        mulai, selesai = rentang_acak(rng, args.horizon)
+        booking = service.buat_pesanan(user, rng.choice(ids_mobil), mulai, selesai, MetodeBayar.QRIS)
+        if booking:
+            dibuat += 1
+            if rng.random() < args.rasio_selesai and service.selesaikan_pesanan(booking):
+                diselesaikan += 1
+    return "tulis", args.operasi // args.worker, dibuat, diselesaikan
+
+def pembaca(nomor, args, inv, ids_mobil):
+    rng = random.Random(-nomor)
+    jumlah = 0
+    for _ in range(args.operasi // args.worker):
+        id_k = rng.choice(ids_mobil)
+        mulai, selesai = rentang_acak(rng, args.horizon)
+        inv.is_tersedia(id_k, mulai, selesai)
+        inv.sedang_disewa(id_k, mulai)
+        for mulai_j, selesai_j, _ in inv.get_jadwal(id_k, mulai):
+            assert mulai_j < selesai_j, "interval jadwal rusak"
+        inv.cari_mobil(tgl_mulai=mulai, tgl_selesai=selesai)
+        jumlah += 1
+    return "baca", jumlah, 0, 0
+
+def verifikasi(service, inv, ids_mobil):
+    aktif = {}
+    for booking in service.get_all_bookings():
+        if booking.status_booking == StatusBooking.ACTIVE:
+            aktif.setdefault(booking.kendaraan.id, []).append(booking)
+    for id_k in ids_mobil:
+        bookings = sorted(aktif.get(id_k, []), key=lambda b: b.tgl_sewa)
+        for a, b in zip(bookings, bookings[1:]):
+            assert b.tgl_sewa >= a.tgl_kembali, f"double booking pada {id_k}: {a.booking_id} & {b.booking_id}"
+        jadwal = [(mulai, selesai, booking_id) for mulai, selesai, booking_id in inv.get_jadwal(id_k)]
+        harapan = [(b.tgl_sewa, b.tgl_kembali, b.booking_id) for b in bookings]
+        assert jadwal == harapan, f"jadwal {id_k} tidak sama dengan booking Active"
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test reservasi paralel")
+    parser.add_argument("--worker", type=int, default=16, help="jumlah thread penulis (pembaca sama banyak)")
+    parser.add_argument("--operasi", type=int, default=200_000, help="total percobaan booking")
+    parser.add_argument("--mobil", type=int, default=20, help="jumlah mobil yang diperebutkan")
+    parser.add_argument("--horizon", type=int, default=120, help="rentang hari tanggal mulai")
+    parser.add_argument("--rasio-selesai", type=float, default=0.3)
+    parser.add_argument("--switch-interval", type=float, default=1e-5,
+                        help="sys.setswitchinterval; kecil = thread lebih sering berganti")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    sys.setswitchinterval(args.switch_interval)
+    inv = InventoryManager()
+    inv.tambah_unit_batch([Sedan(f"C{i:03d}", f"Mobil {i}", f"L {i:03d} XX", 500000, "", "High")
+                           for i in range(1, args.mobil + 1)])
+    ids_mobil = [mobil.id for mobil in inv.get_all_mobil()]
+    service = BookingService(inv)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.worker * 2) as pool:
+        t0 = time.perf_counter()
+        futures = [pool.submit(penulis, i, args, service, inv, ids_mobil) for i in range(args.worker)]
+        futures += [pool.submit(pembaca, i, args, inv, ids_mobil) for i in range(args.worker)]
+        # result() melempar ulang exception dari worker (mis. IndexError dari pembacaan jadwal)
+        hasil = [future.result() for future in futures]
+        durasi = time.perf_counter() - t0
+
+    verifikasi(service, inv, ids_mobil)
+    percobaan = sum(n for jenis, n, _, _ in hasil if jenis == "tulis")
+    ringkasan = {
+        "worker": args.worker, "mobil": args.mobil, "detik": durasi,
+        "percobaan_booking": percobaan,
+        "booking_berhasil": sum(d for _, _, d, _ in hasil),
+        "diselesaikan": sum(s for _, _, _, s in hasil),
+        "baca": sum(n for jenis, n, _, _ in hasil if jenis == "baca"),
+        "booking_per_detik": percobaan / durasi,
+        "double_booking": 0,
+    }
+    for nama, nilai in ringkasan.items():
+        print(f"{nama:<20}{nilai:,.1f}" if isinstance(nilai, float) else f"{nama:<20}{nilai:,}")
+    print("OK: tidak ada double booking, tidak ada exception di pembaca maupun penulis")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(ringkasan, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# Load test storage SQLite: banyak sesi (thread) membuat & menyelesaikan booking bersamaan lewat satu
+# Database ber-pool, seperti sesi Streamlit yang berbagi objek dari renex.layanan.
+#
+#   python benchmarks/bench_storage.py --sesi 16 --booking-per-sesi 300 --json hasil.json
+#
+# Setelah beban selesai, database dibuka ulang dari file dan dicocokkan dengan hasil yang diterima sesi:
+# tidak boleh ada booking / pembayaran / perubahan status yang hilang, dan tidak ada dua booking Active
+# yang jadwalnya tumpang tindih pada mobil yang sama. Latensi maksimum di atas --batas-stall dianggap
+# lock stall (menunggu lock SQLite / koneksi pool terlalu lama).
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renex import Database, InventoryManager, BookingService, Sedan, MetodeBayar, StatusBooking
+
+def statistik(sampel, durasi):
+    urut = sorted(sampel)
+    return {"n": len(urut), "per_detik": len(urut) / durasi, "median_ms": statistics.median(urut),
+            "p99_ms": urut[int(len(urut) * 0.99)], "maks_ms": urut[-1]}
+
+def sesi(nomor, args, db, service, hasil, barrier):
+    rng = random.Random(nomor)
+    user = db.buat_user(f"Sesi {nomor}", f"sesi{nomor}@bench.renex.id")
+    awal = datetime.date.today() + datetime.timedelta(days=1)
+    dibuat, selesai, latensi_buat, latensi_selesai = [], [], [], []
+    barrier.wait()
+    for _ in range(args.booking_per_sesi):
+        id_k = f"C{rng.randint(1, args.mobil):04d}"
+        mulai = awal + datetime.timedelta(days=rng.randrange(args.horizon))
+        t0 = time.perf_counter()
+        booking = service.buat_pesanan(user, id_k, mulai, mulai + datetime.timedelta(days=rng.randint(1, 5)),
+                                       rng.choice(list(MetodeBayar)))
+        latensi_buat.append((time.perf_counter() - t0) * 1000)
+        if booking is None:
+            continue
+        dibuat.append(booking)
+        if rng.random() < args.rasio_selesai:
+            t0 = time.perf_counter()
+            if service.selesaikan_pesanan(booking):
+                selesai.append(booking.booking_id)
+            latensi_selesai.append((time.perf_counter() - t0) * 1000)
+    hasil[nomor] = (dibuat, selesai, latensi_buat, latensi_selesai)
+
+def verifikasi(path, dibuat, selesai):
+    # Buka ulang dari file: yang tersimpan harus persis sama dengan yang dilaporkan berhasil ke sesi
+    db = Database(path)
+    with db.koneksi() as conn:
+        baris = {row["booking_id"]: row for row in conn.execute(
+            "SELECT b.booking_id, b.kendaraan_id, b.tgl_sewa, b.tgl_kembali, b.total_biaya, b.status_booking, "
+            "p.jumlah FROM bookings b LEFT JOIN payments p ON p.booking_id = b.booking_id")}
+    assert set(baris) == {b.booking_id for b in dibuat}, "booking hilang / tak dikenal di database"
+    for booking in dibuat:
+        row = baris[booking.booking_id]
+        assert row["jumlah"] == booking.total_biaya == row["total_biaya"], f"pembayaran {booking.booking_id} hilang"
+        status_harapan = StatusBooking.COMPLETED if booking.booking_id in selesai else StatusBooking.ACTIVE
+        assert row["status_booking"] == status_harapan, f"status booking {booking.booking_id} hilang"
+
+    per_mobil = {}
+    for row in baris.values():
+        if row["status_booking"] == StatusBooking.ACTIVE:
+            per_mobil.setdefault(row["kendaraan_id"], []).append((row["tgl_sewa"], row["tgl_kembali"]))
+    for id_k, interval in per_mobil.items():
+        interval.sort()
+        for (_, selesai_a), (mulai_b, _) in zip(interval, interval[1:]):
+            assert mulai_b >= selesai_a, f"double booking pada {id_k}"
+
+    # Service yang dibangun ulang dari storage harus sampai pada total yang sama
+    inv = InventoryManager(db)
+    service = BookingService(inv, db)
+    assert len(service.get_all_bookings()) == len(dibuat)
+    return service.agregat.total_pendapatan()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test storage SQLite (sesi paralel)")
+    parser.add_argument("--sesi", type=int, default=16, help="jumlah sesi (thread) paralel")
+    parser.add_argument("--booking-per-sesi", type=int, default=300)
+    parser.add_argument("--mobil", type=int, default=100)
+    parser.add_argument("--horizon", type=int, default=120, help="rentang hari tanggal mulai (makin kecil makin bentrok)")
+    parser.add_argument("--rasio-selesai", type=float, default=0.3, help="peluang booking langsung diselesaikan")
+    parser.add_argument("--pool", type=int, default=4, help="ukuran pool koneksi SQLite")
+    parser.add_argument("--batas-stall", type=float, default=1000, help="latensi maksimum (ms) yang diterima")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="renex_storage_")
+    try:
+        path = os.path.join(folder, "bench.db")
+        db = Database(path, pool_size=args.pool)
+        inv = InventoryManager(db)
+        inv.tambah_unit_batch([Sedan(f"C{i:04d}", f"Mobil {i}", f"L {i:04d} XX", 500000, "", "High")
+                               for i in range(1, args.mobil + 1)])
+        service = BookingService(inv, db)
+
+        hasil = {}
+        barrier = threading.Barrier(args.sesi + 1)
+        threads = [threading.Thread(target=sesi, args=(i, args, db, service, hasil, barrier))
+                   for i in range(args.sesi)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        durasi = time.perf_counter() - t0
+
+        dibuat = [b for d, _, _, _ in hasil.values() for b in d]
+        selesai = {booking_id for _, s, _, _ in hasil.values() for booking_id in s}
+        latensi_buat = [x for _, _, lb, _ in hasil.values() for x in lb]
+        latensi_selesai = [x for _, _, _, ls in hasil.values() for x in ls]
+        ringkasan = {
+            "sesi": args.sesi, "detik": durasi, "booking_berhasil": len(dibuat),
+            "ditolak_bentrok": len(latensi_buat) - len(dibuat), "diselesaikan": len(selesai),
+            "buat_pesanan": statistik(latensi_buat, durasi),
+            "selesaikan_pesanan": statistik(latensi_selesai, durasi),
+        }
+        total = verifikasi(path, dibuat, selesai)
+        assert total == service.agregat.total_pendapatan(), "total pendapatan berbeda setelah dimuat ulang"
+        maks = max(ringkasan["buat_pesanan"]["maks_ms"], ringkasan["selesaikan_pesanan"]["maks_ms"])
+        assert maks <= args.batas_stall, f"lock stall: latensi maksimum {maks:.0f} ms"
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(f"{args.sesi} sesi, {durasi:.2f} s: {len(dibuat):,} booking, {ringkasan['ditolak_bentrok']:,} ditolak bentrok, "
+          f"{len(selesai):,} diselesaikan")
+    for nama in ("buat_pesanan", "selesaikan_pesanan"):
+        stat = ringkasan[nama]
+        print(f"{nama:<20}n={stat['n']:,}  per_detik={stat['per_detik']:,.1f}  median_ms={stat['median_ms']:.2f}"
+              f"  p99_ms={stat['p99_ms']:.2f}  maks_ms={stat['maks_ms']:.2f}")
+    print("OK: tidak ada update yang hilang, tidak ada double booking, tidak ada lock stall")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(ringkasan, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# Lapisan domain RENEX (model, storage, inventory, pembayaran, laporan).
+# Modul fitur admin yang berat (impor, ekspor, analitik) sengaja tidak diimpor di sini;
+# UI memuatnya saat tab terkait dibuka.
+from .profiler import Profiler, ukur
+from .model import StatusBooking, MetodeBayar, User, Pembayaran, Booking, KonflikData
+from .kendaraan import Kendaraan, Hatchback, Sedan, SUV, KELAS_KENDARAAN
+from .harga import ATURAN_HARGA, MesinHarga, mesin_harga
+from .database import Database
+from .eventlog import JenisEvent, LogEvent, EventStore
+from .inventory import JadwalSewa, InventoryManager
+from .gambar import GambarStore
+from .laporan import STATUS_VALID, AgregatPendapatan, BukuBesarBooking
+from .pembayaran import GatewayPembayaran, GatewayPalsu, PemrosesPembayaran
+from .booking import BookingService
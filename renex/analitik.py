@@ -0,0 +1,121 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .profiler import ukur
+from .laporan import STATUS_VALID, BukuBesarBooking
+
+# --- Class: AnalitikArmada ---
+# Utilisasi armada dan pendapatan per rentang tanggal, dihitung langsung dari kolom numpy BukuBesarBooking.
+# Interval sewa diekspansi dengan difference array (np.add.at + cumsum), bukan loop per booking/hari.
+class AnalitikArmada:
+    MAKS_CACHE = 16
+    JUMLAH_TOP = 10
+
+    def __init__(self, booking_service, inventory_manager):
+        self.booking_service = booking_service
+        self.inventory_manager = inventory_manager
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @ukur("analitik.hitung")
+    def hitung(self, tgl_dari, tgl_sampai):
+        armada = list(self.inventory_manager.get_all_mobil())
+        ledger = self.booking_service.ledger
+        kunci = (ledger.versi, len(armada), tgl_dari, tgl_sampai)
+        with self._lock:
+            if kunci in self._cache:
+                self._cache.move_to_end(kunci)
+                return self._cache[kunci]
+        
+        _, kolom, kendaraan_ids = ledger.kolom_numpy()
+        hasil = self._hitung(armada, kolom, kendaraan_ids, tgl_dari, tgl_sampai)
+        with self._lock:
+            self._cache[kunci] = hasil
+            if len(self._cache) > self.MAKS_CACHE:
+                self._cache.popitem(last=False)
+        return hasil
+
+    def _hitung(self, armada, kolom, kendaraan_ids, tgl_dari, tgl_sampai):
+        awal = tgl_dari.toordinal()
+        akhir = tgl_sampai.toordinal() + 1  # eksklusif
+        jumlah_hari = akhir - awal
+        jumlah_unit = len(armada)
+        
+        # Hanya booking valid yang menyentuh jendela tanggal
+        kode_valid = [BukuBesarBooking.DAFTAR_STATUS.index(status) for status in STATUS_VALID]
+        mulai = kolom["tgl_sewa"].astype(np.int64)
+        selesai = mulai + kolom["durasi_hari"]
+        mask = np.isin(kolom["status"], kode_valid) & (mulai < akhir) & (selesai > awal)
+        mulai, selesai = mulai[mask], selesai[mask]
+        durasi = kolom["durasi_hari"][mask].astype(np.float64)
+        total = kolom["total_biaya"][mask].astype(np.float64)
+        metode = kolom["metode"][mask]
+        
+        # Kode kendaraan ledger -> posisi di armada saat ini (-1 bila unit sudah tidak ada)
+        posisi_armada = {mobil.id: idx for idx, mobil in enumerate(armada)}
+        peta_kode = np.array([posisi_armada.get(id_k, -1) for id_k in kendaraan_ids] or [0], dtype=np.int64)
+        unit = peta_kode[kolom["kendaraan"][mask]]
+        ada = unit >= 0
+        
+        # Potong interval ke dalam jendela; pendapatan dibagi rata per hari sewa
+        mulai_j = np.clip(mulai, awal, akhir) - awal
+        selesai_j = np.clip(selesai, awal, akhir) - awal
+        hari_terpakai = (selesai_j - mulai_j).astype(np.float64)
+        tarif_harian = total / durasi
+        pendapatan = tarif_harian * hari_terpakai
+        
+        # Kurva okupansi & pendapatan harian via difference array
+        selisih_unit = np.zeros(jumlah_hari + 1)
+        selisih_pendapatan = np.zeros(jumlah_hari + 1)
+        np.add.at(selisih_unit, mulai_j, 1)
+        np.add.at(selisih_unit, selesai_j, -1)
+        np.add.at(selisih_pendapatan, mulai_j, tarif_harian)
+        np.add.at(selisih_pendapatan, selesai_j, -tarif_harian)
+        unit_terpakai = np.cumsum(selisih_unit)[:jumlah_hari]
+        pendapatan_harian = np.cumsum(selisih_pendapatan)[:jumlah_hari]
+        
+        tanggal = pd.date_range(tgl_dari, periods=jumlah_hari, freq="D")
+        harian = pd.DataFrame({
+            "Mobil Disewa": np.rint(unit_terpakai).astype(np.int64),
+            "Okupansi (%)": 100 * unit_terpakai / max(jumlah_unit, 1),
+            "Pendapatan": pendapatan_harian,
+        }, index=tanggal)
+        
+        # Per unit dan per tipe
+        hari_unit = np.bincount(unit[ada], weights=hari_terpakai[ada], minlength=jumlah_unit)
+        pendapatan_unit = np.bincount(unit[ada], weights=pendapatan[ada], minlength=jumlah_unit)
+        per_unit = pd.DataFrame({
+            "ID": [mobil.id for mobil in armada],
+            "Mobil": [f"{mobil.merk} ({mobil.nopol})" for mobil in armada],
+            "Tipe": [type(mobil).__name__ for mobil in armada],
+            "Hari Disewa": hari_unit,
+            "Utilisasi (%)": 100 * hari_unit / jumlah_hari,
+            "Pendapatan": pendapatan_unit,
+        })
+        per_tipe = per_unit.groupby("Tipe").agg(
+            Unit=("ID", "size"), Hari_Disewa=("Hari Disewa", "sum"), Pendapatan=("Pendapatan", "sum")
+        )
+        per_tipe["Utilisasi (%)"] = 100 * per_tipe["Hari_Disewa"] / (per_tipe["Unit"] * jumlah_hari)
+        per_tipe["Pendapatan per Unit-Hari"] = per_tipe["Pendapatan"] / (per_tipe["Unit"] * jumlah_hari)
+        per_tipe = per_tipe.rename(columns={"Hari_Disewa": "Hari Disewa"})
+        
+        daftar_metode = BukuBesarBooking.DAFTAR_METODE
+        pendapatan_metode = np.bincount(metode[metode >= 0], weights=pendapatan[metode >= 0],
+                                        minlength=len(daftar_metode))
+        
+        total_pendapatan = float(pendapatan.sum())
+        kapasitas = jumlah_unit * jumlah_hari
+        return {
+            "jumlah_hari": jumlah_hari,
+            "total_pendapatan": total_pendapatan,
+            "utilisasi": float(hari_terpakai[ada].sum()) / kapasitas if kapasitas else 0.0,
+            "pendapatan_per_unit_hari": total_pendapatan / kapasitas if kapasitas else 0.0,
+            "harian": harian,
+            "per_tipe": per_tipe,
+            "per_metode": pd.Series(pendapatan_metode, index=[str(m) for m in daftar_metode]),
+            "top_unit": per_unit.nlargest(self.JUMLAH_TOP, "Pendapatan"),
+            "per_unit": per_unit,
+        }
@@ -0,0 +1,380 @@
+import contextlib
+import datetime
+import functools
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+from .model import MetodeBayar
+from .kendaraan import KELAS_KENDARAAN
+from .harga import mesin_harga
+from . import layanan
+
+# --- API REST/JSON ---
+# Endpoint async di atas InventoryManager & BookingService yang sama dengan UI (renex.layanan).
+# Lookup O(1) / O(log n) di memori (detail mobil, kutipan satu mobil, laporan ringkas) dijalankan langsung
+# di event loop; pencarian katalog (cache miss memindai seluruh armada), yang menulis ke storage, dan yang
+# berat (user, booking, selesai, analitik) dijalankan di thread pool.
+# Semua error dikembalikan sebagai {"error": pesan} dengan status HTTP yang sesuai.
+#
+# Akses: setiap request wajib membawa header X-API-Key berisi kunci klien (partner / aplikasi mobile,
+# RENEX_API_KEYS) atau kunci admin (RENEX_API_ADMIN_KEYS), keduanya dipisah koma; tanpa kunci yang
+# dikonfigurasi semua request ditolak. Menyelesaikan booking dan laporan hanya untuk kunci admin.
+# Endpoint booking juga butuh "Authorization: Bearer <token>" dari POST /api/masuk dan hanya
+# melihat booking milik user token tersebut.
+URUTAN = ("harga_asc", "harga_desc", "merk")
+LIMIT_DEFAULT = 20
+MAKS_LIMIT = 200
+MAKS_BATCH = 50
+# Batas rentang tanggal: booking & kutipan paling jauh setahun ke depan (horizon tabel harga) dan paling lama
+# 90 hari per sewa; analitik paling lebar dua tahun per request, di antara TGL_ANALITIK_AWAL dan tanggal sewa
+# terjauh yang mungkin ada (juga menjaga tanggal tetap dalam rentang pandas.Timestamp)
+MAKS_HARI_KE_DEPAN = 365
+MAKS_DURASI_SEWA = 90
+MAKS_HARI_ANALITIK = 731
+TGL_ANALITIK_AWAL = datetime.date(2000, 1, 1)
+
+KUNCI_KLIEN = [k.strip() for k in os.environ.get("RENEX_API_KEYS", "").split(",") if k.strip()]
+KUNCI_ADMIN = [k.strip() for k in os.environ.get("RENEX_API_ADMIN_KEYS", "").split(",") if k.strip()]
+KLIEN, ADMIN = "klien", "admin"
+# Token user dari POST /api/masuk: token -> (user, waktu kedaluwarsa monotonic); hilang saat proses restart
+MASA_TOKEN = 12 * 60 * 60
+_token_user = {}
+_lock_token = threading.Lock()
+
+# Kolom DataFrame analitik -> kunci JSON
+KOLOM_HARIAN = {"Mobil Disewa": "mobil_disewa", "Okupansi (%)": "okupansi", "Pendapatan": "pendapatan"}
+KOLOM_PER_TIPE = {"Tipe": "kelas", "Unit": "unit", "Hari Disewa": "hari_disewa", "Pendapatan": "pendapatan",
+                  "Utilisasi (%)": "utilisasi", "Pendapatan per Unit-Hari": "pendapatan_per_unit_hari"}
+KOLOM_PER_UNIT = {"ID": "kendaraan_id", "Mobil": "mobil", "Tipe": "kelas", "Hari Disewa": "hari_disewa",
+                  "Utilisasi (%)": "utilisasi", "Pendapatan": "pendapatan"}
+
+# --- Validasi parameter ---
+def _tanggal(nilai, nama):
+    try:
+        return datetime.date.fromisoformat(nilai)
+    except (TypeError, ValueError):
+        raise HTTPException(400, f"{nama} harus berupa tanggal YYYY-MM-DD")
+
+def _rentang_sewa(tgl_mulai, tgl_selesai):
+    # Aturan yang sama dengan form booking di UI: tidak boleh di masa lalu, selesai tidak sebelum mulai.
+    # Ditambah batas atas agar satu request tidak mengunci mobil bertahun-tahun atau melewati date.max.
+    tgl_mulai = _tanggal(tgl_mulai, "tgl_mulai")
+    tgl_selesai = _tanggal(tgl_selesai, "tgl_selesai")
+    hari_ini = datetime.date.today()
+    if tgl_mulai < hari_ini:
+        raise HTTPException(400, "tgl_mulai tidak boleh di masa lalu")
+    if (tgl_mulai - hari_ini).days > MAKS_HARI_KE_DEPAN:
+        raise HTTPException(400, f"tgl_mulai paling lambat {MAKS_HARI_KE_DEPAN} hari dari hari ini")
+    if tgl_selesai < tgl_mulai:
+        raise HTTPException(400, "tgl_selesai tidak boleh sebelum tgl_mulai")
+    if (tgl_selesai - tgl_mulai).days > MAKS_DURASI_SEWA:
+        raise HTTPException(400, f"Durasi sewa maksimal {MAKS_DURASI_SEWA} hari")
+    return tgl_mulai, tgl_selesai
+
+def _angka(nilai, nama, default=None, minimum=0):
+    if nilai is None or nilai == "":
+        return default
+    try:
+        angka = int(nilai)
+    except (TypeError, ValueError):
+        raise HTTPException(400, f"{nama} harus berupa bilangan bulat")
+    if angka < minimum:
+        raise HTTPException(400, f"{nama} minimal {minimum}")
+    return angka
+
+def _halaman(query):
+    offset = _angka(query.get("offset"), "offset", 0)
+    limit = min(_angka(query.get("limit"), "limit", LIMIT_DEFAULT, minimum=1), MAKS_LIMIT)
+    return offset, limit
+
+def _teks(data, nama):
+    nilai = data.get(nama)
+    if not isinstance(nilai, str) or not nilai.strip():
+        raise HTTPException(400, f"{nama} wajib diisi")
+    return nilai.strip()
+
+async def _body_json(request):
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise HTTPException(400, "Body harus berupa JSON yang valid")
+    if not isinstance(data, dict):
+        raise HTTPException(400, "Body harus berupa objek JSON")
+    return data
+
+def _mobil(inv, kendaraan_id):
+    # Nilai dari body JSON bisa berupa list/objek: tolak sebelum dipakai sebagai kunci dict
+    if not isinstance(kendaraan_id, str):
+        raise HTTPException(400, "kendaraan_id harus berupa teks")
+    mobil = inv.get_mobil_by_id(kendaraan_id)
+    if mobil is None:
+        raise HTTPException(404, f"Mobil {kendaraan_id} tidak ditemukan")
+    return mobil
+
+def _booking(service, booking_id, user=None):
+    # Dengan user: booking milik user lain dijawab 404, sama seperti id yang tidak ada
+    booking = service.get_booking(booking_id)
+    if booking is None or (user is not None and booking.user.user_id != user.user_id):
+        raise HTTPException(404, f"Booking {booking_id} tidak ditemukan")
+    return booking
+
+# --- Autentikasi ---
+def _kunci_cocok(kunci, daftar):
+    kunci = kunci.encode()
+    return any(hmac.compare_digest(kunci, calon.encode()) for calon in daftar)
+
+def _akses(endpoint, peran):
+    # Bungkus endpoint: X-API-Key wajib (401), endpoint admin menolak kunci klien (403)
+    @functools.wraps(endpoint)
+    async def terlindungi(request):
+        kunci = request.headers.get("x-api-key", "")
+        request.state.admin = _kunci_cocok(kunci, KUNCI_ADMIN)
+        if not request.state.admin and not _kunci_cocok(kunci, KUNCI_KLIEN):
+            raise HTTPException(401, "Header X-API-Key tidak ada atau tidak valid")
+        if peran == ADMIN and not request.state.admin:
+            raise HTTPException(403, "Endpoint ini hanya untuk kunci admin")
+        return await endpoint(request)
+    return terlindungi
+
+def _buat_token(user):
+    token = secrets.token_urlsafe(32)
+    sekarang = time.monotonic()
+    with _lock_token:
+        if len(_token_user) >= 10_000:
+            for lama in [t for t, (_, batas) in _token_user.items() if batas < sekarang]:
+                del _token_user[lama]
+        _token_user[token] = (user, sekarang + MASA_TOKEN)
+    return token
+
+def _user(request):
+    skema, _, token = request.headers.get("authorization", "").partition(" ")
+    sesi = _token_user.get(token.strip()) if skema.lower() == "bearer" else None
+    if sesi is None or sesi[1] < time.monotonic():
+        raise HTTPException(401, "Token user tidak ada atau kedaluwarsa; login lewat POST /api/masuk")
+    return sesi[0]
+
+def _records(df, kolom, index=None):
+    df = df.reset_index(names=index) if index else df
+    return df[list(kolom)].rename(columns=kolom).to_dict("records")
+
+# --- Endpoint: Inventory ---
+async def status(request):
+    inv, service = layanan.get_services()
+    return JSONResponse({"status": "ok", "mobil": len(inv.get_all_mobil()),
+                         "booking": len(service.get_all_bookings()),
+                         "booking_aktif": service.jumlah_bookings_aktif()})
+
+async def cari_mobil(request):
+    # Pencarian katalog; bila tgl_mulai & tgl_selesai diisi, hanya mobil yang tersedia + kutipan totalnya
+    query = request.query_params
+    kelas = query.get("kelas") or None
+    if kelas and kelas not in KELAS_KENDARAAN:
+        raise HTTPException(400, f"kelas harus salah satu dari {', '.join(KELAS_KENDARAAN)}")
+    urutan = query.get("urutan", "harga_asc")
+    if urutan not in URUTAN:
+        raise HTTPException(400, f"urutan harus salah satu dari {', '.join(URUTAN)}")
+    harga_min = _angka(query.get("harga_min"), "harga_min")
+    harga_max = _angka(query.get("harga_max"), "harga_max")
+    tgl_mulai, tgl_selesai = None, None
+    if query.get("tgl_mulai") or query.get("tgl_selesai"):
+        tgl_mulai, tgl_selesai = _rentang_sewa(query.get("tgl_mulai"), query.get("tgl_selesai"))
+    offset, limit = _halaman(query)
+
+    inv, _ = layanan.get_services()
+
+    def cari():
+        # Cache miss memfilter & mengurutkan seluruh armada (O(n)): jangan menahan event loop
+        hasil = inv.cari_mobil(kelas, harga_min, harga_max, tgl_mulai, tgl_selesai, urutan)
+        halaman = hasil[offset:offset + limit]
+        data = [mobil.ke_dict() for mobil in halaman]
+        if tgl_mulai and halaman:
+            for item, total in zip(data, mesin_harga.kutipan_batch(halaman, tgl_mulai, tgl_selesai).tolist()):
+                item["kutipan"] = total
+        return len(hasil), data
+
+    jumlah, data = await run_in_threadpool(cari)
+    return JSONResponse({"jumlah": jumlah, "offset": offset, "mobil": data})
+
+async def detail_mobil(request):
+    inv, _ = layanan.get_services()
+    mobil = _mobil(inv, request.path_params["kendaraan_id"])
+    data = mobil.ke_dict()
+    data["jadwal"] = [{"tgl_mulai": mulai.isoformat(), "tgl_selesai": selesai.isoformat()}
+                      for mulai, selesai, _ in inv.get_jadwal(mobil.id, datetime.date.today())]
+    return JSONResponse(data)
+
+async def kutipan(request):
+    query = request.query_params
+    inv, _ = layanan.get_services()
+    mobil = _mobil(inv, query.get("kendaraan_id"))
+    tgl_mulai, tgl_selesai = _rentang_sewa(query.get("tgl_mulai"), query.get("tgl_selesai"))
+    return JSONResponse({
+        "kendaraan_id": mobil.id, "tgl_mulai": tgl_mulai.isoformat(), "tgl_selesai": tgl_selesai.isoformat(),
+        "durasi_hari": mesin_harga.durasi(tgl_mulai, tgl_selesai),
+        "total_biaya": mesin_harga.kutipan(mobil, tgl_mulai, tgl_selesai),
+        "tersedia": inv.is_tersedia(mobil.id, tgl_mulai, tgl_selesai),
+    })
+
+# --- Endpoint: User ---
+async def masuk(request):
+    # Body: {nama, email, password}; aturan sama dengan form login UI (email baru langsung didaftarkan)
+    data = await _body_json(request)
+    nama, email, password = _teks(data, "nama"), _teks(data, "email"), _teks(data, "password")
+    user = await run_in_threadpool(layanan.get_user, nama, email, password)
+    if user is None:
+        raise HTTPException(401, "Email sudah terdaftar dan password tidak cocok")
+    return JSONResponse({"token": _buat_token(user), "kedaluwarsa_detik": MASA_TOKEN, "user": user.ke_dict()})
+
+# --- Endpoint: Booking ---
+async def buat_booking(request):
+    # Body: {metode_bayar, kendaraan_id, tgl_mulai, tgl_selesai}
+    # atau pesanan multi-mobil: {metode_bayar, mobil: [{kendaraan_id, tgl_mulai, tgl_selesai}, ...]}
+    user = _user(request)
+    data = await _body_json(request)
+    try:
+        metode = MetodeBayar(data.get("metode_bayar"))
+    except ValueError:
+        raise HTTPException(400, f"metode_bayar harus salah satu dari {', '.join(MetodeBayar)}")
+
+    daftar = data.get("mobil", [data])
+    if not isinstance(daftar, list) or not 1 <= len(daftar) <= MAKS_BATCH:
+        raise HTTPException(400, f"mobil harus berupa list berisi 1-{MAKS_BATCH} pesanan")
+    inv, service = layanan.get_services()
+    permintaan = []
+    for item in daftar:
+        if not isinstance(item, dict):
+            raise HTTPException(400, "Setiap pesanan harus berupa objek JSON")
+        mobil = _mobil(inv, item.get("kendaraan_id"))
+        permintaan.append((mobil.id, *_rentang_sewa(item.get("tgl_mulai"), item.get("tgl_selesai"))))
+
+    def pesan():
+        # Satu kali pindah ke thread pool untuk reservasi + penulisan storage
+        if "mobil" in data:
+            return service.buat_pesanan_batch(user, permintaan, metode)
+        booking = service.buat_pesanan(user, *permintaan[0], metode)
+        return [booking] if booking else None
+
+    bookings = await run_in_threadpool(pesan)
+    if not bookings:
+        raise HTTPException(409, "Mobil tidak tersedia pada tanggal tersebut")
+    return JSONResponse({"user": user.ke_dict(), "booking": [booking.ke_dict() for booking in bookings]},
+                        status_code=201)
+
+async def daftar_booking(request):
+    # Riwayat booking user pemilik token (terbaru lebih dulu); kunci admin boleh memilih user lewat ?email=
+    query = request.query_params
+    offset, limit = _halaman(query)
+    if request.state.admin and query.get("email"):
+        email = _teks(query, "email")
+        user = await run_in_threadpool(layanan.get_storage().get_user_by_email, email)
+        if user is None:
+            raise HTTPException(404, f"User {email} tidak ditemukan")
+    else:
+        user = _user(request)
+    _, service = layanan.get_services()
+    return JSONResponse({
+        "user": user.ke_dict(), "jumlah": service.jumlah_bookings_user(user.user_id), "offset": offset,
+        "booking": [booking.ke_dict() for booking in service.get_bookings_user(user.user_id, offset, limit)],
+    })
+
+async def detail_booking(request):
+    user = None if request.state.admin else _user(request)
+    _, service = layanan.get_services()
+    return JSONResponse(_booking(service, request.path_params["booking_id"], user).ke_dict())
+
+async def selesaikan_booking(request):
+    _, service = layanan.get_services()
+    booking = _booking(service, request.path_params["booking_id"])
+    if not await run_in_threadpool(service.selesaikan_pesanan, booking):
+        raise HTTPException(409, f"Booking berstatus {booking.status_booking}; hanya booking Active yang bisa diselesaikan")
+    return JSONResponse(booking.ke_dict())
+
+# --- Endpoint: Laporan ---
+async def laporan(request):
+    # Ringkasan dari AgregatPendapatan (sudah terjaga inkremental, tanpa menjumlah ulang riwayat)
+    _, service = layanan.get_services()
+    agregat = service.agregat
+
+    def ringkasan(tabel):
+        return [{"kunci": kunci, "jumlah": jumlah, "total": total}
+                for kunci, jumlah, total in agregat.get_ringkasan(tabel)]
+
+    return JSONResponse({
+        "total_pendapatan": agregat.total_pendapatan(), "jumlah_transaksi": agregat.jumlah_transaksi(),
+        "per_status": ringkasan(agregat.per_status), "per_metode": ringkasan(agregat.per_metode),
+        "per_kelas": ringkasan(agregat.per_kelas), "per_bulan": ringkasan(agregat.per_bulan),
+    })
+
+async def laporan_analitik(request):
+    # Utilisasi & pendapatan armada per rentang tanggal (default 30 hari terakhir)
+    query = request.query_params
+    hari_ini = datetime.date.today()
+    tgl_sampai = _tanggal(query.get("tgl_sampai"), "tgl_sampai") if query.get("tgl_sampai") else hari_ini
+    tgl_terjauh = hari_ini + datetime.timedelta(days=MAKS_HARI_KE_DEPAN + MAKS_DURASI_SEWA)
+    if not TGL_ANALITIK_AWAL <= tgl_sampai <= tgl_terjauh:
+        raise HTTPException(400, f"tgl_sampai harus di antara {TGL_ANALITIK_AWAL} dan {tgl_terjauh}")
+    tgl_dari = (_tanggal(query.get("tgl_dari"), "tgl_dari") if query.get("tgl_dari")
+                else max(tgl_sampai - datetime.timedelta(days=29), TGL_ANALITIK_AWAL))
+    if tgl_dari < TGL_ANALITIK_AWAL:
+        raise HTTPException(400, f"tgl_dari paling awal {TGL_ANALITIK_AWAL}")
+    if tgl_sampai < tgl_dari:
+        raise HTTPException(400, "tgl_sampai tidak boleh sebelum tgl_dari")
+    if (tgl_sampai - tgl_dari).days >= MAKS_HARI_ANALITIK:
+        raise HTTPException(400, f"Rentang analitik maksimal {MAKS_HARI_ANALITIK} hari")
+
+    hasil = await run_in_threadpool(layanan.get_analitik().hitung, tgl_dari, tgl_sampai)
+    harian = hasil["harian"]
+    return JSONResponse({
+        "tgl_dari": tgl_dari.isoformat(), "tgl_sampai": tgl_sampai.isoformat(),
+        "jumlah_hari": hasil["jumlah_hari"], "utilisasi": hasil["utilisasi"],
+        "total_pendapatan": hasil["total_pendapatan"],
+        "pendapatan_per_unit_hari": hasil["pendapatan_per_unit_hari"],
+        "harian": [dict(tanggal=tanggal, **baris) for tanggal, baris in
+                   zip(harian.index.strftime("%Y-%m-%d"), _records(harian, KOLOM_HARIAN))],
+        "per_tipe": _records(hasil["per_tipe"], KOLOM_PER_TIPE, index="Tipe"),
+        "per_metode": hasil["per_metode"].to_dict(),
+        "top_unit": _records(hasil["top_unit"], KOLOM_PER_UNIT),
+    })
+
+async def _galat_http(request, exc):
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Storage & jadwal dimuat sebelum request pertama, bukan di dalam event loop saat request masuk
+    await run_in_threadpool(layanan.get_services)
+    yield
+
+def buat_routes():
+    # Semua endpoint di bawah /api; dipasang ke st.App (bersama UI) atau Starlette biasa (headless)
+    # Setiap route dibungkus _akses: tidak ada endpoint yang bisa dipanggil tanpa X-API-Key
+    daftar = [
+        ("/status", status, KLIEN, ["GET"]),
+        ("/mobil", cari_mobil, KLIEN, ["GET"]),
+        ("/mobil/{kendaraan_id}", detail_mobil, KLIEN, ["GET"]),
+        ("/kutipan", kutipan, KLIEN, ["GET"]),
+        ("/masuk", masuk, KLIEN, ["POST"]),
+        ("/booking", daftar_booking, KLIEN, ["GET"]),
+        ("/booking", buat_booking, KLIEN, ["POST"]),
+        ("/booking/{booking_id:int}", detail_booking, KLIEN, ["GET"]),
+        ("/booking/{booking_id:int}/selesai", selesaikan_booking, ADMIN, ["POST"]),
+        ("/laporan", laporan, ADMIN, ["GET"]),
+        ("/laporan/analitik", laporan_analitik, ADMIN, ["GET"]),
+    ]
+    api = Starlette(routes=[Route(path, _akses(endpoint, peran), methods=metode)
+                            for path, endpoint, peran, metode in daftar],
+                    exception_handlers={HTTPException: _galat_http})
+    return [Mount("/api", app=api)]
+
+def buat_app_headless():
+    return Starlette(routes=buat_routes(), lifespan=lifespan)
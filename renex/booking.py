@@ -0,0 +1,265 @@
+import itertools
+import threading
+
+from .profiler import ukur
+from .model import StatusBooking, MetodeBayar, Pembayaran, Booking
+from .laporan import STATUS_VALID, AgregatPendapatan, BukuBesarBooking
+
+# --- Class: BookingService ---
+class BookingService:
+    # Hasil verifikasi yang gagal ditulis ke storage dicoba ulang dengan backoff (detik, dikali 2 tiap percobaan)
+    MAKS_PERCOBAAN_KONFIRMASI = 5
+    JEDA_RETRY_KONFIRMASI = 1.0
+
+    def __init__(self, inventory_manager, storage=None, pemroses_pembayaran=None):
+        self.inventory_manager = inventory_manager
+        self.storage = storage
+        # Tanpa pemroses, pembayaran diverifikasi langsung (sinkron) seperti semula
+        self.pemroses_pembayaran = pemroses_pembayaran
+        self.all_bookings = []
+        self.ledger = BukuBesarBooking()
+        self.agregat = AgregatPendapatan()
+        # Index per id, per user (urutan kronologis) dan himpunan booking aktif (booking_id -> booking)
+        self._by_id = {}
+        self._by_user = {}
+        self._aktif = {}
+        # booking_id yang status barunya sedang ditulis ke storage: transisi kedua ditolak sampai selesai
+        self._berubah = set()
+        self._lock = threading.Lock()
+        
+        id_booking_terakhir, id_bayar_terakhir = 0, 0
+        if self.storage:
+            id_booking_terakhir = self.storage.get_id_terakhir("bookings", "booking_id")
+            id_bayar_terakhir = self.storage.get_id_terakhir("payments", "pay_id")
+        self._seq_booking = itertools.count(id_booking_terakhir + 1)
+        self._seq_bayar = itertools.count(id_bayar_terakhir + 1)
+        
+        if self.storage:
+            # Bangun ulang jadwal sewa dari booking yang masih aktif / masih menahan mobil
+            tertunda = []
+            for booking in self.storage.load_bookings(inventory_manager):
+                if booking.status_booking in (StatusBooking.ACTIVE, StatusBooking.PENDING):
+                    inventory_manager.reservasi(booking.kendaraan.id, booking.tgl_sewa,
+                                                booking.tgl_kembali, booking.booking_id)
+                if booking.status_booking == StatusBooking.PENDING:
+                    tertunda.append(booking)
+                self._catat(booking)
+            # Verifikasi yang terputus saat restart diajukan ulang (atau langsung kedaluwarsa)
+            for booking in tertunda:
+                self._ajukan_pembayaran(booking)
+
+    def _catat(self, booking):
+        # Ledger & agregat dicatat sebelum booking terlihat lewat index, di bawah lock yang sama dengan transisi
+        # status: transisi tidak pernah mendapat booking tanpa baris_ledger atau yang belum masuk agregat
+        with self._lock:
+            self.ledger.tambah(booking)
+            self.agregat.catat_booking(booking)
+            self.all_bookings.append(booking)
+            self._by_id[booking.booking_id] = booking
+            self._by_user.setdefault(booking.user.user_id, []).append(booking)
+            if booking.status_booking == StatusBooking.ACTIVE:
+                self._aktif[booking.booking_id] = booking
+
+    def get_all_bookings(self):
+        return self.all_bookings
+
+    def get_booking(self, booking_id):
+        return self._by_id.get(booking_id)
+
+    def jumlah_bookings_user(self, user_id):
+        return len(self._by_user.get(user_id, ()))
+
+    @ukur("booking.get_bookings_user")
+    def get_bookings_user(self, user_id, offset=0, limit=10):
+        # Terbaru lebih dulu; hanya potongan halaman yang disalin
+        riwayat = self._by_user.get(user_id, [])
+        akhir = max(len(riwayat) - offset, 0)
+        awal = max(akhir - limit, 0)
+        return riwayat[awal:akhir][::-1]
+
+    def jumlah_bookings_aktif(self):
+        return len(self._aktif)
+
+    @ukur("booking.get_bookings_aktif")
+    def get_bookings_aktif(self, offset=0, limit=None):
+        with self._lock:
+            return list(itertools.islice(self._aktif.values(), offset, None if limit is None else offset + limit))
+
+    @ukur("booking.get_bookings_terbaru")
+    def get_bookings_terbaru(self, offset=0, limit=20):
+        # Booking valid terbaru lebih dulu; hanya menelusuri sejauh halaman yang diminta
+        hasil = []
+        lewati = offset
+        for booking in reversed(self.all_bookings):
+            if booking.status_booking not in STATUS_VALID:
+                continue
+            if lewati:
+                lewati -= 1
+                continue
+            hasil.append(booking)
+            if len(hasil) >= limit:
+                break
+        return hasil
+
+    @ukur("booking.buat_pesanan")
+    def buat_pesanan(self, user, kendaraan_id, tgl_mulai, tgl_selesai, metode_bayar):
+        # Metode divalidasi sebelum reservasi: ValueError di sini tidak meninggalkan jadwal yang tertahan
+        metode_bayar = MetodeBayar(metode_bayar)
+        mobil = self.inventory_manager.get_mobil_by_id(kendaraan_id)
+        if mobil and self.inventory_manager.is_tersedia(kendaraan_id, tgl_mulai, tgl_selesai):
+            booking_id = next(self._seq_booking)
+            
+            booking = Booking(booking_id, user, mobil, tgl_mulai, tgl_selesai)
+            # Satu-satunya critical section: cek bentrok + simpan jadwal di bawah lock per kendaraan.
+            # Pembuatan pembayaran dan penulisan ke storage dilakukan di luar lock.
+            if not self.inventory_manager.reservasi(kendaraan_id, tgl_mulai, tgl_selesai, booking_id):
+                return None
+            
+            # Sampai booking tersimpan, error apa pun melepas reservasi; setelahnya booking sudah sah
+            try:
+                pay_id = next(self._seq_bayar)
+                pembayaran = Pembayaran(pay_id, booking.total_biaya, metode_bayar)
+                booking.set_pembayaran(pembayaran)
+                self._siapkan_pembayaran(booking)
+                
+                if self.storage:
+                    self.storage.simpan_booking(booking)
+            except BaseException:
+                self.inventory_manager.batalkan_reservasi(kendaraan_id, tgl_mulai, booking_id)
+                raise
+            
+            self._catat(booking)
+            self._ajukan_pembayaran(booking)
+            return booking
+        return None
+
+    @ukur("booking.buat_pesanan_batch")
+    def buat_pesanan_batch(self, user, permintaan, metode_bayar):
+        # Pesanan multi-mobil (korporat): permintaan = [(kendaraan_id, tgl_mulai, tgl_selesai), ...].
+        # Semua unit berhasil direservasi dan disimpan, atau tidak ada sama sekali.
+        metode_bayar = MetodeBayar(metode_bayar)
+        bookings = []
+        try:
+            for kendaraan_id, tgl_mulai, tgl_selesai in permintaan:
+                mobil = self.inventory_manager.get_mobil_by_id(kendaraan_id)
+                if not mobil:
+                    self._batalkan_reservasi_batch(bookings)
+                    return None
+                # Booking dibuat sebelum reservasi: yang sudah direservasi selalu ada di daftar bookings
+                booking = Booking(next(self._seq_booking), user, mobil, tgl_mulai, tgl_selesai)
+                if not self.inventory_manager.reservasi(kendaraan_id, tgl_mulai, tgl_selesai, booking.booking_id):
+                    self._batalkan_reservasi_batch(bookings)
+                    return None
+                bookings.append(booking)
+            
+            for booking in bookings:
+                pembayaran = Pembayaran(next(self._seq_bayar), booking.total_biaya, metode_bayar)
+                booking.set_pembayaran(pembayaran)
+                self._siapkan_pembayaran(booking)
+            
+            if self.storage:
+                self.storage.simpan_booking_batch(bookings)
+        except BaseException:
+            self._batalkan_reservasi_batch(bookings)
+            raise
+        
+        for booking in bookings:
+            self._catat(booking)
+            self._ajukan_pembayaran(booking)
+        return bookings
+
+    def _siapkan_pembayaran(self, booking):
+        # Dengan pemroses async, booking menahan mobil sebagai "Pending Payment" sampai diverifikasi
+        if self.pemroses_pembayaran:
+            booking.status_booking = StatusBooking.PENDING
+        else:
+            booking.pembayaran.verifikasi()
+
+    def _ajukan_pembayaran(self, booking):
+        if self.pemroses_pembayaran and booking.status_booking == StatusBooking.PENDING:
+            self.pemroses_pembayaran.ajukan(
+                booking.pembayaran, lambda sukses: self._selesaikan_pembayaran(booking, sukses)
+            )
+
+    def _mulai_transisi(self, booking, status_lama):
+        # Klaim booking untuk satu transisi status; False bila statusnya sudah lain atau sedang diubah
+        with self._lock:
+            if booking.status_booking != status_lama or booking.booking_id in self._berubah:
+                return False
+            self._berubah.add(booking.booking_id)
+            return True
+
+    def _akhiri_transisi(self, booking):
+        with self._lock:
+            self._berubah.discard(booking.booking_id)
+
+    def _selesaikan_pembayaran(self, booking, sukses, percobaan=0):
+        # Dipanggil dari worker pembayaran; gagal / hold habis berarti booking batal dan mobil dilepas.
+        # Storage ditulis lebih dulu: bila gagal, booking tetap "Pending Payment" (sama seperti storage)
+        # dan penulisan dicoba ulang di _ulangi_konfirmasi.
+        status_baru = StatusBooking.ACTIVE if sukses else StatusBooking.CANCELLED
+        if not self._mulai_transisi(booking, StatusBooking.PENDING):
+            return
+        if self.storage:
+            try:
+                self.storage.konfirmasi_pembayaran(booking, status_baru, sukses)
+            except Exception:
+                self._akhiri_transisi(booking)
+                self._ulangi_konfirmasi(booking, sukses, percobaan)
+                return
+        try:
+            with self._lock:
+                booking.status_booking = status_baru
+                booking.pembayaran.status_sukses = sukses
+                if sukses:
+                    self._aktif[booking.booking_id] = booking
+                self.agregat.ubah_status(booking, StatusBooking.PENDING, status_baru)
+                self.ledger.set_status(booking.baris_ledger, status_baru)
+        finally:
+            self._akhiri_transisi(booking)
+        if not sukses:
+            self.inventory_manager.batalkan_reservasi(booking.kendaraan.id, booking.tgl_sewa, booking.booking_id)
+
+    def _ulangi_konfirmasi(self, booking, sukses, percobaan):
+        if percobaan + 1 < self.MAKS_PERCOBAAN_KONFIRMASI:
+            timer = threading.Timer(self.JEDA_RETRY_KONFIRMASI * 2 ** percobaan, self._selesaikan_pembayaran,
+                                    (booking, sukses, percobaan + 1))
+            timer.daemon = True
+            timer.start()
+            return
+        # Storage tetap tidak bisa ditulis: jangan menahan mobil tanpa batas. Booking dibatalkan di memori dan
+        # jadwalnya dilepas; storage masih "Pending Payment", jadi setelah restart verifikasinya diajukan ulang
+        # dan (karena batas hold sudah lewat) berakhir batal juga.
+        with self._lock:
+            if booking.status_booking != StatusBooking.PENDING or booking.booking_id in self._berubah:
+                return
+            booking.status_booking = StatusBooking.CANCELLED
+            booking.pembayaran.status_sukses = False
+            self.agregat.ubah_status(booking, StatusBooking.PENDING, StatusBooking.CANCELLED)
+            self.ledger.set_status(booking.baris_ledger, StatusBooking.CANCELLED)
+        self.inventory_manager.batalkan_reservasi(booking.kendaraan.id, booking.tgl_sewa, booking.booking_id)
+
+    def _batalkan_reservasi_batch(self, bookings):
+        for booking in bookings:
+            self.inventory_manager.batalkan_reservasi(booking.kendaraan.id, booking.tgl_sewa, booking.booking_id)
+
+    @ukur("booking.selesaikan_pesanan")
+    def selesaikan_pesanan(self, booking):
+        # Cegah pesanan diselesaikan dua kali bila dua admin menekan tombol bersamaan.
+        # Storage ditulis lebih dulu: bila gagal, booking tetap Active di memori maupun di storage.
+        if not self._mulai_transisi(booking, StatusBooking.ACTIVE):
+            return False
+        try:
+            if self.storage:
+                self.storage.update_status_booking(booking.booking_id, StatusBooking.COMPLETED)
+            with self._lock:
+                booking.status_booking = StatusBooking.COMPLETED
+                self._aktif.pop(booking.booking_id, None)
+                self.agregat.ubah_status(booking, StatusBooking.ACTIVE, StatusBooking.COMPLETED)
+                self.ledger.set_status(booking.baris_ledger, StatusBooking.COMPLETED)
+        finally:
+            self._akhiri_transisi(booking)
+        
+        # Mobil sudah kembali: lepaskan sisa jadwal agar bisa disewa lagi
+        self.inventory_manager.batalkan_reservasi(booking.kendaraan.id, booking.tgl_sewa, booking.booking_id)
+        return True
@@ -0,0 +1,246 @@
+import collections
+import datetime
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .model import StatusBooking, User, Pembayaran, Booking, KonflikData
+from .kendaraan import KELAS_KENDARAAN
+
+# --- Class: Database ---
+# Storage SQLite (mode WAL) yang dipakai bersama oleh semua sesi Streamlit.
+# Koneksi diambil dari pool; setiap penulisan dibungkus satu transaksi.
+class Database:
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS vehicles (
+        id TEXT PRIMARY KEY,
+        kelas TEXT NOT NULL,
+        merk TEXT NOT NULL,
+        nopol TEXT NOT NULL UNIQUE,
+        harga_sewa INTEGER NOT NULL,
+        image_url TEXT,
+        atribut TEXT,
+        is_available INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE INDEX IF NOT EXISTS idx_vehicles_kelas ON vehicles(kelas);
+    CREATE INDEX IF NOT EXISTS idx_vehicles_harga ON vehicles(harga_sewa);
+    CREATE INDEX IF NOT EXISTS idx_vehicles_available ON vehicles(is_available);
+
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY,
+        nama TEXT NOT NULL,
+        email TEXT NOT NULL,
+        password_hash TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+    CREATE TABLE IF NOT EXISTS bookings (
+        booking_id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(user_id),
+        kendaraan_id TEXT NOT NULL REFERENCES vehicles(id),
+        tgl_sewa TEXT NOT NULL,
+        tgl_kembali TEXT NOT NULL,
+        durasi_hari INTEGER NOT NULL,
+        total_biaya INTEGER NOT NULL,
+        status_booking TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_bookings_kendaraan ON bookings(kendaraan_id, tgl_sewa);
+    CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings(user_id);
+    CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status_booking);
+
+    CREATE TABLE IF NOT EXISTS payments (
+        pay_id INTEGER PRIMARY KEY,
+        booking_id INTEGER NOT NULL REFERENCES bookings(booking_id),
+        jumlah INTEGER NOT NULL,
+        metode TEXT NOT NULL,
+        tgl_bayar TEXT NOT NULL,
+        status_sukses INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_payments_booking ON payments(booking_id);
+    """
+
+    def __init__(self, path, pool_size=4):
+        self.path = path
+        # Pool FIFO: koneksi yang dikembalikan langsung diserahkan ke penunggu terlama.
+        # queue.Queue tidak adil (thread yang sedang berjalan bisa menyerobot), sehingga di bawah beban
+        # satu sesi bisa menunggu koneksi berdetik-detik.
+        self._bebas = [self._connect() for _ in range(pool_size)]
+        self._antrean = collections.deque()
+        self._lock_pool = threading.Lock()
+        with self.koneksi() as conn:
+            conn.executescript(self.SCHEMA)
+            # Database lama dibuat sebelum ada kolom password: user di dalamnya tidak bisa login sampai direset
+            kolom_users = {row["name"] for row in conn.execute("PRAGMA table_info(users)")}
+            if "password_hash" not in kolom_users:
+                conn.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
+
+    def _connect(self):
+        # isolation_level=None: transaksi diatur manual lewat BEGIN/COMMIT
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _ambil_koneksi(self):
+        with self._lock_pool:
+            if self._bebas and not self._antrean:
+                return self._bebas.pop()
+            # Slot tunggu: [event, koneksi yang diserahkan]
+            slot = [threading.Event(), None]
+            self._antrean.append(slot)
+        slot[0].wait()
+        return slot[1]
+
+    def _kembalikan_koneksi(self, conn):
+        with self._lock_pool:
+            if self._antrean:
+                slot = self._antrean.popleft()
+                slot[1] = conn
+                slot[0].set()
+            else:
+                self._bebas.append(conn)
+
+    @contextmanager
+    def koneksi(self):
+        conn = self._ambil_koneksi()
+        try:
+            yield conn
+        finally:
+            self._kembalikan_koneksi(conn)
+
+    @contextmanager
+    def transaksi(self):
+        with self.koneksi() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK")
+                raise KonflikData(str(e)) from e
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # --- Kendaraan ---
+    def simpan_kendaraan(self, kendaraan):
+        self.simpan_kendaraan_batch([kendaraan])
+
+    def simpan_kendaraan_batch(self, daftar_kendaraan):
+        # Semua unit masuk dalam satu transaksi: gagal satu, batal semua
+        with self.transaksi() as conn:
+            conn.executemany(
+                "INSERT INTO vehicles (id, kelas, merk, nopol, harga_sewa, image_url, atribut, is_available) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(k.id, type(k).__name__, k.merk, k.nopol, k.harga_sewa, k.image_url,
+                  json.dumps(getattr(k, k.atribut_khusus)), int(k.is_available)) for k in daftar_kendaraan]
+            )
+
+    def update_status_kendaraan(self, id_k, status):
+        with self.transaksi() as conn:
+            conn.execute("UPDATE vehicles SET is_available = ? WHERE id = ?", (int(status), id_k))
+
+    def load_kendaraan(self):
+        with self.koneksi() as conn:
+            rows = conn.execute("SELECT * FROM vehicles ORDER BY rowid").fetchall()
+        daftar = []
+        for row in rows:
+            kelas = KELAS_KENDARAAN[row["kelas"]]
+            kendaraan = kelas(row["id"], row["merk"], row["nopol"], row["harga_sewa"],
+                              row["image_url"], json.loads(row["atribut"]))
+            kendaraan.is_available = bool(row["is_available"])
+            daftar.append(kendaraan)
+        return daftar
+
+    # --- User ---
+    def buat_user(self, nama, email, password_hash=None):
+        # user_id dialokasikan oleh SQLite (INTEGER PRIMARY KEY)
+        with self.transaksi() as conn:
+            cursor = conn.execute("INSERT INTO users (nama, email, password_hash) VALUES (?, ?, ?)",
+                                  (nama, email, password_hash))
+            return User(cursor.lastrowid, nama, email)
+
+    def get_id_terakhir(self, tabel, kolom):
+        with self.koneksi() as conn:
+            row = conn.execute(f"SELECT MAX({kolom}) FROM {tabel}").fetchone()
+        return row[0] or 0
+
+    def get_user_by_email(self, email):
+        with self.koneksi() as conn:
+            row = conn.execute("SELECT * FROM users WHERE email = ? LIMIT 1", (email,)).fetchone()
+        return User(row["user_id"], row["nama"], row["email"]) if row else None
+
+    def get_password_hash(self, user_id):
+        with self.koneksi() as conn:
+            row = conn.execute("SELECT password_hash FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return row["password_hash"] if row else None
+
+    # --- Booking & Pembayaran ---
+    def simpan_booking(self, booking):
+        self.simpan_booking_batch([booking])
+
+    def simpan_booking_batch(self, daftar_booking):
+        # Booking beserta pembayarannya ditulis dalam satu transaksi
+        with self.transaksi() as conn:
+            for booking in daftar_booking:
+                conn.execute("INSERT OR IGNORE INTO users (user_id, nama, email) VALUES (?, ?, ?)",
+                             (booking.user.user_id, booking.user.nama, booking.user.email))
+                conn.execute(
+                    "INSERT INTO bookings (booking_id, user_id, kendaraan_id, tgl_sewa, tgl_kembali, "
+                    "durasi_hari, total_biaya, status_booking) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (booking.booking_id, booking.user.user_id, booking.kendaraan.id,
+                     booking.tgl_sewa.isoformat(), booking.tgl_kembali.isoformat(),
+                     booking.durasi_hari, booking.total_biaya, booking.status_booking)
+                )
+                if booking.pembayaran:
+                    bayar = booking.pembayaran
+                    conn.execute(
+                        "INSERT INTO payments (pay_id, booking_id, jumlah, metode, tgl_bayar, status_sukses) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (bayar.pay_id, booking.booking_id, bayar.jumlah, bayar.metode,
+                         bayar.tgl_bayar.isoformat(), int(bayar.status_sukses))
+                    )
+
+    def konfirmasi_pembayaran(self, booking, status, sukses):
+        # Status booking dan hasil verifikasi pembayaran ditulis bersama, sebelum booking di memori diubah
+        with self.transaksi() as conn:
+            conn.execute("UPDATE bookings SET status_booking = ? WHERE booking_id = ?",
+                         (status, booking.booking_id))
+            if booking.pembayaran:
+                conn.execute("UPDATE payments SET status_sukses = ? WHERE pay_id = ?",
+                             (int(sukses), booking.pembayaran.pay_id))
+
+    def update_status_booking(self, booking_id, status):
+        with self.transaksi() as conn:
+            conn.execute("UPDATE bookings SET status_booking = ? WHERE booking_id = ?", (status, booking_id))
+
+    def load_bookings(self, inventory_manager):
+        with self.koneksi() as conn:
+            rows = conn.execute(
+                "SELECT b.*, u.nama, u.email, p.pay_id, p.jumlah, p.metode, p.tgl_bayar, p.status_sukses "
+                "FROM bookings b JOIN users u ON u.user_id = b.user_id "
+                "LEFT JOIN payments p ON p.booking_id = b.booking_id ORDER BY b.rowid"
+            ).fetchall()
+        users = {}
+        daftar = []
+        for row in rows:
+            user = users.get(row["user_id"])
+            if user is None:
+                user = users[row["user_id"]] = User(row["user_id"], row["nama"], row["email"])
+            kendaraan = inventory_manager.get_mobil_by_id(row["kendaraan_id"])
+            booking = Booking(row["booking_id"], user, kendaraan,
+                              datetime.date.fromisoformat(row["tgl_sewa"]),
+                              datetime.date.fromisoformat(row["tgl_kembali"]),
+                              total_biaya=row["total_biaya"])
+            booking.durasi_hari = row["durasi_hari"]
+            booking.status_booking = StatusBooking(row["status_booking"])
+            if row["pay_id"] is not None:
+                pembayaran = Pembayaran(row["pay_id"], row["jumlah"], row["metode"])
+                pembayaran.tgl_bayar = datetime.datetime.fromisoformat(row["tgl_bayar"])
+                pembayaran.status_sukses = bool(row["status_sukses"])
+                booking.set_pembayaran(pembayaran)
+            daftar.append(booking)
+        return daftar
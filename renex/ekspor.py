@@ -0,0 +1,95 @@
+import csv
+import io
+import itertools
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Ekspor Parquet opsional
+    pa = None
+
+from .profiler import ukur
+from .laporan import STATUS_VALID
+
+# --- Class: EksporLaporan ---
+# Ekspor laporan keuangan: baris dibangkitkan satu per satu dari generator lalu diserialisasi per chunk
+# ke satu buffer bytes. Hanya satu chunk baris yang hidup sekaligus; hasil akhirnya tetap berada utuh di
+# memori (st.download_button membutuhkan bytes), jadi puncak memori kira-kira sebesar file hasil.
+class EksporLaporan:
+    KOLOM = ["ID Booking", "Tanggal Sewa", "Tanggal Kembali", "Penyewa", "Mobil", "Tipe",
+             "Durasi Hari", "Metode Bayar", "Total Biaya", "Status"]
+    UKURAN_CHUNK = 5000
+
+    def __init__(self, booking_service):
+        self.booking_service = booking_service
+
+    def iter_baris(self, tgl_dari=None, tgl_sampai=None):
+        bookings = self.booking_service.get_all_bookings()
+        # Panjang dibekukan di awal agar booking baru selama ekspor tidak ikut terbaca setengah jalan
+        for idx in range(len(bookings)):
+            b = bookings[idx]
+            if b.status_booking not in STATUS_VALID:
+                continue
+            if tgl_dari and b.tgl_sewa < tgl_dari:
+                continue
+            if tgl_sampai and b.tgl_sewa > tgl_sampai:
+                continue
+            yield (
+                b.booking_id,
+                b.tgl_sewa,
+                b.tgl_kembali,
+                b.user.nama,
+                f"{b.kendaraan.merk} ({b.kendaraan.nopol})",
+                type(b.kendaraan).__name__,
+                b.durasi_hari,
+                b.pembayaran.metode if b.pembayaran else "N/A",
+                b.total_biaya,
+                b.status_booking,
+            )
+
+    def _chunks(self, baris_iter):
+        while True:
+            chunk = list(itertools.islice(baris_iter, self.UKURAN_CHUNK))
+            if not chunk:
+                return
+            yield chunk
+
+    @ukur("ekspor.ke_csv")
+    def ke_csv(self, tgl_dari=None, tgl_sampai=None):
+        hasil = io.BytesIO()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.KOLOM)
+        for chunk in self._chunks(self.iter_baris(tgl_dari, tgl_sampai)):
+            writer.writerows(chunk)
+            hasil.write(buffer.getvalue().encode("utf-8"))
+            buffer.seek(0)
+            buffer.truncate()
+        hasil.write(buffer.getvalue().encode("utf-8"))
+        return hasil.getvalue()
+
+    @ukur("ekspor.ke_parquet")
+    def ke_parquet(self, tgl_dari=None, tgl_sampai=None):
+        if pa is None:
+            raise RuntimeError("Ekspor Parquet membutuhkan paket pyarrow.")
+        schema = pa.schema([
+            ("id_booking", pa.int64()),
+            ("tgl_sewa", pa.date32()),
+            ("tgl_kembali", pa.date32()),
+            ("penyewa", pa.string()),
+            ("mobil", pa.string()),
+            ("tipe", pa.string()),
+            ("durasi_hari", pa.int32()),
+            ("metode_bayar", pa.string()),
+            ("total_biaya", pa.int64()),
+            ("status", pa.string()),
+        ])
+        hasil = io.BytesIO()
+        with pq.ParquetWriter(hasil, schema) as writer:
+            for chunk in self._chunks(self.iter_baris(tgl_dari, tgl_sampai)):
+                kolom = list(zip(*chunk))
+                writer.write_batch(pa.record_batch(
+                    [pa.array(nilai, type=field.type) for nilai, field in zip(kolom, schema)],
+                    schema=schema
+                ))
+        return hasil.getvalue()
@@ -0,0 +1,581 @@
+import bisect
+import datetime
+import gc
+import json
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+from enum import StrEnum
+
+from .model import StatusBooking, MetodeBayar, User, Pembayaran, Booking, KonflikData
+from .kendaraan import KELAS_KENDARAAN
+
+# --- Enum: JenisEvent ---
+class JenisEvent(StrEnum):
+    KENDARAAN_DITAMBAH = "KendaraanDitambah"
+    STATUS_KENDARAAN = "StatusKendaraanDiubah"
+    USER_TERDAFTAR = "UserTerdaftar"
+    BOOKING_DIBUAT = "BookingDibuat"
+    PEMBAYARAN_DIVERIFIKASI = "PembayaranDiverifikasi"
+    BOOKING_SELESAI = "BookingSelesai"
+    STATUS_BOOKING = "StatusBookingDiubah"
+
+# --- Class: LogEvent ---
+# Log append-only dalam segmen file. Satu baris = satu event: "<crc32 hex> [seq, waktu, jenis, data]".
+# Satu thread penulis mengosongkan antrean per batch lalu melakukan satu fsync untuk seluruh batch
+# (group commit): pemanggil dari banyak sesi berbagi biaya fsync yang sama.
+# Baris terakhir yang terpotong (crash di tengah tulis) dibuang saat log dibuka kembali; baris rusak di
+# tempat lain membuat log menolak dibuka (ValueError) alih-alih diam-diam membuang event setelahnya.
+class LogEvent:
+    MAKS_SEGMEN_BYTES = 64 * 1024 * 1024
+    MAKS_ANTREAN = 100_000
+    BACA_EKOR_BYTES = 1024 * 1024
+    SIMPAN_SNAPSHOT = 2
+    POLA_SEGMEN = re.compile(r"segmen-(\d{12})\.log")
+    POLA_SNAPSHOT = re.compile(r"snapshot-(\d{12})\.jsonl")
+    BARIS_PER_POTONGAN = 10_000
+
+    def __init__(self, folder, maks_segmen_bytes=None):
+        self.folder = folder
+        self.maks_segmen_bytes = maks_segmen_bytes or self.MAKS_SEGMEN_BYTES
+        os.makedirs(folder, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._antrean = []
+        self._error = None
+        self._berhenti = False
+
+        # seq_terakhir: seq yang sudah dibagikan; seq_tahan: seq yang sudah aman di disk (fsync)
+        self.seq_terakhir = self._pulihkan()
+        self.seq_tahan = self.seq_terakhir
+        self.jumlah_fsync = 0
+        self._file = None
+        self._ukuran_segmen = 0
+        segmen = self._daftar_segmen()
+        if segmen:
+            self._buka_segmen(segmen[-1][1])
+
+        self._thread = threading.Thread(target=self._penulis, daemon=True, name="renex-log-event")
+        self._thread.start()
+
+    # --- Segmen ---
+    def _daftar(self, pola):
+        hasil = []
+        for nama in os.listdir(self.folder):
+            cocok = pola.fullmatch(nama)
+            if cocok:
+                hasil.append((int(cocok.group(1)), os.path.join(self.folder, nama)))
+        return sorted(hasil)
+
+    def _daftar_segmen(self):
+        return self._daftar(self.POLA_SEGMEN)
+
+    def _buka_segmen(self, path):
+        self._file = open(path, "ab")
+        self._ukuran_segmen = self._file.tell()
+
+    def _segmen_baru(self, seq_awal):
+        if self._file:
+            self._file.close()
+        self._buka_segmen(os.path.join(self.folder, f"segmen-{seq_awal:012d}.log"))
+        self._fsync_folder()
+
+    def _fsync_folder(self):
+        # Entri direktori (file segmen / snapshot baru) juga harus tahan crash
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.folder, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _urai_baris(baris):
+        # -> (seq, isi json) atau None bila baris rusak / terpotong; crc selalu 8 digit hex + spasi
+        if baris[-1:] != b"\n":
+            return None
+        isi = baris[9:-1]
+        try:
+            if int(baris[:8], 16) != zlib.crc32(isi):
+                return None
+            return int(isi[1:isi.index(b",")]), isi
+        except ValueError:
+            return None
+
+    def _pulihkan(self):
+        # Hanya ekor segmen terakhir yang mungkin berisi tulisan setengah jadi.
+        # Umumnya cukup memeriksa baris utuh terakhir; bila rusak, segmen dipindai dari awal.
+        # Baris rusak hanya dimaafkan di ujung fisik file; kerusakan di tengah segmen adalah korupsi.
+        segmen = self._daftar_segmen()
+        if not segmen:
+            return 0
+        seq_awal, path = segmen[-1]
+        with open(path, "rb") as f:
+            ukuran = f.seek(0, os.SEEK_END)
+            f.seek(max(ukuran - self.BACA_EKOR_BYTES, 0))
+            ekor = f.read()
+        akhir = ekor.rfind(b"\n")
+        awal_baris = ekor.rfind(b"\n", 0, akhir) + 1 if akhir >= 0 else 0
+        hasil = self._urai_baris(ekor[awal_baris:akhir + 1]) if akhir >= 0 else None
+        if hasil is not None and (awal_baris > 0 or ukuran <= self.BACA_EKOR_BYTES):
+            seq_terakhir, offset_valid = hasil[0], ukuran - len(ekor) + akhir + 1
+        else:
+            seq_terakhir, offset_valid = seq_awal - 1, 0
+            with open(path, "rb") as f:
+                for baris in f:
+                    hasil = self._urai_baris(baris)
+                    if hasil is None:
+                        if f.read(1):
+                            raise ValueError(f"Segmen log rusak di offset {offset_valid}: {path}")
+                        break
+                    seq_terakhir = hasil[0]
+                    offset_valid += len(baris)
+        if offset_valid < ukuran:
+            with open(path, "r+b") as f:
+                f.truncate(offset_valid)
+                os.fsync(f.fileno())
+        return seq_terakhir
+
+    # --- Penulisan ---
+    def tambah(self, jenis, data):
+        return self.tambah_batch([(jenis, data)])
+
+    def tambah_batch(self, daftar_event):
+        # Hanya mengantre dan membagikan seq; gunakan tunggu(seq) untuk menunggu sampai tahan crash
+        with self._cond:
+            while len(self._antrean) >= self.MAKS_ANTREAN and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise OSError("log event gagal ditulis") from self._error
+            waktu = round(time.time(), 3)
+            for jenis, data in daftar_event:
+                self.seq_terakhir += 1
+                self._antrean.append((self.seq_terakhir, waktu, jenis, data))
+            self._cond.notify_all()
+            return self.seq_terakhir
+
+    def tunggu(self, seq):
+        with self._cond:
+            while self.seq_tahan < seq and self._error is None:
+                self._cond.wait()
+            if self.seq_tahan < seq:
+                raise OSError("log event gagal ditulis") from self._error
+
+    def _penulis(self):
+        encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+        while True:
+            with self._cond:
+                while not self._antrean and not self._berhenti:
+                    self._cond.wait()
+                if not self._antrean:
+                    return
+                batch, self._antrean = self._antrean, []
+                self._cond.notify_all()
+
+            try:
+                potongan = []
+                for event in batch:
+                    isi = encoder.encode(event).encode("utf-8")
+                    potongan.append(b"%08x %s\n" % (zlib.crc32(isi), isi))
+                data = b"".join(potongan)
+                if self._file is None or self._ukuran_segmen >= self.maks_segmen_bytes:
+                    self._segmen_baru(batch[0][0])
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._ukuran_segmen += len(data)
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self.seq_tahan = batch[-1][0]
+                self.jumlah_fsync += 1
+                self._cond.notify_all()
+
+    def tutup(self):
+        with self._cond:
+            self._berhenti = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._file:
+            self._file.close()
+
+    # --- Pembacaan (replay & audit) ---
+    def baca(self, dari_seq=1):
+        # Generator [seq, waktu, jenis, data] mulai dari dari_seq; segmen sebelumnya dilewati tanpa dibaca
+        segmen = self._daftar_segmen()
+        mulai = max(bisect.bisect_right([seq for seq, _ in segmen], dari_seq) - 1, 0)
+        for i, (_, path) in enumerate(segmen[mulai:], start=mulai):
+            with open(path, "rb") as f:
+                for baris in f:
+                    hasil = self._urai_baris(baris)
+                    if hasil is None:
+                        # Ekor pulih sudah dipotong saat log dibuka: yang masih boleh rusak hanya baris
+                        # tanpa newline di ujung segmen terakhir, yaitu tulisan yang sedang berjalan
+                        if i == len(segmen) - 1 and baris[-1:] != b"\n":
+                            return
+                        raise ValueError(f"Segmen log rusak: {path}")
+                    # Baris sebelum dari_seq cukup dicek crc-nya, tanpa parse JSON
+                    if hasil[0] >= dari_seq:
+                        yield _DEKODER.raw_decode(hasil[1].decode("utf-8"))[0]
+
+    # --- Snapshot ---
+    # Format JSON lines: baris pertama kepala (nilai non-list), lalu potongan [nama bagian, daftar baris].
+    # Penulisan dan pemuatan berjalan per potongan, tanpa satu dokumen raksasa di memori.
+    def simpan_snapshot(self, seq, state):
+        # Snapshot baru ditulis setelah event sampai seq tahan crash, lalu dipasang secara atomik
+        self.tunggu(seq)
+        path = os.path.join(self.folder, f"snapshot-{seq:012d}.jsonl")
+        encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+        with open(path + ".tmp", "wb") as f:
+            kepala = {nama: nilai for nama, nilai in state.items() if not isinstance(nilai, list)}
+            f.write(encoder.encode(kepala).encode("utf-8") + b"\n")
+            for nama, daftar in state.items():
+                if not isinstance(daftar, list):
+                    continue
+                for i in range(0, len(daftar), self.BARIS_PER_POTONGAN):
+                    potongan = [nama, daftar[i:i + self.BARIS_PER_POTONGAN]]
+                    f.write(encoder.encode(potongan).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        self._fsync_folder()
+        # Snapshot lama bisa dibuang; log tetap utuh sebagai jejak audit
+        for _, lama in self._daftar(self.POLA_SNAPSHOT)[:-self.SIMPAN_SNAPSHOT]:
+            os.remove(lama)
+
+    def daftar_snapshot(self):
+        # [(seq, path)], terbaru lebih dulu
+        return self._daftar(self.POLA_SNAPSHOT)[::-1]
+
+    def baca_snapshot(self, path):
+        # Generator: kepala snapshot, lalu setiap potongan [nama bagian, daftar baris]
+        with open(path, "rb") as f:
+            for baris in f:
+                yield _DEKODER.decode(baris.decode("utf-8"))
+
+# Baris state ringkas (tuple) untuk proyeksi di memori dan snapshot
+BarisKendaraan = namedtuple("BarisKendaraan", "id kelas merk nopol harga_sewa image_url atribut is_available")
+BarisBooking = namedtuple("BarisBooking", "booking_id user_id kendaraan_id tgl_sewa tgl_kembali durasi_hari "
+                                          "total_biaya status pay_id jumlah metode tgl_bayar status_sukses")
+
+# Nilai string dari JSON dipetakan ke anggota enum: lookup dict lebih cepat dari memanggil enum,
+# dan jutaan baris berbagi satu objek string per status / metode (id mobil & tanggal memakai sys.intern)
+_STATUS = {status.value: status for status in StatusBooking}
+_METODE = {metode.value: metode for metode in MetodeBayar}
+_DEKODER = json.JSONDecoder()
+
+def _ganti(baris, kolom, nilai):
+    # Seperti namedtuple._replace, tanpa overhead keyword (dipanggil jutaan kali saat replay)
+    i = baris._fields.index(kolom)
+    return tuple.__new__(type(baris), baris[:i] + (nilai,) + baris[i + 1:])
+
+# --- Class: EventStore ---
+# Storage berbasis LogEvent dengan antarmuka yang sama seperti Database (dipilih via RENEX_STORAGE=eventlog).
+# Setiap perubahan dicatat sebagai event lalu diterapkan ke proyeksi state di memori.
+# Saat start: muat snapshot terbaru, lalu replay hanya event setelah snapshot tersebut.
+class EventStore:
+    INTERVAL_SNAPSHOT = 100_000
+    VERSI_SNAPSHOT = 1
+
+    def __init__(self, folder, interval_snapshot=None):
+        self.log = LogEvent(folder)
+        self.interval_snapshot = interval_snapshot or self.INTERVAL_SNAPSHOT
+        self._lock = threading.Lock()
+        self._snapshot_tertunda = None
+        self._snapshot_berjalan = False
+        self._kosongkan()
+
+        # GC siklik dimatikan selama memuat: jutaan tuple baru akan memicu pemindaian penuh berulang kali
+        gc_aktif = gc.isenabled()
+        gc.disable()
+        try:
+            self.seq_snapshot = 0
+            for seq, path in self.log.daftar_snapshot():
+                try:
+                    self._muat_snapshot(path)
+                except (ValueError, KeyError, TypeError):
+                    self._kosongkan()  # snapshot rusak / format lain: coba yang lebih lama
+                    continue
+                self.seq_snapshot = seq
+                break
+            self.jumlah_replay = 0
+            for _, _, jenis, data in self.log.baca(self.seq_snapshot + 1):
+                self._terapkan(jenis, data)
+                self.jumlah_replay += 1
+        except BaseException:
+            self.log.tutup()  # log rusak: hentikan thread penulis sebelum error diteruskan
+            raise
+        finally:
+            if gc_aktif:
+                gc.enable()
+
+    # --- Proyeksi ---
+    def _kosongkan(self):
+        self._kendaraan = {}
+        self._nopol = set()
+        self._users = {}
+        self._user_by_email = {}
+        self._bookings = {}
+        self._id_terakhir = {"users": 0, "bookings": 0, "payments": 0}
+
+    def _terapkan(self, jenis, data):
+        if jenis == JenisEvent.KENDARAAN_DITAMBAH:
+            for baris in data["kendaraan"]:
+                self._kendaraan[baris["id"]] = BarisKendaraan(**baris)
+                self._nopol.add(baris["nopol"])
+        elif jenis == JenisEvent.STATUS_KENDARAAN:
+            baris = self._kendaraan[data["id"]]
+            self._kendaraan[data["id"]] = _ganti(baris, "is_available", data["is_available"])
+        elif jenis == JenisEvent.USER_TERDAFTAR:
+            self._tambah_user(data["user_id"], data["nama"], data["email"], data.get("password_hash"))
+        elif jenis == JenisEvent.BOOKING_DIBUAT:
+            for b in data["booking"]:
+                if b["user_id"] not in self._users:
+                    self._tambah_user(b["user_id"], b["nama"], b["email"])
+                bayar = b["pembayaran"] or {}
+                self._bookings[b["booking_id"]] = BarisBooking(
+                    b["booking_id"], b["user_id"],
+                    sys.intern(b["kendaraan_id"]), sys.intern(b["tgl_sewa"]), sys.intern(b["tgl_kembali"]),
+                    b["durasi_hari"], b["total_biaya"], _STATUS[b["status"]],
+                    bayar.get("pay_id"), bayar.get("jumlah"),
+                    _METODE[bayar["metode"]] if bayar else None,
+                    bayar.get("tgl_bayar"), bayar.get("status_sukses")
+                )
+                self._id_terakhir["bookings"] = max(self._id_terakhir["bookings"], b["booking_id"])
+                if bayar:
+                    self._id_terakhir["payments"] = max(self._id_terakhir["payments"], bayar["pay_id"])
+        elif jenis == JenisEvent.PEMBAYARAN_DIVERIFIKASI:
+            baris = self._bookings[data["booking_id"]]
+            baris = _ganti(baris, "status", _STATUS[data["status"]])
+            self._bookings[data["booking_id"]] = _ganti(baris, "status_sukses", data["sukses"])
+        elif jenis in (JenisEvent.BOOKING_SELESAI, JenisEvent.STATUS_BOOKING):
+            baris = self._bookings[data["booking_id"]]
+            status = _STATUS[data.get("status", StatusBooking.COMPLETED)]
+            self._bookings[data["booking_id"]] = _ganti(baris, "status", status)
+
+    def _tambah_user(self, user_id, nama, email, password_hash=None):
+        # (user_id, nama, email, password_hash); snapshot lama hanya berisi tiga kolom pertama
+        self._users[user_id] = (user_id, nama, email, password_hash)
+        self._user_by_email.setdefault(email, user_id)
+        self._id_terakhir["users"] = max(self._id_terakhir["users"], user_id)
+
+    def _muat_snapshot(self, path):
+        potongan = self.log.baca_snapshot(path)
+        kepala = next(potongan)
+        if kepala.get("versi") != self.VERSI_SNAPSHOT:
+            raise ValueError(f"Versi snapshot {kepala.get('versi')} tidak didukung")
+        
+        i_status, i_metode = BarisBooking._fields.index("status"), BarisBooking._fields.index("metode")
+        i_string = [BarisBooking._fields.index(kolom) for kolom in ("kendaraan_id", "tgl_sewa", "tgl_kembali")]
+        for nama, daftar in potongan:
+            if nama == "kendaraan":
+                for baris in daftar:
+                    kendaraan = BarisKendaraan._make(baris)
+                    self._kendaraan[kendaraan.id] = kendaraan
+                    self._nopol.add(kendaraan.nopol)
+            elif nama == "users":
+                for baris in daftar:
+                    self._tambah_user(*baris)
+            elif nama == "bookings":
+                for baris in daftar:
+                    # id mobil & tanggal berulang di jutaan baris: cukup satu objek string per nilai
+                    for i in i_string:
+                        baris[i] = sys.intern(baris[i])
+                    baris[i_status] = _STATUS[baris[i_status]]
+                    if baris[i_metode] is not None:
+                        baris[i_metode] = _METODE[baris[i_metode]]
+                    self._bookings[baris[0]] = BarisBooking._make(baris)
+        self._id_terakhir.update(kepala["id_terakhir"])
+
+    def _salin_state(self):
+        # Dipanggil di bawah lock; baris berupa tuple immutable sehingga cukup salinan dangkal
+        return {
+            "versi": self.VERSI_SNAPSHOT,
+            "kendaraan": list(self._kendaraan.values()),
+            "users": list(self._users.values()),
+            "bookings": list(self._bookings.values()),
+            "id_terakhir": dict(self._id_terakhir),
+        }
+
+    # --- Pencatatan ---
+    def _catat(self, jenis, data):
+        # Pemanggil memegang self._lock: urutan seq di log = urutan penerapan ke proyeksi.
+        # Event ditulis ke log dulu baru diterapkan, sehingga proyeksi tidak pernah memuat perubahan yang
+        # tidak ada di log; pemanggil sudah memvalidasi data agar penerapan tidak gagal.
+        seq = self.log.tambah(jenis, data)
+        self._terapkan(jenis, data)
+        if (seq - self.seq_snapshot >= self.interval_snapshot and not self._snapshot_berjalan
+                and self._snapshot_tertunda is None):
+            self._snapshot_tertunda = (seq, self._salin_state())
+        return seq
+
+    def _tahan(self, seq):
+        # Menunggu fsync di luar lock, sehingga penulis lain bisa masuk ke batch yang sama
+        self.log.tunggu(seq)
+        with self._lock:
+            tertunda, self._snapshot_tertunda = self._snapshot_tertunda, None
+            if tertunda:
+                self._snapshot_berjalan = True
+        if tertunda:
+            threading.Thread(target=self._tulis_snapshot, args=tertunda, daemon=True,
+                             name="renex-snapshot").start()
+
+    def _tulis_snapshot(self, seq, state):
+        try:
+            self.log.simpan_snapshot(seq, state)
+            self.seq_snapshot = seq
+        finally:
+            self._snapshot_berjalan = False
+
+    def buat_snapshot(self):
+        with self._lock:
+            seq, state = self.log.seq_terakhir, self._salin_state()
+        self.log.simpan_snapshot(seq, state)
+        self.seq_snapshot = seq
+        return seq
+
+    def tutup(self):
+        self.log.tutup()
+
+    # --- Kendaraan ---
+    def simpan_kendaraan(self, kendaraan):
+        self.simpan_kendaraan_batch([kendaraan])
+
+    def simpan_kendaraan_batch(self, daftar_kendaraan):
+        # Satu event untuk seluruh batch: satu baris log, jadi tersimpan utuh atau tidak sama sekali
+        data = {"kendaraan": [{
+            "id": k.id, "kelas": type(k).__name__, "merk": k.merk, "nopol": k.nopol, "harga_sewa": k.harga_sewa,
+            "image_url": k.image_url, "atribut": getattr(k, k.atribut_khusus), "is_available": k.is_available,
+        } for k in daftar_kendaraan]}
+        with self._lock:
+            for k in daftar_kendaraan:
+                if k.id in self._kendaraan or k.nopol in self._nopol:
+                    raise KonflikData(f"Kendaraan {k.id} / {k.nopol} sudah terdaftar")
+            seq = self._catat(JenisEvent.KENDARAAN_DITAMBAH, data)
+        self._tahan(seq)
+
+    def update_status_kendaraan(self, id_k, status):
+        with self._lock:
+            if id_k not in self._kendaraan:
+                raise KeyError(id_k)
+            seq = self._catat(JenisEvent.STATUS_KENDARAAN, {"id": id_k, "is_available": bool(status)})
+        self._tahan(seq)
+
+    def load_kendaraan(self):
+        daftar = []
+        for baris in self._kendaraan.values():
+            kendaraan = KELAS_KENDARAAN[baris.kelas](baris.id, baris.merk, baris.nopol, baris.harga_sewa,
+                                                     baris.image_url, baris.atribut)
+            kendaraan.is_available = baris.is_available
+            daftar.append(kendaraan)
+        return daftar
+
+    # --- User ---
+    def buat_user(self, nama, email, password_hash=None):
+        with self._lock:
+            user_id = self._id_terakhir["users"] + 1
+            seq = self._catat(JenisEvent.USER_TERDAFTAR, {"user_id": user_id, "nama": nama, "email": email,
+                                                          "password_hash": password_hash})
+        self._tahan(seq)
+        return User(user_id, nama, email)
+
+    def get_id_terakhir(self, tabel, kolom):
+        return self._id_terakhir[tabel]
+
+    def get_user_by_email(self, email):
+        user_id = self._user_by_email.get(email)
+        return User(*self._users[user_id][:3]) if user_id is not None else None
+
+    def get_password_hash(self, user_id):
+        baris = self._users.get(user_id)
+        return baris[3] if baris else None
+
+    # --- Booking & Pembayaran ---
+    def simpan_booking(self, booking):
+        self.simpan_booking_batch([booking])
+
+    def simpan_booking_batch(self, daftar_booking):
+        data = {"booking": []}
+        for booking in daftar_booking:
+            bayar = booking.pembayaran
+            data["booking"].append({
+                "booking_id": booking.booking_id, "user_id": booking.user.user_id,
+                "nama": booking.user.nama, "email": booking.user.email,
+                "kendaraan_id": booking.kendaraan.id,
+                "tgl_sewa": booking.tgl_sewa.isoformat(), "tgl_kembali": booking.tgl_kembali.isoformat(),
+                "durasi_hari": booking.durasi_hari, "total_biaya": booking.total_biaya,
+                "status": booking.status_booking,
+                "pembayaran": {
+                    "pay_id": bayar.pay_id, "jumlah": bayar.jumlah, "metode": bayar.metode,
+                    "tgl_bayar": bayar.tgl_bayar.isoformat(), "status_sukses": bayar.status_sukses,
+                } if bayar else None,
+            })
+        with self._lock:
+            for booking in daftar_booking:
+                if booking.booking_id in self._bookings:
+                    raise KonflikData(f"Booking {booking.booking_id} sudah tercatat")
+            seq = self._catat(JenisEvent.BOOKING_DIBUAT, data)
+        self._tahan(seq)
+
+    def konfirmasi_pembayaran(self, booking, status, sukses):
+        sukses = bool(booking.pembayaran and sukses)
+        with self._lock:
+            if booking.booking_id not in self._bookings:
+                raise KeyError(booking.booking_id)
+            seq = self._catat(JenisEvent.PEMBAYARAN_DIVERIFIKASI, {
+                "booking_id": booking.booking_id, "status": status, "sukses": sukses,
+            })
+        self._tahan(seq)
+
+    def update_status_booking(self, booking_id, status):
+        if status == StatusBooking.COMPLETED:
+            jenis, data = JenisEvent.BOOKING_SELESAI, {"booking_id": booking_id}
+        else:
+            jenis, data = JenisEvent.STATUS_BOOKING, {"booking_id": booking_id, "status": status}
+        with self._lock:
+            if booking_id not in self._bookings:
+                raise KeyError(booking_id)
+            seq = self._catat(jenis, data)
+        self._tahan(seq)
+
+    def load_bookings(self, inventory_manager):
+        users = {}
+        daftar = []
+        for baris in self._bookings.values():
+            user = users.get(baris.user_id)
+            if user is None:
+                user = users[baris.user_id] = User(*self._users[baris.user_id][:3])
+            booking = Booking(baris.booking_id, user, inventory_manager.get_mobil_by_id(baris.kendaraan_id),
+                              datetime.date.fromisoformat(baris.tgl_sewa),
+                              datetime.date.fromisoformat(baris.tgl_kembali),
+                              total_biaya=baris.total_biaya)
+            booking.durasi_hari = baris.durasi_hari
+            booking.status_booking = baris.status
+            if baris.pay_id is not None:
+                pembayaran = Pembayaran(baris.pay_id, baris.jumlah, baris.metode)
+                pembayaran.tgl_bayar = datetime.datetime.fromisoformat(baris.tgl_bayar)
+                pembayaran.status_sukses = baris.status_sukses
+                booking.set_pembayaran(pembayaran)
+            daftar.append(booking)
+        return daftar
+
+    # --- Audit ---
+    def riwayat_booking(self, booking_id):
+        # Menelusuri seluruh log: semua event yang menyentuh satu booking, berurutan
+        riwayat = []
+        for event in self.log.baca():
+            data = event[3]
+            if event[2] == JenisEvent.BOOKING_DIBUAT:
+                if any(b["booking_id"] == booking_id for b in data["booking"]):
+                    riwayat.append(event)
+            elif data.get("booking_id") == booking_id:
+                riwayat.append(event)
+        return riwayat
@@ -0,0 +1,144 @@
+import hashlib
+import io
+import urllib.request
+import threading
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from .profiler import ukur
+
+# --- Class: GambarStore ---
+# Thumbnail WebP beberapa ukuran disimpan di disk dengan nama berbasis hash konten
+# (atau hash URL untuk gambar remote yang diunduh sekali), dengan cache LRU di memori di depannya.
+# URL remote yang belum punya thumbnail diunduh di thread pool: selama itu (dan selama GAGAL_TTL detik
+# setelah unduhan gagal) sumber asli dikembalikan, sehingga render tidak pernah menunggu jaringan.
+class GambarStore:
+    UKURAN = {"kecil": 160, "sedang": 480, "besar": 960}
+    MAKS_CACHE = 256
+    TIMEOUT_UNDUH = 10
+    GAGAL_TTL = 60
+    PEKERJA_UNDUH = 4
+
+    def __init__(self, folder="car_images", pengunduh=None, unduh_latar=True):
+        self.folder = folder
+        os.makedirs(self.folder, exist_ok=True)
+        # pengunduh(url) -> bytes; bisa diganti dengan sumber lokal (misal untuk pengujian offline)
+        self.pengunduh = pengunduh or self._unduh
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # unduh_latar=False: unduhan berjalan langsung di thread pemanggil
+        self._pool = (ThreadPoolExecutor(self.PEKERJA_UNDUH, thread_name_prefix="renex-gambar")
+                      if unduh_latar else None)
+        self._unduhan = {}  # kunci -> Future unduhan yang sedang berjalan
+        self._gagal = {}  # sumber -> waktu (monotonic) sumber boleh dicoba lagi
+
+    def _unduh(self, url):
+        request = urllib.request.Request(url, headers={"User-Agent": "RenexApp/1.0"})
+        with urllib.request.urlopen(request, timeout=self.TIMEOUT_UNDUH) as response:
+            return response.read()
+
+    def _path(self, kunci, ukuran):
+        return os.path.join(self.folder, f"{kunci}_{self.UKURAN[ukuran]}.webp")
+
+    def _buat_thumbnail(self, kunci, data):
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGB")
+            for ukuran, lebar in self.UKURAN.items():
+                path = self._path(kunci, ukuran)
+                if os.path.exists(path):
+                    continue
+                thumb = img.copy()
+                thumb.thumbnail((lebar, lebar * 4))
+                # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+                tmp_path = f"{path}.tmp{threading.get_ident()}"
+                thumb.save(tmp_path, "WEBP", quality=80, method=4)
+                os.replace(tmp_path, path)
+
+    def simpan_upload(self, data):
+        # Mengembalikan path thumbnail terbesar, dipakai sebagai image_url kendaraan
+        kunci = hashlib.sha256(data).hexdigest()[:20]
+        self._buat_thumbnail(kunci, data)
+        return self._path(kunci, "besar")
+
+    def _kunci_sumber(self, sumber):
+        # Thumbnail milik store sendiri: "<folder>/<kunci>_<lebar>.webp"
+        nama = os.path.basename(sumber)
+        if os.path.dirname(sumber) == self.folder and nama.endswith(".webp") and "_" in nama:
+            kunci = nama.rsplit("_", 1)[0]
+            if os.path.exists(self._path(kunci, "besar")):
+                return kunci
+        if sumber.startswith(("http://", "https://")):
+            kunci = "url-" + hashlib.sha256(sumber.encode("utf-8")).hexdigest()[:20]
+            if not os.path.exists(self._path(kunci, "besar")):
+                if self._pool is not None:
+                    self._mulai_unduh(kunci, sumber)
+                    return None
+                self._buat_thumbnail(kunci, self.pengunduh(sumber))
+            return kunci
+        with open(sumber, "rb") as f:
+            data = f.read()
+        kunci = hashlib.sha256(data).hexdigest()[:20]
+        self._buat_thumbnail(kunci, data)
+        return kunci
+
+    def _mulai_unduh(self, kunci, sumber):
+        with self._lock:
+            if kunci not in self._unduhan:
+                self._unduhan[kunci] = self._pool.submit(self._unduh_latar, kunci, sumber)
+
+    def _unduh_latar(self, kunci, sumber):
+        try:
+            self._buat_thumbnail(kunci, self.pengunduh(sumber))
+        except Exception:
+            self._tandai_gagal(sumber)
+        finally:
+            with self._lock:
+                self._unduhan.pop(kunci, None)
+
+    def _tandai_gagal(self, sumber):
+        sekarang = time.monotonic()
+        with self._lock:
+            if len(self._gagal) >= self.MAKS_CACHE:
+                self._gagal = {s: t for s, t in self._gagal.items() if t > sekarang}
+            self._gagal[sumber] = sekarang + self.GAGAL_TTL
+
+    def tunggu_unduhan(self):
+        # Menunggu semua unduhan latar yang sedang berjalan (pengujian / pemanasan cache)
+        with self._lock:
+            daftar = list(self._unduhan.values())
+        for future in daftar:
+            future.result()
+
+    @ukur("gambar.get")
+    def get(self, sumber, ukuran="sedang"):
+        # Mengembalikan bytes WebP ukuran yang diminta; bila belum siap / gagal, sumber asli apa adanya.
+        # Hanya bytes WebP yang masuk cache LRU: sumber asli tidak boleh tertahan di sana.
+        kunci_cache = (sumber, ukuran)
+        with self._lock:
+            if kunci_cache in self._cache:
+                self._cache.move_to_end(kunci_cache)
+                return self._cache[kunci_cache]
+            if self._gagal.get(sumber, 0) > time.monotonic():
+                return sumber
+        try:
+            kunci = self._kunci_sumber(sumber)
+            if kunci is None:
+                return sumber  # masih diunduh di latar
+            with open(self._path(kunci, ukuran), "rb") as f:
+                hasil = f.read()
+        except Exception:
+            # Gagal unduh / bukan gambar: jangan dicoba ulang di setiap rerun, tapi hanya sampai GAGAL_TTL
+            self._tandai_gagal(sumber)
+            return sumber
+        with self._lock:
+            self._gagal.pop(sumber, None)
+            self._cache[kunci_cache] = hasil
+            if len(self._cache) > self.MAKS_CACHE:
+                self._cache.popitem(last=False)
+        return hasil
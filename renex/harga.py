@@ -0,0 +1,133 @@
+import datetime
+import threading
+
+import numpy as np
+
+from .profiler import ukur
+from .kendaraan import KELAS_KENDARAAN
+
+# --- Class: MesinHarga ---
+# Aturan harga (akhir pekan, hari libur, musim per tipe mobil, diskon sewa panjang) dikompilasi menjadi
+# array pengali harian per tipe untuk horizon bergulir, lalu disimpan sebagai prefix-sum. Total sewa untuk
+# rentang tanggal berapa pun cukup selisih dua elemen prefix, bukan loop per hari.
+ATURAN_HARGA = {
+    "tambahan_akhir_pekan": 0.10,
+    "tambahan_hari_libur": 0.15,
+    # Tanggal tertentu (datetime.date) atau (bulan, tanggal) yang berulang setiap tahun.
+    # Bawaan hanya libur nasional bertanggal tetap; libur yang bergeser (Imlek, Nyepi, Idul Fitri, dst.)
+    # ditambahkan per tahun sebagai datetime.date.
+    "hari_libur": [(1, 1), (5, 1), (6, 1), (8, 17), (12, 25)],
+    # (durasi minimum dalam hari, diskon)
+    "diskon_sewa_panjang": [(7, 0.10), (30, 0.20)],
+    # (tipe mobil atau None untuk semua, tanggal mulai, tanggal selesai, pengali)
+    "musim": [],
+}
+
+class MesinHarga:
+    HORIZON_HARI = 365
+    MAKS_MEMO = 4096
+    ORDINAL_EPOCH = datetime.date(1970, 1, 1).toordinal()
+    PRESISI_PENGALI = 9
+
+    def __init__(self, aturan=None, horizon_hari=None):
+        self.horizon_hari = horizon_hari or self.HORIZON_HARI
+        self._lock = threading.Lock()
+        self.versi = 0
+        self.set_aturan(aturan or {})
+
+    def set_aturan(self, aturan):
+        # Ganti aturan: tabel dikompilasi ulang saat dipakai dan semua kutipan ter-memo dibuang
+        with self._lock:
+            self.aturan = dict(aturan)
+            self._tabel = None
+            self._memo = {}
+            self.versi += 1
+
+    def _pengali_harian(self, kelas, ordinals):
+        pengali = np.ones(len(ordinals))
+        # date.fromordinal(1) adalah hari Senin, jadi (ordinal - 1) % 7 >= 5 berarti Sabtu/Minggu
+        akhir_pekan = (ordinals - 1) % 7 >= 5
+        pengali[akhir_pekan] *= 1 + self.aturan.get("tambahan_akhir_pekan", 0)
+        hari_libur = self.aturan.get("hari_libur", [])
+        if hari_libur:
+            libur = np.isin(ordinals, [tgl.toordinal() for tgl in hari_libur if isinstance(tgl, datetime.date)])
+            tahunan = [bulan * 100 + hari for bulan, hari in
+                       (tgl for tgl in hari_libur if not isinstance(tgl, datetime.date))]
+            if tahunan:
+                # Kode bulan*100+tanggal per hari, dari ordinal lewat datetime64
+                tanggal = (ordinals - self.ORDINAL_EPOCH).astype("datetime64[D]")
+                bulan = tanggal.astype("datetime64[M]")
+                kode = (bulan.astype(np.int64) % 12 + 1) * 100 + (tanggal - bulan).astype(np.int64) + 1
+                libur |= np.isin(kode, tahunan)
+            pengali[libur] *= 1 + self.aturan.get("tambahan_hari_libur", 0)
+        for kelas_musim, tgl_mulai, tgl_selesai, faktor in self.aturan.get("musim", []):
+            if kelas_musim is None or kelas_musim == kelas:
+                pengali[(ordinals >= tgl_mulai.toordinal()) & (ordinals <= tgl_selesai.toordinal())] *= faktor
+        return pengali
+
+    def _get_tabel(self):
+        awal = datetime.date.today().toordinal()
+        tabel = self._tabel
+        if tabel is not None and tabel[0] == awal:
+            return tabel
+        with self._lock:
+            # Horizon bergulir: dikompilasi ulang bila hari sudah berganti
+            if self._tabel is None or self._tabel[0] != awal:
+                ordinals = np.arange(awal, awal + self.horizon_hari)
+                prefix = {
+                    kelas: np.concatenate(([0.0], np.cumsum(self._pengali_harian(kelas, ordinals))))
+                    for kelas in KELAS_KENDARAAN
+                }
+                self._tabel = (awal, prefix)
+                self._memo = {}
+            return self._tabel
+
+    def _jumlah_pengali(self, kelas, awal, durasi):
+        # Dibulatkan ke PRESISI_PENGALI desimal: selisih dua prefix-sum membawa galat float yang berbeda
+        # dengan penjumlahan langsung, dan pada harga yang jatuh tepat di ,5 rupiah galat itu mengubah
+        # pembulatan. Dengan begini kutipan tidak bergantung pada jalur (tabel / langsung) yang dipakai.
+        awal_tabel, prefix = self._get_tabel()
+        i = awal - awal_tabel
+        if 0 <= i and i + durasi <= self.horizon_hari:
+            return round(float(prefix[kelas][i + durasi] - prefix[kelas][i]), self.PRESISI_PENGALI)
+        # Di luar horizon (riwayat lama / terlalu jauh ke depan): hitung langsung
+        return round(float(self._pengali_harian(kelas, np.arange(awal, awal + durasi)).sum()), self.PRESISI_PENGALI)
+
+    def diskon(self, durasi):
+        return max((d for minimum, d in self.aturan.get("diskon_sewa_panjang", []) if durasi >= minimum), default=0)
+
+    @staticmethod
+    def durasi(tgl_mulai, tgl_selesai):
+        delta = (tgl_selesai - tgl_mulai).days
+        return delta if delta > 0 else 1
+
+    def kutipan(self, kendaraan, tgl_mulai, tgl_selesai):
+        durasi = self.durasi(tgl_mulai, tgl_selesai)
+        kelas = type(kendaraan).__name__
+        kunci = (kelas, kendaraan.harga_sewa, tgl_mulai, durasi)
+        # Memo & versi diambil sekali: bila set_aturan / kompilasi ulang mengganti memo di tengah jalan,
+        # hasil hitungan aturan lama tidak boleh masuk ke memo yang baru
+        memo, versi = self._memo, self.versi
+        hasil = memo.get(kunci)
+        if hasil is None:
+            total_pengali = self._jumlah_pengali(kelas, tgl_mulai.toordinal(), durasi)
+            hasil = int(round(kendaraan.harga_sewa * total_pengali * (1 - self.diskon(durasi))))
+            with self._lock:
+                if self.versi == versi and self._memo is memo:
+                    if len(memo) >= self.MAKS_MEMO:
+                        memo.clear()
+                    memo[kunci] = hasil
+        return hasil
+
+    @ukur("harga.kutipan_batch")
+    def kutipan_batch(self, daftar_kendaraan, tgl_mulai, tgl_selesai):
+        # Kutipan banyak mobil sekaligus untuk rentang yang sama: satu lookup prefix per tipe, lalu operasi array
+        durasi = self.durasi(tgl_mulai, tgl_selesai)
+        awal = tgl_mulai.toordinal()
+        pengali_kelas = {kelas: self._jumlah_pengali(kelas, awal, durasi) for kelas in KELAS_KENDARAAN}
+        harga = np.fromiter((k.harga_sewa for k in daftar_kendaraan), dtype=np.float64, count=len(daftar_kendaraan))
+        pengali = np.fromiter((pengali_kelas[type(k).__name__] for k in daftar_kendaraan),
+                              dtype=np.float64, count=len(daftar_kendaraan))
+        return np.rint(harga * pengali * (1 - self.diskon(durasi))).astype(np.int64)
+
+mesin_harga = MesinHarga(ATURAN_HARGA)
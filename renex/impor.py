@@ -0,0 +1,90 @@
+import io
+import json
+
+import pandas as pd
+
+from .kendaraan import KELAS_KENDARAAN
+
+# --- Class: ImportArmada ---
+# Membaca file armada (CSV/JSON) dan memvalidasi semua baris sekaligus dengan operasi kolom pandas.
+# Kolom: kelas, merk, nopol, harga_sewa, atribut (bagasi / kenyamanan / 4WD), image_url (opsional).
+class ImportArmada:
+    KOLOM_WAJIB = ("kelas", "merk", "nopol", "harga_sewa")
+    NILAI_BENAR = ("true", "1", "ya", "yes", "y", "4wd")
+
+    def __init__(self, inventory_manager, gambar_default=None):
+        self.inventory_manager = inventory_manager
+        self.gambar_default = gambar_default or {}
+
+    def baca(self, data, nama_file):
+        if nama_file.lower().endswith(".json"):
+            df = pd.DataFrame(json.loads(data))
+        else:
+            df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+        df.columns = [str(kolom).strip().lower() for kolom in df.columns]
+        kurang = [kolom for kolom in self.KOLOM_WAJIB if kolom not in df.columns]
+        if kurang:
+            raise ValueError(f"Kolom wajib tidak ada: {', '.join(kurang)}")
+        for kolom in ("atribut", "image_url"):
+            if kolom not in df.columns:
+                df[kolom] = ""
+        return df.reset_index(drop=True)
+
+    def validasi(self, df):
+        # Mengembalikan (daftar kendaraan valid, daftar (nomor_baris, alasan) yang ditolak)
+        # null di JSON dikosongkan dulu agar tidak menjadi teks "None" / "nan"
+        teks = {kolom: df[kolom].fillna("").astype(str).str.strip()
+                for kolom in ("kelas", "merk", "nopol", "atribut", "image_url")}
+        kelas = teks["kelas"]
+        merk = teks["merk"]
+        nopol = teks["nopol"].map(self.inventory_manager.normalisasi_nopol)
+        harga = pd.to_numeric(df["harga_sewa"], errors="coerce")
+        atribut = teks["atribut"]
+        image_url = teks["image_url"]
+        
+        is_hatchback = kelas == "Hatchback"
+        is_sedan = kelas == "Sedan"
+        is_suv = kelas == "SUV"
+        bagasi = pd.to_numeric(atribut.where(is_hatchback), errors="coerce")
+        
+        aturan = [
+            (~kelas.isin(list(KELAS_KENDARAAN)), "kelas harus Hatchback/Sedan/SUV"),
+            (merk == "", "merk kosong"),
+            (nopol == "", "nopol kosong"),
+            (harga.isna() | (harga <= 0), "harga_sewa tidak valid"),
+            (harga % 1 != 0, "harga_sewa harus bilangan bulat"),
+            (is_hatchback & (bagasi.isna() | (bagasi <= 0)), "kapasitas bagasi tidak valid"),
+            (nopol.duplicated(keep="first") & (nopol != ""), "nopol ganda di dalam file"),
+            (nopol.map(self.inventory_manager.get_mobil_by_nopol).notna(), "nopol sudah terdaftar"),
+        ]
+        ditolak = pd.Series(False, index=df.index)
+        kesalahan = []
+        for mask, alasan in aturan:
+            mask = mask.fillna(True)
+            kesalahan.extend((idx + 1, alasan) for idx in df.index[mask & ~ditolak])
+            ditolak |= mask
+        
+        nilai_atribut = pd.Series(None, index=df.index, dtype=object)
+        # int() per elemen: Series int yang dimasukkan ke Series object akan kembali menjadi float
+        nilai_atribut[is_hatchback] = [int(nilai) for nilai in bagasi[is_hatchback].fillna(0)]
+        nilai_atribut[is_sedan] = atribut[is_sedan].replace("", "Standard")
+        nilai_atribut[is_suv] = atribut[is_suv].str.lower().isin(self.NILAI_BENAR)
+        image_url = image_url.where(image_url != "", kelas.map(self.gambar_default).fillna(""))
+        
+        # Id belum dialokasikan (None): validasi hanya pratinjau, id baru dipakai saat simpan()
+        valid = ~ditolak
+        daftar_kendaraan = [
+            KELAS_KENDARAAN[k](None, m, n, int(h), img, a)
+            for k, m, n, h, img, a in zip(
+                kelas[valid], merk[valid], nopol[valid], harga[valid],
+                image_url[valid], nilai_atribut[valid]
+            )
+        ]
+        return daftar_kendaraan, sorted(kesalahan)
+
+    def simpan(self, daftar_kendaraan):
+        # Hasil validasi() diberi id lalu disimpan sekaligus; False bila bentrok dengan inventory
+        ids = self.inventory_manager.alokasi_id(len(daftar_kendaraan))
+        for kendaraan, id_k in zip(daftar_kendaraan, ids):
+            kendaraan.id = id_k
+        return self.inventory_manager.tambah_unit_batch(daftar_kendaraan)
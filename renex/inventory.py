@@ -0,0 +1,285 @@
+import datetime
+import array
+import bisect
+import itertools
+import re
+import threading
+from collections import OrderedDict
+
+from .profiler import ukur
+from .model import KonflikData
+
+# --- Class: JadwalSewa ---
+# Daftar interval sewa [mulai, selesai) per kendaraan, terurut dan tidak saling tumpang tindih.
+# Karena tidak ada overlap, list tanggal selesai juga ikut terurut sehingga cek bentrok cukup O(log k).
+# Lock per kendaraan membuat cek-lalu-simpan di tambah() atomik antar thread.
+# Pembaca (bentrok, get_jadwal) tidak memakai lock: penulis menyusun list baru lalu menukar satu
+# atribut _data sekaligus (copy-on-write), jadi pembaca selalu melihat snapshot yang utuh.
+class JadwalSewa:
+    def __init__(self):
+        # (list mulai, list selesai, array booking_id) -- sejajar, tidak pernah diubah setelah dipasang
+        self._data = ([], [], array.array("q"))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bentrok(data, tgl_mulai, tgl_selesai):
+        mulai, selesai, _ = data
+        idx = bisect.bisect_left(mulai, tgl_selesai) - 1
+        return idx >= 0 and selesai[idx] > tgl_mulai
+
+    def bentrok(self, tgl_mulai, tgl_selesai):
+        return self._bentrok(self._data, tgl_mulai, tgl_selesai)
+
+    def tambah(self, tgl_mulai, tgl_selesai, booking_id):
+        with self._lock:
+            data = self._data
+            if self._bentrok(data, tgl_mulai, tgl_selesai):
+                return False
+            mulai, selesai, booking_ids = data
+            idx = bisect.bisect_left(mulai, tgl_mulai)
+            booking_ids = booking_ids[:idx] + array.array("q", [booking_id]) + booking_ids[idx:]
+            self._data = (mulai[:idx] + [tgl_mulai] + mulai[idx:],
+                          selesai[:idx] + [tgl_selesai] + selesai[idx:], booking_ids)
+            return True
+
+    def hapus(self, tgl_mulai, booking_id):
+        with self._lock:
+            mulai, selesai, booking_ids = self._data
+            idx = bisect.bisect_left(mulai, tgl_mulai)
+            while idx < len(mulai) and mulai[idx] == tgl_mulai:
+                if booking_ids[idx] == booking_id:
+                    self._data = (mulai[:idx] + mulai[idx + 1:], selesai[:idx] + selesai[idx + 1:],
+                                  booking_ids[:idx] + booking_ids[idx + 1:])
+                    return True
+                idx += 1
+            return False
+
+    def get_jadwal(self, dari_tgl=None):
+        # Interval yang belum berakhir per dari_tgl, terurut berdasarkan tanggal mulai
+        mulai, selesai, booking_ids = self._data
+        idx = 0 if dari_tgl is None else bisect.bisect_right(selesai, dari_tgl)
+        return list(zip(mulai[idx:], selesai[idx:], booking_ids[idx:]))
+
+    def __len__(self):
+        return len(self._data[0])
+
+# --- Class: InventoryManager ---
+class InventoryManager:
+    MAKS_CACHE_CARI = 64
+
+    def __init__(self, storage=None):
+        self.storage = storage
+        self.daftar_mobil = []
+        # Index utama: lookup O(1) berdasarkan id dan nopol
+        self._by_id = {}
+        self._by_nopol = {}
+        # Index sekunder: kelas kendaraan -> set id
+        self._by_kelas = {}
+        # Index harga terurut (dua list sejajar) untuk range query via bisect
+        self._harga_keys = []
+        self._harga_ids = []
+        # Jadwal sewa per kendaraan: id -> JadwalSewa
+        self._jadwal = {}
+        # Melindungi perubahan index saat unit baru ditambahkan dari beberapa sesi
+        self._lock = threading.Lock()
+        # Versi unit naik saat armada berubah, versi jadwal saat ada reservasi / pembatalan; kunci cache pencarian.
+        # Dipisah agar booking tidak membuang cache pencarian tanpa tanggal (yang tidak membaca jadwal).
+        self._versi_counter = itertools.count(1)
+        self.versi_unit = 0
+        self.versi_jadwal = 0
+        # Cache hasil pencarian katalog: kunci query -> (versi, hasil), LRU
+        self._cache_cari = OrderedDict()
+        # Lock terpisah dari _lock: sesi lain bisa membaca / mengisi cache bersamaan (get lalu move_to_end)
+        self._lock_cache = threading.Lock()
+        # Nomor terbesar dari id berformat "C<angka>"; sumber id baru yang tidak bentrok
+        self._id_terakhir = 0
+
+        if self.storage:
+            self._index_batch(self.storage.load_kendaraan())
+
+    @staticmethod
+    def normalisasi_nopol(nopol):
+        # Satu bentuk kanonik untuk semua jalur masuk (form, impor, API): huruf besar, spasi tunggal
+        return " ".join(str(nopol).split()).upper()
+
+    @ukur("inventory.tambah_unit")
+    def tambah_unit(self, kendaraan):
+        kendaraan.nopol = self.normalisasi_nopol(kendaraan.nopol)
+        with self._lock:
+            if kendaraan.id in self._by_id or kendaraan.nopol in self._by_nopol:
+                return False
+            if self.storage:
+                try:
+                    self.storage.simpan_kendaraan(kendaraan)
+                except KonflikData:
+                    return False
+            self._index_unit(kendaraan)
+            return True
+
+    @ukur("inventory.tambah_unit_batch")
+    def tambah_unit_batch(self, daftar_kendaraan):
+        # Semua-atau-tidak-sama-sekali: satu transaksi storage dan satu kali pembaruan index
+        for kendaraan in daftar_kendaraan:
+            kendaraan.nopol = self.normalisasi_nopol(kendaraan.nopol)
+        with self._lock:
+            ids, nopols = set(), set()
+            for kendaraan in daftar_kendaraan:
+                if (kendaraan.id in self._by_id or kendaraan.id in ids
+                        or kendaraan.nopol in self._by_nopol or kendaraan.nopol in nopols):
+                    return False
+                ids.add(kendaraan.id)
+                nopols.add(kendaraan.nopol)
+            if self.storage:
+                try:
+                    self.storage.simpan_kendaraan_batch(daftar_kendaraan)
+                except KonflikData:
+                    return False
+            self._index_batch(daftar_kendaraan)
+            return True
+
+    def alokasi_id(self, jumlah=1):
+        with self._lock:
+            hasil = []
+            while len(hasil) < jumlah:
+                self._id_terakhir += 1
+                id_baru = f"C{self._id_terakhir:02d}"
+                if id_baru not in self._by_id:
+                    hasil.append(id_baru)
+            return hasil
+
+    def _catat_id(self, id_k):
+        cocok = re.fullmatch(r"C(\d+)", str(id_k))
+        if cocok:
+            self._id_terakhir = max(self._id_terakhir, int(cocok.group(1)))
+
+    def _index_dasar(self, kendaraan):
+        self.daftar_mobil.append(kendaraan)
+        self._by_id[kendaraan.id] = kendaraan
+        # Unit lama di storage bisa tersimpan sebelum nopol dinormalisasi: index selalu memakai bentuk kanonik
+        self._by_nopol[self.normalisasi_nopol(kendaraan.nopol)] = kendaraan
+        self._by_kelas.setdefault(type(kendaraan).__name__, set()).add(kendaraan.id)
+        self._jadwal[kendaraan.id] = JadwalSewa()
+        self._catat_id(kendaraan.id)
+
+    def _index_unit(self, kendaraan):
+        self._index_dasar(kendaraan)
+        pos = bisect.bisect_right(self._harga_keys, kendaraan.harga_sewa)
+        self._harga_keys.insert(pos, kendaraan.harga_sewa)
+        self._harga_ids.insert(pos, kendaraan.id)
+        self._naikkan_versi()
+
+    def _index_batch(self, daftar_kendaraan):
+        if not daftar_kendaraan:
+            return
+        for kendaraan in daftar_kendaraan:
+            self._index_dasar(kendaraan)
+        # Index harga dibangun ulang sekali (sort stabil) alih-alih insert satu per satu
+        pasangan = sorted(
+            itertools.chain(zip(self._harga_keys, self._harga_ids),
+                            ((k.harga_sewa, k.id) for k in daftar_kendaraan)),
+            key=lambda item: item[0]
+        )
+        self._harga_keys = [harga for harga, _ in pasangan]
+        self._harga_ids = [id_k for _, id_k in pasangan]
+        self._naikkan_versi()
+
+    def _naikkan_versi(self):
+        self.versi_unit = next(self._versi_counter)
+
+    def _naikkan_versi_jadwal(self):
+        self.versi_jadwal = next(self._versi_counter)
+
+    def get_all_mobil(self):
+        return self.daftar_mobil
+        
+    def get_mobil_by_id(self, id_k):
+        return self._by_id.get(id_k)
+
+    def get_mobil_by_nopol(self, nopol):
+        return self._by_nopol.get(self.normalisasi_nopol(nopol))
+
+    def get_mobil_by_harga(self, harga_min=None, harga_max=None):
+        # Range query [harga_min, harga_max] di atas index harga terurut
+        lo = 0 if harga_min is None else bisect.bisect_left(self._harga_keys, harga_min)
+        hi = len(self._harga_keys) if harga_max is None else bisect.bisect_right(self._harga_keys, harga_max)
+        return [self._by_id[id_k] for id_k in self._harga_ids[lo:hi]]
+
+    @staticmethod
+    def _rentang(tgl_mulai, tgl_selesai):
+        # Sewa di hari yang sama tetap dihitung satu hari penuh
+        if tgl_selesai <= tgl_mulai:
+            tgl_selesai = tgl_mulai + datetime.timedelta(days=1)
+        return tgl_mulai, tgl_selesai
+
+    @ukur("inventory.is_tersedia")
+    def is_tersedia(self, id_k, tgl_mulai, tgl_selesai):
+        mobil = self._by_id.get(id_k)
+        if mobil is None or not mobil.is_available:
+            return False
+        return not self._jadwal[id_k].bentrok(*self._rentang(tgl_mulai, tgl_selesai))
+
+    def sedang_disewa(self, id_k, tanggal=None):
+        tanggal = tanggal or datetime.date.today()
+        return self._jadwal[id_k].bentrok(*self._rentang(tanggal, tanggal))
+
+    @ukur("inventory.get_mobil_tersedia_antara")
+    def get_mobil_tersedia_antara(self, tgl_mulai, tgl_selesai):
+        tgl_mulai, tgl_selesai = self._rentang(tgl_mulai, tgl_selesai)
+        return [mobil for mobil in self.daftar_mobil
+                if mobil.is_available and not self._jadwal[mobil.id].bentrok(tgl_mulai, tgl_selesai)]
+
+    def get_rentang_harga(self):
+        if not self._harga_keys:
+            return 0, 0
+        return self._harga_keys[0], self._harga_keys[-1]
+
+    @ukur("inventory.cari_mobil")
+    def cari_mobil(self, kelas=None, harga_min=None, harga_max=None,
+                   tgl_mulai=None, tgl_selesai=None, urutan="harga_asc"):
+        kunci = (kelas, harga_min, harga_max, tgl_mulai, tgl_selesai, urutan)
+        pakai_jadwal = bool(tgl_mulai and tgl_selesai)
+        versi = (self.versi_unit, self.versi_jadwal) if pakai_jadwal else (self.versi_unit,)
+        with self._lock_cache:
+            cache = self._cache_cari.get(kunci)
+            if cache and cache[0] == versi:
+                self._cache_cari.move_to_end(kunci)
+                return cache[1]
+        
+        # Mulai dari index harga (sudah terurut), lalu saring dengan index kelas & jadwal
+        hasil = self.get_mobil_by_harga(harga_min, harga_max)
+        if kelas:
+            ids_kelas = self._by_kelas.get(kelas, set())
+            hasil = [mobil for mobil in hasil if mobil.id in ids_kelas]
+        if pakai_jadwal:
+            tgl_mulai, tgl_selesai = self._rentang(tgl_mulai, tgl_selesai)
+            hasil = [mobil for mobil in hasil
+                     if mobil.is_available and not self._jadwal[mobil.id].bentrok(tgl_mulai, tgl_selesai)]
+        if urutan == "harga_desc":
+            hasil.reverse()
+        elif urutan == "merk":
+            hasil.sort(key=lambda mobil: mobil.merk.lower())
+        
+        with self._lock_cache:
+            self._cache_cari[kunci] = (versi, hasil)
+            if len(self._cache_cari) > self.MAKS_CACHE_CARI:
+                self._cache_cari.popitem(last=False)
+        return hasil
+
+    def get_jadwal(self, id_k, dari_tgl=None):
+        return self._jadwal[id_k].get_jadwal(dari_tgl)
+
+    @ukur("inventory.reservasi")
+    def reservasi(self, id_k, tgl_mulai, tgl_selesai, booking_id):
+        mobil = self._by_id.get(id_k)
+        if mobil is None or not mobil.is_available:
+            return False
+        if not self._jadwal[id_k].tambah(*self._rentang(tgl_mulai, tgl_selesai), booking_id):
+            return False
+        self._naikkan_versi_jadwal()
+        return True
+
+    def batalkan_reservasi(self, id_k, tgl_mulai, booking_id):
+        if not self._jadwal[id_k].hapus(tgl_mulai, booking_id):
+            return False
+        self._naikkan_versi_jadwal()
+        return True
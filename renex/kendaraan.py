@@ -0,0 +1,68 @@
+from abc import ABC, abstractmethod
+
+# --- Class: Kendaraan ---
+class Kendaraan(ABC):
+    __slots__ = ("id", "merk", "nopol", "harga_sewa", "image_url", "is_available")
+
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url):
+        self.id = id_k
+        self.merk = merk
+        self.nopol = nopol
+        self.harga_sewa = harga_sewa
+        self.image_url = image_url 
+        self.is_available = True
+
+    def get_status(self):
+        return self.is_available
+
+    def get_harga(self):
+        return self.harga_sewa
+
+    def ke_dict(self):
+        # Bentuk JSON untuk API; atribut khusus tiap tipe disimpan di kunci "atribut"
+        return {
+            "id": self.id, "kelas": type(self).__name__, "merk": self.merk, "nopol": self.nopol,
+            "harga_sewa": self.harga_sewa, "image_url": self.image_url, "is_available": self.is_available,
+            "atribut": getattr(self, self.atribut_khusus), "info": self.get_detail_info(),
+        }
+
+    @abstractmethod
+    def get_detail_info(self):
+        pass
+
+# --- Concrete Classes ---
+class Hatchback(Kendaraan):
+    __slots__ = ("kapasitas_bagasi",)
+    atribut_khusus = "kapasitas_bagasi"
+
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, kapasitas_bagasi):
+        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
+        self.kapasitas_bagasi = kapasitas_bagasi
+
+    def get_detail_info(self):
+        return f"Hatchback - Bagasi: {self.kapasitas_bagasi}L"
+
+class Sedan(Kendaraan):
+    __slots__ = ("tingkat_kenyamanan",)
+    atribut_khusus = "tingkat_kenyamanan"
+
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, tingkat_kenyamanan):
+        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
+        self.tingkat_kenyamanan = tingkat_kenyamanan
+
+    def get_detail_info(self):
+        return f"Sedan - Kenyamanan: {self.tingkat_kenyamanan}"
+
+class SUV(Kendaraan):
+    __slots__ = ("four_wheel_drive",)
+    atribut_khusus = "four_wheel_drive"
+
+    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, four_wheel_drive):
+        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
+        self.four_wheel_drive = four_wheel_drive
+
+    def get_detail_info(self):
+        wd_status = "4WD" if self.four_wheel_drive else "2WD"
+        return f"SUV - {wd_status}"
+
+KELAS_KENDARAAN = {"Hatchback": Hatchback, "Sedan": Sedan, "SUV": SUV}
@@ -0,0 +1,153 @@
+import datetime
+import array
+import threading
+
+import numpy as np
+
+from .model import StatusBooking, MetodeBayar
+
+# --- Class: AgregatPendapatan ---
+# Ringkasan pendapatan yang diperbarui setiap kali booking dibuat / berubah status,
+# sehingga dashboard cukup membaca total tanpa menjumlah ulang seluruh riwayat.
+STATUS_VALID = (StatusBooking.ACTIVE, StatusBooking.COMPLETED)
+
+class AgregatPendapatan:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Setiap tabel: kunci -> [jumlah_booking, total_biaya]
+        self.per_status = {}
+        self.per_metode = {}
+        self.per_kelas = {}
+        self.per_hari = {}
+        self.per_bulan = {}
+
+    @staticmethod
+    def _tambah(tabel, kunci, jumlah, total):
+        entri = tabel.setdefault(kunci, [0, 0])
+        entri[0] += jumlah
+        entri[1] += total
+
+    def _tambah_dimensi(self, booking, tanda):
+        # Dimensi selain status hanya menghitung booking yang valid (masuk pendapatan)
+        total = tanda * booking.total_biaya
+        metode = booking.pembayaran.metode if booking.pembayaran else "N/A"
+        self._tambah(self.per_metode, metode, tanda, total)
+        self._tambah(self.per_kelas, type(booking.kendaraan).__name__, tanda, total)
+        self._tambah(self.per_hari, booking.tgl_sewa, tanda, total)
+        self._tambah(self.per_bulan, booking.tgl_sewa.strftime("%Y-%m"), tanda, total)
+
+    def catat_booking(self, booking):
+        with self._lock:
+            self._tambah(self.per_status, booking.status_booking, 1, booking.total_biaya)
+            if booking.status_booking in STATUS_VALID:
+                self._tambah_dimensi(booking, 1)
+
+    def ubah_status(self, booking, status_lama, status_baru):
+        with self._lock:
+            self._tambah(self.per_status, status_lama, -1, -booking.total_biaya)
+            self._tambah(self.per_status, status_baru, 1, booking.total_biaya)
+            valid_lama = status_lama in STATUS_VALID
+            valid_baru = status_baru in STATUS_VALID
+            if valid_lama and not valid_baru:
+                self._tambah_dimensi(booking, -1)
+            elif valid_baru and not valid_lama:
+                self._tambah_dimensi(booking, 1)
+
+    def total_pendapatan(self):
+        return sum(self.per_status.get(status, [0, 0])[1] for status in STATUS_VALID)
+
+    def jumlah_transaksi(self):
+        return sum(self.per_status.get(status, [0, 0])[0] for status in STATUS_VALID)
+
+    def get_ringkasan(self, tabel):
+        # Salinan terurut berdasarkan kunci: [(kunci, jumlah_booking, total_biaya), ...]
+        with self._lock:
+            return [(kunci, entri[0], entri[1]) for kunci, entri in sorted(tabel.items()) if entri[0]]
+
+# --- Class: BukuBesarBooking ---
+# Riwayat booking dalam bentuk kolom (array.array) untuk analitik vektor dan ekspor. Ini salinan tambahan di
+# samping objek Booking milik BookingService (bukan pengganti), kira-kira 90 bytes per baris.
+# Tanggal disimpan sebagai ordinal, status/metode/kendaraan sebagai kode integer kecil.
+class BukuBesarBooking:
+    DAFTAR_STATUS = list(StatusBooking)
+    DAFTAR_METODE = list(MetodeBayar)
+
+    def __init__(self):
+        self.booking_id = array.array("q")
+        self.user_id = array.array("q")
+        self.kendaraan = array.array("l")
+        self.tgl_sewa = array.array("l")
+        self.tgl_kembali = array.array("l")
+        self.durasi_hari = array.array("l")
+        self.total_biaya = array.array("q")
+        self.status = array.array("b")
+        self.metode = array.array("b")
+        # Tabel kode kendaraan: index -> id kendaraan, dan kebalikannya
+        self.kendaraan_ids = []
+        self._kode_kendaraan = {}
+        self._lock = threading.Lock()
+        # Naik setiap ada baris baru / perubahan status; kunci cache analitik
+        self.versi = 0
+
+    def _kode_untuk(self, id_k):
+        kode = self._kode_kendaraan.get(id_k)
+        if kode is None:
+            kode = self._kode_kendaraan[id_k] = len(self.kendaraan_ids)
+            self.kendaraan_ids.append(id_k)
+        return kode
+
+    def tambah(self, booking):
+        metode = booking.pembayaran.metode if booking.pembayaran else None
+        with self._lock:
+            baris = len(self.booking_id)
+            self.booking_id.append(booking.booking_id)
+            self.user_id.append(booking.user.user_id)
+            self.kendaraan.append(self._kode_untuk(booking.kendaraan.id))
+            self.tgl_sewa.append(booking.tgl_sewa.toordinal())
+            self.tgl_kembali.append(booking.tgl_kembali.toordinal())
+            self.durasi_hari.append(booking.durasi_hari)
+            self.total_biaya.append(booking.total_biaya)
+            self.status.append(self.DAFTAR_STATUS.index(booking.status_booking))
+            self.metode.append(self.DAFTAR_METODE.index(metode) if metode else -1)
+            self.versi += 1
+        booking.baris_ledger = baris
+        return baris
+
+    def set_status(self, baris, status):
+        with self._lock:
+            self.status[baris] = self.DAFTAR_STATUS.index(status)
+            self.versi += 1
+
+    def kolom_numpy(self):
+        # Salinan konsisten semua kolom sebagai array numpy (salinan, karena array.array
+        # tidak boleh bertambah panjang selama buffer-nya dipinjam numpy)
+        with self._lock:
+            n = len(self.booking_id)
+            kolom = {
+                nama: np.frombuffer(getattr(self, nama)[:n], dtype=getattr(self, nama).typecode)
+                for nama in ("booking_id", "user_id", "kendaraan", "tgl_sewa", "tgl_kembali",
+                             "durasi_hari", "total_biaya", "status", "metode")
+            }
+            return self.versi, kolom, list(self.kendaraan_ids)
+
+    def get_baris(self, baris):
+        metode = self.metode[baris]
+        return {
+            "booking_id": self.booking_id[baris],
+            "user_id": self.user_id[baris],
+            "kendaraan_id": self.kendaraan_ids[self.kendaraan[baris]],
+            "tgl_sewa": datetime.date.fromordinal(self.tgl_sewa[baris]),
+            "tgl_kembali": datetime.date.fromordinal(self.tgl_kembali[baris]),
+            "durasi_hari": self.durasi_hari[baris],
+            "total_biaya": self.total_biaya[baris],
+            "status": self.DAFTAR_STATUS[self.status[baris]],
+            "metode": self.DAFTAR_METODE[metode] if metode >= 0 else None,
+        }
+
+    def ukuran_bytes(self):
+        kolom = (self.booking_id, self.user_id, self.kendaraan, self.tgl_sewa, self.tgl_kembali,
+                 self.durasi_hari, self.total_biaya, self.status, self.metode)
+        return sum(k.buffer_info()[1] * k.itemsize for k in kolom)
+
+    def __len__(self):
+        return len(self.booking_id)
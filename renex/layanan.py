@@ -0,0 +1,104 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+from .model import MetodeBayar
+from .kendaraan import Hatchback, Sedan, SUV
+from .database import Database
+from .eventlog import EventStore
+from .inventory import InventoryManager
+from .pembayaran import GatewayPalsu, PemrosesPembayaran
+from .booking import BookingService
+
+# --- Layanan bersama per proses ---
+# Storage, inventory dan booking service dibuat sekali per proses dan dipakai bersama oleh UI Streamlit
+# dan API (server.py), sehingga jadwal sewa di memori hanya ada satu salinan. Jangan menjalankan dua
+# proses di atas storage yang sama: masing-masing akan punya jadwal sendiri dan bisa double booking.
+
+IMG_HATCHBACK = "https://upload.wikimedia.org/wikipedia/commons/b/b5/2021_Toyota_Yaris_TRD_Sportivo_1.5_%28Indonesia%29_front_view_01.jpg"
+IMG_SEDAN = "https://upload.wikimedia.org/wikipedia/commons/8/84/2018_Honda_Civic_1.5_E_hatchback_%28FK4%3B_01-23-2019%29%2C_South_Tangerang.jpg"
+IMG_SUV = "https://assets.promediateknologi.id/crop/0x0:0x0/0x0/webp/photo/jawapos/2021/02/New-Pajero-Sport-Mistubishi.jpg"
+
+DB_PATH = os.environ.get("RENEX_DB_PATH", "renex.db")
+# Jumlah koneksi SQLite yang dipakai bergantian oleh thread UI & worker API
+DB_POOL = int(os.environ.get("RENEX_DB_POOL", "8"))
+# "sqlite" (default) atau "eventlog": log event append-only + snapshot di RENEX_EVENT_DIR
+STORAGE = os.environ.get("RENEX_STORAGE", "sqlite")
+EVENT_DIR = os.environ.get("RENEX_EVENT_DIR", "renex_events")
+# Email user yang boleh membuka Admin Dashboard di UI (dipisah koma, harus sama persis dengan email login).
+# Daftarkan akun admin segera setelah deploy: email pertama yang login dengan alamat itu menjadi pemiliknya.
+ADMIN_EMAILS = {email.strip() for email in os.environ.get("RENEX_ADMIN_EMAILS", "").split(",") if email.strip()}
+# Password disimpan sebagai PBKDF2-SHA256 bergaram: "pbkdf2_sha256$iterasi$garam$hash"
+ITERASI_PASSWORD = 200_000
+
+_layanan = {}
+# RLock: get_services() memanggil get_storage() saat masih memegang lock
+_lock = threading.RLock()
+# Cek-lalu-daftar user harus atomik agar request paralel dengan email baru tidak membuat dua user
+_lock_user = threading.Lock()
+
+def _sekali(nama, buat):
+    with _lock:
+        if nama not in _layanan:
+            _layanan[nama] = buat()
+        return _layanan[nama]
+
+def get_storage():
+    def buat():
+        if STORAGE == "eventlog":
+            return EventStore(EVENT_DIR)
+        return Database(DB_PATH, pool_size=DB_POOL)
+    return _sekali("storage", buat)
+
+def get_services():
+    def buat():
+        db = get_storage()
+        inv = InventoryManager(db)
+
+        if not inv.get_all_mobil():
+            inv.tambah_unit(Hatchback("C01", "Toyota Yaris", "L 1234 ABC", 300000, IMG_HATCHBACK, 250))
+            inv.tambah_unit(Sedan("C02", "Honda Civic", "L 5678 DEF", 500000, IMG_SEDAN, "High"))
+            inv.tambah_unit(SUV("C03", "Pajero Sport", "L 9999 XYZ", 700000, IMG_SUV, True))
+
+        # Belum ada integrasi gateway sungguhan: semua metode memakai gateway lokal dengan latensi tiruan
+        latensi = float(os.environ.get("RENEX_LATENSI_GATEWAY", "1.0"))
+        pemroses = PemrosesPembayaran({metode: GatewayPalsu(latensi) for metode in MetodeBayar})
+
+        return inv, BookingService(inv, db, pemroses)
+    return _sekali("services", buat)
+
+def get_analitik():
+    def buat():
+        from .analitik import AnalitikArmada
+
+        inv, service = get_services()
+        return AnalitikArmada(service, inv)
+    return _sekali("analitik", buat)
+
+def hash_password(password, garam=None, iterasi=None):
+    garam = garam or secrets.token_hex(16)
+    iterasi = iterasi or ITERASI_PASSWORD
+    hasil = hashlib.pbkdf2_hmac("sha256", password.encode(), garam.encode(), iterasi).hex()
+    return f"pbkdf2_sha256${iterasi}${garam}${hasil}"
+
+def cek_password(password, tersimpan):
+    # User lama (sebelum ada password) tidak punya hash: tidak bisa dipakai login sama sekali
+    if not tersimpan:
+        return False
+    _, iterasi, garam, _ = tersimpan.split("$")
+    return hmac.compare_digest(hash_password(password, garam, int(iterasi)), tersimpan)
+
+def get_user(nama, email, password):
+    # Email baru didaftarkan dengan password ini; email yang sudah terdaftar hanya dipakai ulang bila
+    # password-nya cocok (None bila tidak), agar riwayat & pembayaran user lain tidak bisa dibuka lewat email
+    db = get_storage()
+    with _lock_user:
+        user = db.get_user_by_email(email)
+        if user is None:
+            return db.buat_user(nama, email, hash_password(password))
+    return user if cek_password(password, db.get_password_hash(user.user_id)) else None
+
+def is_admin(user):
+    return user.email in ADMIN_EMAILS
@@ -0,0 +1,94 @@
+import datetime
+from enum import StrEnum
+
+from .harga import mesin_harga
+
+# --- Enum: Status & Metode ---
+# StrEnum: satu objek per nilai (interned) dan tetap bisa dibandingkan dengan string biasa
+class StatusBooking(StrEnum):
+    ACTIVE = "Active"
+    COMPLETED = "Completed"
+    PENDING = "Pending Payment"
+    CANCELLED = "Cancelled"
+
+class MetodeBayar(StrEnum):
+    QRIS = "QRIS"
+    VIRTUAL_ACCOUNT = "Virtual Account"
+    TRANSFER_BANK = "Transfer Bank"
+
+# Pelanggaran keunikan (id / nopol / booking ganda) dari storage mana pun: SQLite menerjemahkan
+# IntegrityError ke sini, EventStore melemparnya langsung
+class KonflikData(Exception):
+    pass
+
+# --- Class: User ---
+class User:
+    __slots__ = ("user_id", "nama", "email")
+
+    def __init__(self, user_id, nama, email):
+        self.user_id = user_id
+        self.nama = nama
+        self.email = email
+
+    def ke_dict(self):
+        return {"user_id": self.user_id, "nama": self.nama, "email": self.email}
+
+# --- Class: Pembayaran ---
+class Pembayaran:
+    __slots__ = ("pay_id", "jumlah", "metode", "tgl_bayar", "status_sukses")
+
+    def __init__(self, pay_id, jumlah, metode):
+        self.pay_id = pay_id
+        self.jumlah = jumlah
+        self.metode = MetodeBayar(metode)
+        self.tgl_bayar = datetime.datetime.now()
+        self.status_sukses = False
+
+    def verifikasi(self):
+        self.status_sukses = True
+        return True
+
+    def ke_dict(self):
+        return {"pay_id": self.pay_id, "jumlah": self.jumlah, "metode": self.metode,
+                "tgl_bayar": self.tgl_bayar.isoformat(timespec="seconds"), "status_sukses": self.status_sukses}
+
+# --- Class: Booking ---
+class Booking:
+    __slots__ = ("booking_id", "user", "kendaraan", "tgl_sewa", "tgl_kembali", "durasi_hari",
+                 "total_biaya", "status_booking", "pembayaran", "baris_ledger")
+
+    def __init__(self, booking_id, user, kendaraan, tgl_mulai, tgl_selesai, total_biaya=None):
+        self.booking_id = booking_id
+        self.user = user
+        self.kendaraan = kendaraan
+        
+        self.tgl_sewa = tgl_mulai      
+        self.tgl_kembali = tgl_selesai 
+        
+        delta = tgl_selesai - tgl_mulai
+        self.durasi_hari = delta.days if delta.days > 0 else 1
+        
+        # Total yang sudah tersimpan (misal dimuat dari database) tidak dihitung ulang
+        self.total_biaya = self.hitung_total() if total_biaya is None else total_biaya
+        self.status_booking = StatusBooking.ACTIVE
+        self.pembayaran = None
+        # Posisi baris booking ini di BukuBesarBooking
+        self.baris_ledger = None
+
+    def hitung_total(self):
+        return mesin_harga.kutipan(self.kendaraan, self.tgl_sewa, self.tgl_kembali)
+
+    def set_pembayaran(self, pembayaran):
+        self.pembayaran = pembayaran
+            
+    def get_tgl_kembali(self):
+        return self.tgl_kembali 
+
+    def ke_dict(self):
+        # Bentuk JSON untuk API: tanggal ISO, kendaraan & user cukup diwakili id-nya
+        return {
+            "booking_id": self.booking_id, "user_id": self.user.user_id, "kendaraan_id": self.kendaraan.id,
+            "tgl_sewa": self.tgl_sewa.isoformat(), "tgl_kembali": self.tgl_kembali.isoformat(),
+            "durasi_hari": self.durasi_hari, "total_biaya": self.total_biaya, "status": self.status_booking,
+            "pembayaran": self.pembayaran.ke_dict() if self.pembayaran else None,
+        }
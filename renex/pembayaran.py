@@ -0,0 +1,69 @@
+import datetime
+import asyncio
+import random
+import threading
+from abc import ABC, abstractmethod
+
+# --- Class: GatewayPembayaran ---
+# Antarmuka gateway (QRIS, Virtual Account, Transfer Bank). Implementasi nyata cukup meng-override verifikasi().
+class GatewayPembayaran(ABC):
+    @abstractmethod
+    async def verifikasi(self, pembayaran):
+        pass
+
+class GatewayPalsu(GatewayPembayaran):
+    # Gateway lokal untuk pengembangan/pengujian dengan latensi dan tingkat sukses yang bisa diatur
+    def __init__(self, latensi=1.0, peluang_sukses=1.0):
+        self.latensi = latensi
+        self.peluang_sukses = peluang_sukses
+
+    async def verifikasi(self, pembayaran):
+        await asyncio.sleep(self.latensi)
+        return random.random() < self.peluang_sukses
+
+# --- Class: PemrosesPembayaran ---
+# Worker asyncio di thread latar: verifikasi pembayaran dengan timeout, retry (backoff) dan batas waktu hold,
+# sehingga thread script Streamlit tidak pernah menunggu gateway.
+class PemrosesPembayaran:
+    def __init__(self, gateways, timeout=10, maks_percobaan=3, jeda_retry=1.0,
+                 batas_hold=datetime.timedelta(minutes=15), maks_paralel=100):
+        self.gateways = gateways
+        self.timeout = timeout
+        self.maks_percobaan = maks_percobaan
+        self.jeda_retry = jeda_retry
+        self.batas_hold = batas_hold
+        self._semaphore = asyncio.Semaphore(maks_paralel)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="pemroses-pembayaran", daemon=True)
+        self._thread.start()
+
+    def ajukan(self, pembayaran, selesai):
+        # selesai(sukses) dipanggil sekali dari thread pool ketika verifikasi berhasil, gagal, atau hold habis
+        return asyncio.run_coroutine_threadsafe(self._proses(pembayaran, selesai), self._loop)
+
+    async def _proses(self, pembayaran, selesai):
+        sukses = await self._verifikasi(pembayaran)
+        await asyncio.to_thread(selesai, sukses)
+
+    async def _verifikasi(self, pembayaran):
+        gateway = self.gateways.get(pembayaran.metode)
+        if gateway is None:
+            return False
+        batas = pembayaran.tgl_bayar + self.batas_hold
+        for percobaan in range(self.maks_percobaan):
+            if percobaan:
+                # Backoff hanya di antara percobaan, dan tanpa menahan slot paralel
+                await asyncio.sleep(self.jeda_retry * (2 ** (percobaan - 1)))
+            sisa = (batas - datetime.datetime.now()).total_seconds()
+            if sisa <= 0:
+                return False
+            try:
+                async with self._semaphore:
+                    # Jawaban gateway (termasuk penolakan) final; hanya timeout / error yang dicoba ulang
+                    return bool(await asyncio.wait_for(gateway.verifikasi(pembayaran), min(self.timeout, sisa)))
+            except Exception:
+                continue
+        return False
+
+    def hentikan(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,127 @@
+import bisect
+import cProfile
+import io
+import json
+import functools
+import pstats
+import time
+import threading
+import contextlib
+from contextlib import contextmanager
+
+# --- Class: Profiler ---
+# Instrumentasi per sesi: span waktu, histogram latensi, dan tangkapan cProfile satu rerun.
+# Profiler sesi aktif disimpan di thread-local karena setiap sesi Streamlit berjalan di thread-nya sendiri;
+# saat tidak aktif, span() dan @ukur hanya melakukan satu pengecekan atribut.
+_konteks_profiler = threading.local()
+_SPAN_KOSONG = contextlib.nullcontext()
+
+class Profiler:
+    BATAS_HISTOGRAM_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+    BARIS_CPROFILE = 30
+
+    def __init__(self):
+        self.aktif = False
+        self.mulai = time.perf_counter()
+        self.spans = {}
+        self.tangkap_cprofile = False
+        self.hasil_cprofile = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.mulai = time.perf_counter()
+
+    def pasang(self):
+        # Jadikan profiler ini milik thread (sesi) yang sedang menjalankan script
+        _konteks_profiler.profiler = self
+
+    def span(self, nama):
+        if not self.aktif:
+            return _SPAN_KOSONG
+        return self._span(nama)
+
+    @contextmanager
+    def _span(self, nama):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.catat(nama, (time.perf_counter() - t0) * 1000)
+
+    def catat(self, nama, durasi_ms):
+        idx = bisect.bisect_left(self.BATAS_HISTOGRAM_MS, durasi_ms)
+        with self._lock:
+            stat = self.spans.get(nama)
+            if stat is None:
+                stat = self.spans[nama] = {"jumlah": 0, "total_ms": 0.0, "maks_ms": 0.0,
+                                           "histogram": [0] * (len(self.BATAS_HISTOGRAM_MS) + 1)}
+            stat["jumlah"] += 1
+            stat["total_ms"] += durasi_ms
+            stat["maks_ms"] = max(stat["maks_ms"], durasi_ms)
+            stat["histogram"][idx] += 1
+
+    @contextmanager
+    def rerun(self):
+        # Satu rerun penuh; bila diminta, dibungkus cProfile lalu hasilnya diringkas
+        if not self.tangkap_cprofile:
+            with self.span("rerun"):
+                yield
+            return
+        self.tangkap_cprofile = False
+        profil = cProfile.Profile()
+        profil.enable()
+        try:
+            with self.span("rerun"):
+                yield
+        finally:
+            profil.disable()
+            keluaran = io.StringIO()
+            pstats.Stats(profil, stream=keluaran).sort_stats("cumulative").print_stats(self.BARIS_CPROFILE)
+            self.hasil_cprofile = keluaran.getvalue()
+
+    def ringkasan(self):
+        durasi = max(time.perf_counter() - self.mulai, 1e-9)
+        with self._lock:
+            return [{
+                "span": nama,
+                "jumlah": stat["jumlah"],
+                "per_detik": stat["jumlah"] / durasi,
+                "rata2_ms": stat["total_ms"] / stat["jumlah"],
+                "maks_ms": stat["maks_ms"],
+                "total_ms": stat["total_ms"],
+            } for nama, stat in sorted(self.spans.items())]
+
+    def _histogram(self, stat):
+        # Dipanggil di bawah self._lock: list histogram disalin selagi catat() tidak bisa mengubahnya
+        label = [f"<={b}ms" for b in self.BATAS_HISTOGRAM_MS] + [f">{self.BATAS_HISTOGRAM_MS[-1]}ms"]
+        return dict(zip(label, stat["histogram"] if stat else [0] * len(label)))
+
+    def histogram(self, nama):
+        with self._lock:
+            return self._histogram(self.spans.get(nama))
+
+    def ekspor_json(self):
+        # Bisa dipanggil dari thread download_button bersamaan dengan rerun yang sedang mencatat span
+        with self._lock:
+            histogram = {nama: self._histogram(stat) for nama, stat in self.spans.items()}
+        return json.dumps({
+            "durasi_detik": time.perf_counter() - self.mulai,
+            "spans": self.ringkasan(),
+            "histogram": histogram,
+            "cprofile": self.hasil_cprofile,
+        }, indent=2)
+
+def ukur(nama):
+    # Dekorator span untuk method backend; memakai profiler milik sesi yang memanggil
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            profiler = getattr(_konteks_profiler, "profiler", None)
+            if profiler is None or not profiler.aktif:
+                return fungsi(*args, **kwargs)
+            with profiler._span(nama):
+                return fungsi(*args, **kwargs)
+        return pembungkus
+    return dekorator
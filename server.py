@@ -0,0 +1,42 @@
+import argparse
+import os
+
+import streamlit as st
+import uvicorn
+
+from renex.api import buat_routes, buat_app_headless, lifespan
+
+# ==========================================
+# SERVER ASGI: UI Streamlit + API REST/JSON dalam satu proses
+# Keduanya memakai InventoryManager & BookingService yang sama (renex.layanan),
+# jadi booking dari API langsung terlihat di UI dan sebaliknya.
+#
+#   python server.py                 -> UI di /, API di /api/...
+#   python server.py --headless      -> hanya API (untuk partner / aplikasi mobile)
+#   uvicorn server:app  /  uvicorn server:api
+#
+# API menolak semua request tanpa X-API-Key: set RENEX_API_KEYS (klien) dan RENEX_API_ADMIN_KEYS (admin).
+#
+# Jangan menjalankan mode headless sebagai proses terpisah di samping `streamlit run` pada storage
+# yang sama: setiap proses punya jadwal sewa sendiri di memori.
+# ==========================================
+
+SCRIPT_UI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+app = st.App(SCRIPT_UI, routes=buat_routes(), lifespan=lifespan)
+api = buat_app_headless()
+
+def main():
+    parser = argparse.ArgumentParser(description="Server RENEX (UI Streamlit + API)")
+    parser.add_argument("--headless", action="store_true", help="hanya API, tanpa UI Streamlit")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8501)
+    args = parser.parse_args()
+
+    if args.headless:
+        uvicorn.run(api, host=args.host, port=args.port, access_log=False)
+    else:
+        app.run(config={"server.address": args.host, "server.port": args.port})
+
+if __name__ == "__main__":
+    main()
@@ -1,173 +1,20 @@
 import streamlit as st
-from abc import ABC, abstractmethod
 import datetime
-import uuid
-import os
 
-# ==========================================
-# BAGIAN 1: MODEL & LOGIC (Backend)
-# ==========================================
-
-# --- Class: Kendaraan ---
-class Kendaraan(ABC):
-    def __init__(self, id_k, merk, nopol, harga_sewa, image_url):
-        self.id = id_k
-        self.merk = merk
-        self.nopol = nopol
-        self.harga_sewa = harga_sewa
-        self.image_url = image_url 
-        self.is_available = True
-
-    def get_status(self):
-        return self.is_available
-
-    def get_harga(self):
-        return self.harga_sewa
-
-    @abstractmethod
-    def get_detail_info(self):
-        pass
-
-# --- Concrete Classes ---
-class Hatchback(Kendaraan):
-    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, kapasitas_bagasi):
-        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
-        self.kapasitas_bagasi = kapasitas_bagasi
-
-    def get_detail_info(self):
-        return f"Hatchback - Bagasi: {self.kapasitas_bagasi}L"
-
-class Sedan(Kendaraan):
-    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, tingkat_kenyamanan):
-        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
-        self.tingkat_kenyamanan = tingkat_kenyamanan
-
-    def get_detail_info(self):
-        return f"Sedan - Kenyamanan: {self.tingkat_kenyamanan}"
-
-class SUV(Kendaraan):
-    def __init__(self, id_k, merk, nopol, harga_sewa, image_url, four_wheel_drive):
-        super().__init__(id_k, merk, nopol, harga_sewa, image_url)
-        self.four_wheel_drive = four_wheel_drive
-
-    def get_detail_info(self):
-        wd_status = "4WD" if self.four_wheel_drive else "2WD"
-        return f"SUV - {wd_status}"
-
-# --- Class: User ---
-class User:
-    def __init__(self, user_id, nama, email):
-        self.user_id = user_id
-        self.nama = nama
-        self.email = email
-
-# --- Class: Pembayaran ---
-class Pembayaran:
-    def __init__(self, pay_id, jumlah, metode):
-        self.pay_id = pay_id
-        self.jumlah = jumlah
-        self.metode = metode
-        self.tgl_bayar = datetime.datetime.now()
-        self.status_sukses = False
-
-    def verifikasi(self):
-        self.status_sukses = True
-        return True
-
-# --- Class: Booking ---
-class Booking:
-    def __init__(self, booking_id, user, kendaraan, tgl_mulai, tgl_selesai):
-        self.booking_id = booking_id
-        self.user = user
-        self.kendaraan = kendaraan
-        
-        self.tgl_sewa = tgl_mulai      
-        self.tgl_kembali = tgl_selesai 
-        
-        delta = tgl_selesai - tgl_mulai
-        self.durasi_hari = delta.days if delta.days > 0 else 1
-        
-        self.total_biaya = self.hitung_total()
-        self.status_booking = "Active" 
-        self.pembayaran = None
-
-    def hitung_total(self):
-        return self.kendaraan.get_harga() * self.durasi_hari
-
-    def set_pembayaran(self, pembayaran):
-        self.pembayaran = pembayaran
-            
-    def get_tgl_kembali(self):
-        return self.tgl_kembali 
-
-# --- Class: InventoryManager ---
-class InventoryManager:
-    def __init__(self):
-        self.daftar_mobil = [] 
-
-    def tambah_unit(self, kendaraan):
-        self.daftar_mobil.append(kendaraan)
-
-    def update_stok(self, id_k, status):
-        for mobil in self.daftar_mobil:
-            if mobil.id == id_k:
-                mobil.is_available = status
-
-    def get_all_mobil(self):
-        return self.daftar_mobil
-        
-    def get_mobil_by_id(self, id_k):
-        for mobil in self.daftar_mobil:
-            if mobil.id == id_k:
-                return mobil
-        return None
-
-# --- Class: BookingService ---
-class BookingService:
-    def __init__(self, inventory_manager):
-        self.inventory_manager = inventory_manager
-        if 'all_bookings' not in st.session_state:
-            st.session_state.all_bookings = []
-
-    def buat_pesanan(self, user, kendaraan_id, tgl_mulai, tgl_selesai, metode_bayar):
-        mobil = self.inventory_manager.get_mobil_by_id(kendaraan_id)
-        if mobil and mobil.get_status():
-            booking_id = str(uuid.uuid4())[:8]
-            
-            booking = Booking(booking_id, user, mobil, tgl_mulai, tgl_selesai)
-            
-            pay_id = f"PAY-{str(uuid.uuid4())[:6]}"
-            pembayaran = Pembayaran(pay_id, booking.total_biaya, metode_bayar)
-            pembayaran.verifikasi()
-            booking.set_pembayaran(pembayaran)
-            
-            self.inventory_manager.update_stok(kendaraan_id, False)
-            
-            st.session_state.all_bookings.append(booking)
-            return booking
-        return None
-
-    def selesaikan_pesanan(self, booking):
-        self.inventory_manager.update_stok(booking.kendaraan.id, True)
-        booking.status_booking = "Completed"
+from renex import Profiler, StatusBooking, MetodeBayar, Hatchback, Sedan, SUV, KELAS_KENDARAAN, mesin_harga, GambarStore
+# Storage & service dipakai bersama per proses dengan API (lihat server.py)
+from renex.layanan import get_services, get_analitik, get_user, is_admin
 
 # ==========================================
-# BAGIAN 2: STREAMLIT UI (Frontend)
+# STREAMLIT UI (Frontend)
+# Model & logic (backend) ada di paket renex/
 # ==========================================
 
-IMG_HATCHBACK = "https://upload.wikimedia.org/wikipedia/commons/b/b5/2021_Toyota_Yaris_TRD_Sportivo_1.5_%28Indonesia%29_front_view_01.jpg"
-IMG_SEDAN = "https://upload.wikimedia.org/wikipedia/commons/8/84/2018_Honda_Civic_1.5_E_hatchback_%28FK4%3B_01-23-2019%29%2C_South_Tangerang.jpg"
-IMG_SUV = "https://assets.promediateknologi.id/crop/0x0:0x0/0x0/webp/photo/jawapos/2021/02/New-Pajero-Sport-Mistubishi.jpg"
+URUTAN_KATALOG = {"Harga Termurah": "harga_asc", "Harga Termahal": "harga_desc", "Merk (A-Z)": "merk"}
 
-if 'inventory' not in st.session_state:
-    inv = InventoryManager()
-    
-    inv.tambah_unit(Hatchback("C01", "Toyota Yaris", "L 1234 ABC", 300000, IMG_HATCHBACK, 250))
-    inv.tambah_unit(Sedan("C02", "Honda Civic", "L 5678 DEF", 500000, IMG_SEDAN, "High"))
-    inv.tambah_unit(SUV("C03", "Pajero Sport", "L 9999 XYZ", 700000, IMG_SUV, True))
-    
-    st.session_state.inventory = inv
-    st.session_state.service = BookingService(inv)
+@st.cache_resource
+def get_gambar_store():
+    return GambarStore("car_images")
 
 def login_page():
     st.title("🚗 Welcome to RENEX (Rental Mobil Express)")
@@ -176,48 +23,400 @@ def login_page():
     with st.form("login_form"):
         nama = st.text_input("Nama Lengkap")
         email = st.text_input("Email")
-        password = st.text_input("Password")
+        password = st.text_input("Password", type="password")
         submitted = st.form_submit_button("Masuk Aplikasi")
         
         if submitted:
-            if nama and email:
-                user_id = str(uuid.uuid4())[:6]
-                new_user = User(user_id, nama, email)
-                st.session_state.user = new_user
-                st.rerun()
+            if nama and email and password:
+                user = get_user(nama, email, password)
+                if user is None:
+                    st.error("Email sudah terdaftar dan password tidak cocok.")
+                else:
+                    st.session_state.user = user
+                    st.rerun()
             else:
-                st.error("Mohon lengkapi nama dan email.")
+                st.error("Mohon lengkapi nama, email dan password.")
+
+def get_profiler():
+    if 'profiler' not in st.session_state:
+        st.session_state.profiler = Profiler()
+    return st.session_state.profiler
+
+def panel_performa(profiler):
+    st.subheader("Performance Rerun (Sesi Ini)")
+    
+    aktif = st.toggle("Aktifkan Instrumentasi", value=profiler.aktif, key="perf_aktif")
+    if aktif != profiler.aktif:
+        profiler.aktif = aktif
+        profiler.reset()
+    
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        if st.button("Tangkap cProfile Rerun Berikutnya", key="perf_cprofile"):
+            profiler.tangkap_cprofile = True
+            st.rerun()
+    with c2:
+        if st.button("Reset Data", key="perf_reset"):
+            profiler.reset()
+    with c3:
+        st.download_button(
+            label="📥 Export JSON",
+            data=profiler.ekspor_json,
+            file_name="renex_performance.json",
+            mime="application/json"
+        )
+    
+    ringkasan = profiler.ringkasan()
+    if not ringkasan:
+        st.info("Belum ada data. Aktifkan instrumentasi lalu gunakan aplikasi seperti biasa.")
+    else:
+        st.dataframe(ringkasan, use_container_width=True, hide_index=True)
+        st.write("**Histogram Latensi Rerun**")
+        st.dataframe([profiler.histogram("rerun")], use_container_width=True, hide_index=True)
+    
+    if profiler.hasil_cprofile:
+        st.write("**cProfile Rerun Terakhir**")
+        st.code(profiler.hasil_cprofile)
+
+# --- Tab Admin ---
+# Setiap tab admin berupa fungsi tersendiri; main_app hanya memanggil fungsi tab yang sedang dibuka.
+# Modul berat (pandas import, pyarrow ekspor, analitik) diimpor di dalam tab yang memakainya.
+def tab_manajemen_pesanan(service, gambar_store):
+    st.subheader("Tracking Pesanan")
+    jumlah_aktif = service.jumlah_bookings_aktif()
+    active_bookings = []
+    
+    if not jumlah_aktif:
+        st.info("Tidak ada mobil yang sedang disewa.")
+    else:
+        per_halaman = 20
+        jumlah_halaman = (jumlah_aktif - 1) // per_halaman + 1
+        halaman = 1
+        if jumlah_halaman > 1:
+            halaman = st.number_input(f"Halaman (1 - {jumlah_halaman})", min_value=1,
+                                      max_value=jumlah_halaman, value=1, key="halaman_tracking")
+        active_bookings = service.get_bookings_aktif((halaman - 1) * per_halaman, per_halaman)
+    
+    for b in active_bookings:
+        with st.container(border=True):
+            c1, c2, c3 = st.columns([1, 2, 1])
+            with c1:
+                try:
+                    st.image(gambar_store.get(b.kendaraan.image_url, "kecil"), use_container_width=True)
+                except:
+                    st.write("No Image")
+            
+            with c2: 
+                st.markdown(f"**{b.kendaraan.merk}**")
+                st.caption(f"Penyewa: {b.user.nama}")
+                st.write("📅 **Jadwal Sewa:**")
+                st.code(f"{b.tgl_sewa} s/d {b.tgl_kembali}")
+                st.caption(f"Durasi Total: {b.durasi_hari} Hari")
+            
+            with c3:
+                if st.button("Selesai & Restock", key=f"done_{b.booking_id}", type="primary"):
+                    service.selesaikan_pesanan(b)
+                    st.success("Sewa Selesai")
+                    st.rerun()
+
+def tab_tambah_unit(inv_manager, gambar_store):
+    from renex.impor import ImportArmada
+    
+    st.subheader("Input Mobil Baru")
+    
+    with st.form("add_car_form"):
+        tipe_mobil = st.selectbox("Tipe Mobil", ["Hatchback", "Sedan", "SUV"])
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            merk = st.text_input("Merk Mobil (Contoh: Honda Jazz)")
+            nopol = st.text_input("Nomor Polisi")
+        with col2:
+            harga = st.number_input("Harga Sewa per Hari", min_value=100000, step=50000)
+            
+        extra_attr = None
+        default_img = ""
+        
+        IMG_HATCHBACK = "https://images.unsplash.com/photo-1541899481282-d53bffe3c35d?auto=format&fit=crop&w=500&q=60"
+        IMG_SEDAN = "https://images.unsplash.com/photo-1555215695-3004980adade?auto=format&fit=crop&w=500&q=60"
+        IMG_SUV = "https://images.unsplash.com/photo-1533473359331-0135ef1b58bf?auto=format&fit=crop&w=500&q=60"
+        
+        if tipe_mobil == "Hatchback":
+            extra_attr = st.number_input("Kapasitas Bagasi (Liter)", min_value=100)
+            default_img = IMG_HATCHBACK
+        elif tipe_mobil == "Sedan":
+            extra_attr = st.selectbox("Tingkat Kenyamanan", ["Standard", "High", "Luxury"])
+            default_img = IMG_SEDAN
+        elif tipe_mobil == "SUV":
+            is_4wd = st.checkbox("Four Wheel Drive (4WD)?")
+            extra_attr = is_4wd
+            default_img = IMG_SUV
+
+        st.write("---")
+        st.write("Foto Kendaraan (Opsional)")
+        uploaded_file = st.file_uploader("Upload Foto (JPG/PNG)", type=["jpg", "png", "jpeg"])
+        
+        submit_add = st.form_submit_button("Simpan ke Inventory")
+        
+        if submit_add:
+            if merk and nopol:
+                id_baru = inv_manager.alokasi_id()[0]
+                final_img_path = default_img 
+                
+                if uploaded_file is not None:
+                    try:
+                        final_img_path = gambar_store.simpan_upload(uploaded_file.getvalue())
+                    except Exception:
+                        st.error("File gambar tidak valid, memakai foto default.")
+                
+                new_car = None
+                if tipe_mobil == "Hatchback":
+                    new_car = Hatchback(id_baru, merk, nopol, harga, final_img_path, extra_attr)
+                elif tipe_mobil == "Sedan":
+                    new_car = Sedan(id_baru, merk, nopol, harga, final_img_path, extra_attr)
+                elif tipe_mobil == "SUV":
+                    new_car = SUV(id_baru, merk, nopol, harga, final_img_path, extra_attr)
+                
+                if inv_manager.tambah_unit(new_car):
+                    st.success(f"Berhasil menambahkan {merk}!")
+                    st.rerun()
+                else:
+                    st.error(f"Nomor Polisi {nopol} sudah terdaftar!")
+            else:
+                st.error("Mohon lengkapi Merk dan Nomor Polisi!")
+    
+    st.write("---")
+    st.subheader("Import Armada Massal")
+    st.caption("File CSV/JSON dengan kolom: kelas, merk, nopol, harga_sewa, atribut, image_url (opsional). "
+               "Atribut berisi kapasitas bagasi (Hatchback), tingkat kenyamanan (Sedan), atau 4WD ya/tidak (SUV).")
+    
+    with st.form("import_armada_form"):
+        file_armada = st.file_uploader("Upload File Armada", type=["csv", "json"])
+        submit_import = st.form_submit_button("Import ke Inventory")
+        
+        if submit_import and file_armada is not None:
+            importer = ImportArmada(inv_manager, {"Hatchback": IMG_HATCHBACK, "Sedan": IMG_SEDAN, "SUV": IMG_SUV})
+            try:
+                df_armada = importer.baca(file_armada.getvalue(), file_armada.name)
+            except ValueError as e:
+                st.error(f"File tidak dapat dibaca: {e}")
+            else:
+                unit_baru, ditolak = importer.validasi(df_armada)
+                if unit_baru and importer.simpan(unit_baru):
+                    st.success(f"Berhasil mengimpor {len(unit_baru)} unit.")
+                elif unit_baru:
+                    st.error("Import dibatalkan: data bentrok dengan inventory, silakan coba lagi.")
+                if ditolak:
+                    st.warning(f"{len(ditolak)} baris ditolak.")
+                    st.dataframe([{"Baris": baris, "Alasan": alasan} for baris, alasan in ditolak],
+                                 use_container_width=True, hide_index=True)
+
+def tab_laporan_keuangan(service):
+    from renex.ekspor import EksporLaporan, pa
+    from renex.analitik import AnalitikArmada
+    
+    st.subheader("Laporan Pemasukan (Revenue)")
+    
+    agregat = service.agregat
+    jumlah_transaksi = agregat.jumlah_transaksi()
+    
+    if not jumlah_transaksi:
+        st.info("Belum ada data transaksi penyewaan.")
+    else:
+        st.metric(label="Total Pemasukan Bersih", value=f"Rp {agregat.total_pendapatan():,.0f}")
+        
+        c_metode, c_kelas, c_bulan = st.columns(3)
+        ringkasan = [
+            (c_metode, "Per Metode Bayar", agregat.per_metode),
+            (c_kelas, "Per Tipe Mobil", agregat.per_kelas),
+            (c_bulan, "Per Bulan", agregat.per_bulan),
+        ]
+        for kolom, judul, tabel in ringkasan:
+            with kolom:
+                st.write(f"**{judul}**")
+                st.dataframe(
+                    [{"": kunci, "Transaksi": jumlah, "Total": f"Rp {total:,.0f}"}
+                     for kunci, jumlah, total in agregat.get_ringkasan(tabel)],
+                    use_container_width=True, hide_index=True
+                )
+        
+        st.write("---")
+        st.write("### Rincian Transaksi")
+        
+        def baris_laporan(b):
+            return {
+                "ID Booking": b.booking_id,
+                "Tanggal Sewa": b.tgl_sewa.strftime("%Y-%m-%d"),
+                "Penyewa": b.user.nama,
+                "Mobil": f"{b.kendaraan.merk} ({b.kendaraan.nopol})",
+                "Durasi": f"{b.durasi_hari} Hari",
+                "Metode Bayar": b.pembayaran.metode if b.pembayaran else "N/A",
+                "Total Biaya": f"Rp {b.total_biaya:,.0f}",
+                "Status": b.status_booking
+            }
+        
+        per_halaman = 20
+        jumlah_halaman = (jumlah_transaksi - 1) // per_halaman + 1
+        halaman = st.number_input(f"Halaman (1 - {jumlah_halaman})", min_value=1,
+                                  max_value=jumlah_halaman, value=1, key="halaman_laporan")
+        halaman_bookings = service.get_bookings_terbaru((halaman - 1) * per_halaman, per_halaman)
+        st.dataframe([baris_laporan(b) for b in halaman_bookings], use_container_width=True)
+        
+        st.write("---")
+        st.write("### Download Laporan")
+        
+        rentang_ekspor = st.date_input("Filter Tanggal Sewa (opsional)", value=[], key="rentang_ekspor")
+        tgl_dari, tgl_sampai = None, None
+        if isinstance(rentang_ekspor, (list, tuple)) and len(rentang_ekspor) == 2:
+            tgl_dari, tgl_sampai = rentang_ekspor
+        
+        # File dibangun saat tombol diklik (callable), bukan di setiap rerun
+        eksportir = EksporLaporan(service)
+        c_csv, c_parquet = st.columns(2)
+        with c_csv:
+            st.download_button(
+                label="📥 Download Laporan (CSV)",
+                data=lambda: eksportir.ke_csv(tgl_dari, tgl_sampai),
+                file_name="laporan_keuangan_renex.csv",
+                mime="text/csv"
+            )
+        if pa is not None:
+            with c_parquet:
+                st.download_button(
+                    label="📥 Download Laporan (Parquet)",
+                    data=lambda: eksportir.ke_parquet(tgl_dari, tgl_sampai),
+                    file_name="laporan_keuangan_renex.parquet",
+                    mime="application/vnd.apache.parquet"
+                )
+        
+        st.write("---")
+        st.write("### Analitik Armada")
+        
+        hari_ini = datetime.date.today()
+        jendela = st.date_input("Rentang Analitik", value=(hari_ini - datetime.timedelta(days=29), hari_ini),
+                                key="rentang_analitik")
+        if isinstance(jendela, (list, tuple)) and len(jendela) == 2:
+            analitik = get_analitik().hitung(*jendela)
+            
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Utilisasi Armada", f"{analitik['utilisasi'] * 100:.1f}%")
+            m2.metric("Pendapatan Periode", f"Rp {analitik['total_pendapatan']:,.0f}")
+            m3.metric("Pendapatan per Mobil-Hari", f"Rp {analitik['pendapatan_per_unit_hari']:,.0f}")
+            
+            st.write("**Okupansi Harian (%)**")
+            st.line_chart(analitik["harian"]["Okupansi (%)"])
+            st.write("**Pendapatan Harian**")
+            st.bar_chart(analitik["harian"]["Pendapatan"])
+            
+            c_tipe, c_metode = st.columns(2)
+            with c_tipe:
+                st.write("**Per Tipe Mobil**")
+                st.dataframe(analitik["per_tipe"].round(1), use_container_width=True)
+            with c_metode:
+                st.write("**Pendapatan per Metode Bayar**")
+                st.bar_chart(analitik["per_metode"])
+            
+            st.write(f"**Top {AnalitikArmada.JUMLAH_TOP} Unit Terlaris**")
+            st.dataframe(analitik["top_unit"].round(1), use_container_width=True, hide_index=True)
 
 def main_app():
     user = st.session_state.user
     st.sidebar.title(f"Hi, {user.nama}")
     
-    menu = st.sidebar.radio("Menu", ["Katalog Mobil", "Pesanan Saya", "Admin Dashboard"])
+    # Admin Dashboard (semua pesanan, impor armada, laporan) hanya untuk email di RENEX_ADMIN_EMAILS
+    admin = is_admin(user)
+    daftar_menu = ["Katalog Mobil", "Pesanan Saya"] + (["Admin Dashboard"] if admin else [])
+    if st.session_state.get("menu") not in daftar_menu:
+        st.session_state.menu = "Katalog Mobil"
+    menu = st.sidebar.radio("Menu", daftar_menu, key="menu")
     
-    inv_manager = st.session_state.inventory
-    service = st.session_state.service
+    profiler = get_profiler()
+    inv_manager, service = get_services()
+    gambar_store = get_gambar_store()
     
   # ---------------- PAGE: KATALOG MOBIL ----------------
     if menu == "Katalog Mobil":
         st.header("Katalog Mobil Tersedia")
         st.info("Pilih mobil, tentukan durasi, dan lakukan pembayaran.")
         
-        mobil_list = inv_manager.get_all_mobil()
+        today = datetime.date.today()
+        harga_terendah, harga_tertinggi = inv_manager.get_rentang_harga()
+        
+        with st.expander("🔎 Filter & Urutkan", expanded=True):
+            f1, f2, f3 = st.columns(3)
+            with f1:
+                filter_kelas = st.selectbox("Tipe Mobil", ["Semua"] + list(KELAS_KENDARAAN), key="filter_kelas_katalog")
+                urutan_label = st.selectbox("Urutkan", list(URUTAN_KATALOG), key="urutan_katalog")
+            with f2:
+                filter_tgl = st.date_input(
+                    "Tersedia Pada Tanggal (Mulai - Selesai)",
+                    value=[],
+                    min_value=today,
+                    key="filter_tgl_katalog"
+                )
+            with f3:
+                if harga_terendah < harga_tertinggi:
+                    filter_harga = st.slider("Harga per Hari", min_value=harga_terendah, max_value=harga_tertinggi,
+                                             value=(harga_terendah, harga_tertinggi), step=50000,
+                                             key="filter_harga_katalog")
+                else:
+                    filter_harga = (None, None)
+        
+        tgl_mulai_filter, tgl_selesai_filter = None, None
+        if isinstance(filter_tgl, (list, tuple)) and len(filter_tgl) == 2:
+            tgl_mulai_filter, tgl_selesai_filter = filter_tgl
+        
+        mobil_list = inv_manager.cari_mobil(
+            kelas=None if filter_kelas == "Semua" else filter_kelas,
+            harga_min=filter_harga[0],
+            harga_max=filter_harga[1],
+            tgl_mulai=tgl_mulai_filter,
+            tgl_selesai=tgl_selesai_filter,
+            urutan=URUTAN_KATALOG[urutan_label]
+        )
+        
+        if not mobil_list:
+            st.warning("Tidak ada mobil yang sesuai dengan filter.")
+        
+        # Hanya kartu pada halaman aktif yang dirender
+        per_halaman = 9
+        jumlah_halaman = max(1, (len(mobil_list) - 1) // per_halaman + 1)
+        if jumlah_halaman > 1:
+            halaman = st.number_input(f"Halaman (1 - {jumlah_halaman}) dari {len(mobil_list)} mobil",
+                                      min_value=1, max_value=jumlah_halaman, value=1, key="halaman_katalog")
+        else:
+            halaman = 1
+        mobil_halaman = mobil_list[(halaman - 1) * per_halaman: halaman * per_halaman]
+        
+        kutipan_halaman = None
+        if tgl_mulai_filter and mobil_halaman:
+            durasi_filter = mesin_harga.durasi(tgl_mulai_filter, tgl_selesai_filter)
+            kutipan_halaman = mesin_harga.kutipan_batch(mobil_halaman, tgl_mulai_filter, tgl_selesai_filter)
         
         cols = st.columns(3)
-        for idx, mobil in enumerate(mobil_list):
+        for idx, mobil in enumerate(mobil_halaman):
             with cols[idx % 3]:
                 with st.container(border=True):
-                    st.image(mobil.image_url, use_container_width=True)
+                    st.image(gambar_store.get(mobil.image_url, "sedang"), use_container_width=True)
                     
                     st.markdown(f"### {mobil.merk}")
                     st.caption(mobil.get_detail_info())
                     st.write(f"**Plat**: {mobil.nopol}")
                     st.write(f"**Harga**: Rp {mobil.harga_sewa:,.0f} /hari")
+                    if kutipan_halaman is not None:
+                        st.write(f"**Total {durasi_filter} Hari**: Rp {kutipan_halaman[idx]:,.0f}")
                     
                     
                     if mobil.is_available:
-                        st.success("Tersedia")
+                        if inv_manager.sedang_disewa(mobil.id, today):
+                            st.warning("Sedang Disewa (pilih tanggal lain)")
+                        else:
+                            st.success("Tersedia")
+                        
+                        jadwal = inv_manager.get_jadwal(mobil.id, today)
+                        if jadwal:
+                            terisi = ", ".join(f"{m.strftime('%d/%m')}-{k.strftime('%d/%m')}" for m, k, _ in jadwal[:3])
+                            st.caption(f"Sudah dipesan: {terisi}")
                         
                         checkout_key = f"checkout_{mobil.id}"
                         dates_key = f"saved_dates_{mobil.id}" 
@@ -226,8 +425,6 @@ def main_app():
                             st.session_state[checkout_key] = False
 
                         if not st.session_state[checkout_key]:
-                            today = datetime.date.today()
-                            
                             dates_input = st.date_input(
                                 "Pilih Tanggal Sewa (Mulai - Selesai)",
                                 value=[], 
@@ -238,6 +435,9 @@ def main_app():
                             disable_btn = True
                             if isinstance(dates_input, (list, tuple)) and len(dates_input) == 2:
                                 disable_btn = False
+                                if not inv_manager.is_tersedia(mobil.id, *dates_input):
+                                    disable_btn = True
+                                    st.error("Tanggal bentrok dengan pesanan lain.")
                                 
                             if st.button("Lanjut Pembayaran", key=f"btn_book_{mobil.id}", disabled=disable_btn):
                                 st.session_state[dates_key] = dates_input 
@@ -256,16 +456,16 @@ def main_app():
                             
                             if len(dates) == 2:
                                 tgl_mulai, tgl_selesai = dates
-                                delta = tgl_selesai - tgl_mulai
-                                durasi_fix = delta.days if delta.days > 0 else 1
-                                total_harga = mobil.harga_sewa * durasi_fix
+                                durasi_fix = mesin_harga.durasi(tgl_mulai, tgl_selesai)
+                                total_harga = mesin_harga.kutipan(mobil, tgl_mulai, tgl_selesai)
                                 
                                 st.info(f"📅 {tgl_mulai.strftime('%d-%m-%Y')}  s/d  {tgl_selesai.strftime('%d-%m-%Y')}")
                                 st.write(f"Durasi: **{durasi_fix} Hari**")
                                 st.markdown(f"Total: **Rp {total_harga:,.0f}**")
+                                st.caption("Sudah termasuk tarif akhir pekan/hari libur dan diskon sewa panjang.")
                                 
                                 with st.form(key=f"form_bayar_{mobil.id}"):
-                                    metode = st.selectbox("Metode Pembayaran", ["QRIS", "Virtual Account", "Transfer Bank"])
+                                    metode = st.selectbox("Metode Pembayaran", list(MetodeBayar))
                                     c1, c2 = st.columns(2)
                                     with c1:
                                         confirm = st.form_submit_button("✅ Bayar", type="primary")
@@ -277,8 +477,10 @@ def main_app():
                                         booking = service.buat_pesanan(user, mobil.id, tgl_mulai, tgl_selesai, metode)
                                         if booking:
                                             st.session_state[checkout_key] = False
-                                            st.success("Booking Berhasil!")
+                                            st.success("Booking dibuat! Status pembayaran dapat dilihat di Pesanan Saya.")
                                             st.rerun()
+                                        else:
+                                            st.error("Mobil sudah dipesan pada tanggal tersebut.")
                                     if cancel:
                                         st.session_state[checkout_key] = False
                                         st.rerun()
@@ -289,181 +491,78 @@ def main_app():
     # ---------------- PAGE: PESANAN SAYA ----------------
     elif menu == "Pesanan Saya":
         st.header("Riwayat Pesanan Saya")
-        my_bookings = [b for b in st.session_state.all_bookings if b.user.user_id == user.user_id]
+        jumlah_pesanan = service.jumlah_bookings_user(user.user_id)
         
-        if not my_bookings:
+        if not jumlah_pesanan:
             st.warning("Anda belum menyewa mobil.")
         else:
-            for booking in my_bookings:
-                with st.expander(f"{booking.kendaraan.merk} ({booking.tgl_sewa})"):
-                    c_img, c_det = st.columns([1, 3])
-                    with c_img:
-                        st.image(booking.kendaraan.image_url, width=150)
-                    with c_det:
-                        st.write(f"**Total:** Rp {booking.total_biaya:,.0f} ({booking.durasi_hari} Hari)")
-                        st.write(f"**Status:** {booking.status_booking}")
-                        st.write(f"**Kembali:** {booking.get_tgl_kembali()}")
+            per_halaman = 10
+            jumlah_halaman = (jumlah_pesanan - 1) // per_halaman + 1
+            halaman = 1
+            if jumlah_halaman > 1:
+                halaman = st.number_input(f"Halaman (1 - {jumlah_halaman})", min_value=1,
+                                          max_value=jumlah_halaman, value=1, key="halaman_pesanan_saya")
+            offset = (halaman - 1) * per_halaman
+            ada_pending = any(b.status_booking == StatusBooking.PENDING
+                              for b in service.get_bookings_user(user.user_id, offset, per_halaman))
+            
+            def daftar_pesanan():
+                my_bookings = service.get_bookings_user(user.user_id, offset, per_halaman)
+                for booking in my_bookings:
+                    with st.expander(f"{booking.kendaraan.merk} ({booking.tgl_sewa})"):
+                        c_img, c_det = st.columns([1, 3])
+                        with c_img:
+                            st.image(gambar_store.get(booking.kendaraan.image_url, "kecil"), width=150)
+                        with c_det:
+                            st.write(f"**Total:** Rp {booking.total_biaya:,.0f} ({booking.durasi_hari} Hari)")
+                            if booking.status_booking == StatusBooking.PENDING:
+                                st.write("**Status:** ⏳ Menunggu verifikasi pembayaran")
+                            else:
+                                st.write(f"**Status:** {booking.status_booking}")
+                            st.write(f"**Kembali:** {booking.get_tgl_kembali()}")
+                
+                # Semua pembayaran sudah diproses: rerun penuh sekali untuk menghentikan polling
+                if ada_pending and not any(b.status_booking == StatusBooking.PENDING for b in my_bookings):
+                    st.rerun()
+            
+            # Selama ada pembayaran tertunda, hanya daftar ini yang di-refresh berkala (tanpa memblokir halaman)
+            st.fragment(daftar_pesanan, run_every=2 if ada_pending else None)()
 
     # ---------------- PAGE: ADMIN DASHBOARD ----------------
-    elif menu == "Admin Dashboard":
+    elif menu == "Admin Dashboard" and admin:
         st.title("Panel Admin")
         
-        tab1, tab2, tab3 = st.tabs(["Manajemen Pesanan", "Tambah Unit Mobil", "Laporan Keuangan"])        
+        nama_tab = ["Manajemen Pesanan", "Tambah Unit Mobil", "Laporan Keuangan"]
+        isi_tab = {
+            "Manajemen Pesanan": lambda: tab_manajemen_pesanan(service, gambar_store),
+            "Tambah Unit Mobil": lambda: tab_tambah_unit(inv_manager, gambar_store),
+            "Laporan Keuangan": lambda: tab_laporan_keuangan(service),
+            "Performance": lambda: panel_performa(profiler),
+        }
+        # Tab Performance tersembunyi; buka dengan menambahkan ?perf=1 pada URL
+        if st.query_params.get("perf") == "1":
+            nama_tab.append("Performance")
         
-        # --- TAB 1: TRACKING PESANAN ---
-        with tab1:
-            st.subheader("Tracking Pesanan")
-            if 'all_bookings' not in st.session_state:
-                st.session_state.all_bookings = []
+        # on_change="rerun": pindah tab memicu rerun dan hanya isi tab yang terbuka yang dijalankan
+        tabs = st.tabs(nama_tab, key="tab_admin", on_change="rerun")
+        for nama, tab in zip(nama_tab, tabs):
+            if tab.open:
+                with tab, profiler.span(f"tab:{nama}"):
+                    isi_tab[nama]()
 
-            active_bookings = [b for b in st.session_state.all_bookings if b.status_booking == "Active"]
-            
-            if not active_bookings:
-                st.info("Tidak ada mobil yang sedang disewa.")
-            
-            for b in active_bookings:
-                with st.container(border=True):
-                    c1, c2, c3 = st.columns([1, 2, 1])
-                    with c1:
-                        try:
-                            st.image(b.kendaraan.image_url, use_container_width=True)
-                        except:
-                            st.write("No Image")
-                    
-                    with c2: 
-                        st.markdown(f"**{b.kendaraan.merk}**")
-                        st.caption(f"Penyewa: {b.user.nama}")
-                        st.write("📅 **Jadwal Sewa:**")
-                        st.code(f"{b.tgl_sewa} s/d {b.tgl_kembali}")
-                        st.caption(f"Durasi Total: {b.durasi_hari} Hari")
-                    
-                    with c3:
-                        if st.button("Selesai & Restock", key=f"done_{b.booking_id}", type="primary"):
-                            service.selesaikan_pesanan(b)
-                            st.success("Sewa Selesai")
-                            st.rerun()
-
-        # --- TAB 2: INPUT MOBIL BARU ---
-        with tab2:
-            st.subheader("Input Mobil Baru")
-            
-            if not os.path.exists("car_images"):
-                os.makedirs("car_images")
-
-            with st.form("add_car_form"):
-                tipe_mobil = st.selectbox("Tipe Mobil", ["Hatchback", "Sedan", "SUV"])
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    merk = st.text_input("Merk Mobil (Contoh: Honda Jazz)")
-                    nopol = st.text_input("Nomor Polisi")
-                with col2:
-                    harga = st.number_input("Harga Sewa per Hari", min_value=100000, step=50000)
-                    
-                extra_attr = None
-                default_img = ""
-                
-                IMG_HATCHBACK = "https://images.unsplash.com/photo-1541899481282-d53bffe3c35d?auto=format&fit=crop&w=500&q=60"
-                IMG_SEDAN = "https://images.unsplash.com/photo-1555215695-3004980adade?auto=format&fit=crop&w=500&q=60"
-                IMG_SUV = "https://images.unsplash.com/photo-1533473359331-0135ef1b58bf?auto=format&fit=crop&w=500&q=60"
-                
-                if tipe_mobil == "Hatchback":
-                    extra_attr = st.number_input("Kapasitas Bagasi (Liter)", min_value=100)
-                    default_img = IMG_HATCHBACK
-                elif tipe_mobil == "Sedan":
-                    extra_attr = st.selectbox("Tingkat Kenyamanan", ["Standard", "High", "Luxury"])
-                    default_img = IMG_SEDAN
-                elif tipe_mobil == "SUV":
-                    is_4wd = st.checkbox("Four Wheel Drive (4WD)?")
-                    extra_attr = is_4wd
-                    default_img = IMG_SUV
-
-                st.write("---")
-                st.write("Foto Kendaraan (Opsional)")
-                uploaded_file = st.file_uploader("Upload Foto (JPG/PNG)", type=["jpg", "png", "jpeg"])
-                
-                submit_add = st.form_submit_button("Simpan ke Inventory")
-                
-                if submit_add:
-                    if merk and nopol:
-                        id_baru = f"C{len(inv_manager.daftar_mobil)+1:02d}"
-                        final_img_path = default_img 
-                        
-                        if uploaded_file is not None:
-                            file_path = os.path.join("car_images", f"{id_baru}_{uploaded_file.name}")
-                            with open(file_path, "wb") as f:
-                                f.write(uploaded_file.getbuffer())
-                            final_img_path = file_path 
-                        
-                        new_car = None
-                        if tipe_mobil == "Hatchback":
-                            new_car = Hatchback(id_baru, merk, nopol, harga, final_img_path, extra_attr)
-                        elif tipe_mobil == "Sedan":
-                            new_car = Sedan(id_baru, merk, nopol, harga, final_img_path, extra_attr)
-                        elif tipe_mobil == "SUV":
-                            new_car = SUV(id_baru, merk, nopol, harga, final_img_path, extra_attr)
-                        
-                        inv_manager.tambah_unit(new_car)
-                        st.success(f"Berhasil menambahkan {merk}!")
-                        st.rerun()
-                    else:
-                        st.error("Mohon lengkapi Merk dan Nomor Polisi!")
-    
-    # --- TAB 3: LAPORAN KEUANGAN ---
-        with tab3:
-            st.subheader("Laporan Pemasukan (Revenue)")
-            
-            if 'all_bookings' not in st.session_state:
-                st.session_state.all_bookings = []
-                
-            valid_bookings = [b for b in st.session_state.all_bookings if b.status_booking in ["Active", "Completed"]]
-            
-            if not valid_bookings:
-                st.info("Belum ada data transaksi penyewaan.")
-            else:
-                total_pendapatan = sum(b.total_biaya for b in valid_bookings)
-                
-                st.metric(label="Total Pemasukan Bersih", value=f"Rp {total_pendapatan:,.0f}")
-                
-                st.write("---")
-                st.write("### Rincian Transaksi")
-                
-                laporan_data = []
-                for b in valid_bookings:
-                    laporan_data.append({
-                        "ID Booking": b.booking_id,
-                        "Tanggal Sewa": b.tgl_sewa.strftime("%Y-%m-%d"),
-                        "Penyewa": b.user.nama,
-                        "Mobil": f"{b.kendaraan.merk} ({b.kendaraan.nopol})",
-                        "Durasi": f"{b.durasi_hari} Hari",
-                        "Metode Bayar": b.pembayaran.metode if b.pembayaran else "N/A",
-                        "Total Biaya": f"Rp {b.total_biaya:,.0f}",
-                        "Status": b.status_booking
-                    })
-                
-                st.dataframe(laporan_data, use_container_width=True)
-                
-
-                csv_header = "ID,Tanggal,Penyewa,Mobil,Total,Status\n"
-                csv_data = csv_header
-                for item in laporan_data:
-                    row = f"{item['ID Booking']},{item['Tanggal Sewa']},{item['Penyewa']},{item['Mobil']},{item['Total Biaya']},{item['Status']}\n"
-                    csv_data += row
-                
-                st.download_button(
-                    label="📥 Download Laporan (CSV)",
-                    data=csv_data,
-                    file_name="laporan_keuangan_renex.csv",
-                    mime="text/csv"
-                )
 # --- Main Execution ---
 def main():
     st.set_page_config(page_title="Rental Mobil App", layout="wide")
     
+    profiler = get_profiler()
+    profiler.pasang()
+    
     if 'user' not in st.session_state:
         login_page()
     else:
-        main_app()
+        menu = st.session_state.get("menu", "Katalog Mobil")
+        with profiler.rerun(), profiler.span(f"halaman:{menu}"):
+            main_app()
         if st.sidebar.button("Logout"):
             del st.session_state['user']
             st.rerun()
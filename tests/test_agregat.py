@@ -0,0 +1,82 @@
+# AgregatPendapatan diperbarui secara inkremental; hasilnya harus selalu sama dengan hitung ulang penuh
+# atas seluruh riwayat booking, apa pun urutan create / selesai / pending / batal yang terjadi.
+import datetime
+import random
+
+from renex import (AgregatPendapatan, BookingService, InventoryManager, User, MetodeBayar, STATUS_VALID,
+                   Hatchback, Sedan, SUV)
+
+class PemrosesManual:
+    # Pengganti PemrosesPembayaran: verifikasi ditahan sampai test memutuskan hasilnya
+    def __init__(self):
+        self.antrean = []
+
+    def ajukan(self, pembayaran, callback):
+        self.antrean.append(callback)
+
+def hitung_ulang(bookings):
+    agregat = AgregatPendapatan()
+    for booking in bookings:
+        agregat.catat_booking(booking)
+    return agregat
+
+def samakan(agregat, pembanding):
+    for nama in ("per_status", "per_metode", "per_kelas", "per_hari", "per_bulan"):
+        assert agregat.get_ringkasan(getattr(agregat, nama)) == \
+            pembanding.get_ringkasan(getattr(pembanding, nama)), nama
+    assert agregat.total_pendapatan() == pembanding.total_pendapatan()
+    assert agregat.jumlah_transaksi() == pembanding.jumlah_transaksi()
+
+def test_agregat_sama_dengan_hitung_ulang_penuh():
+    rng = random.Random(5)
+    inv = InventoryManager()
+    kelas = [(Hatchback, 250), (Sedan, "High"), (SUV, True)]
+    inv.tambah_unit_batch([kelas[i % 3][0](f"C{i:02d}", f"Mobil {i}", f"L {i:02d} XX", 200000 + 25000 * i, "",
+                                           kelas[i % 3][1]) for i in range(1, 31)])
+    pemroses = PemrosesManual()
+    # Dua service: satu langsung (booking Active), satu lewat pembayaran async (Pending dulu)
+    langsung = BookingService(inv)
+    tertunda = BookingService(inv, pemroses_pembayaran=pemroses)
+    users = [User(i, f"User {i}", f"user{i}@test.renex.id") for i in range(5)]
+    awal = datetime.date(2026, 1, 25)
+
+    for langkah in range(3000):
+        aksi = rng.random()
+        if aksi < 0.5:
+            service = rng.choice((langsung, tertunda))
+            mulai = awal + datetime.timedelta(days=rng.randrange(90))
+            service.buat_pesanan(rng.choice(users), f"C{rng.randint(1, 30):02d}", mulai,
+                                 mulai + datetime.timedelta(days=rng.randint(0, 6)), rng.choice(list(MetodeBayar)))
+        elif aksi < 0.75 and pemroses.antrean:
+            # Pembayaran diverifikasi (Active) atau gagal / kedaluwarsa (Cancelled)
+            callback = pemroses.antrean.pop(rng.randrange(len(pemroses.antrean)))
+            callback(rng.random() < 0.6)
+        else:
+            service = rng.choice((langsung, tertunda))
+            aktif = service.get_bookings_aktif()
+            if aktif:
+                service.selesaikan_pesanan(rng.choice(aktif))
+        if langkah % 500 == 0:
+            for service in (langsung, tertunda):
+                samakan(service.agregat, hitung_ulang(service.get_all_bookings()))
+
+    for service in (langsung, tertunda):
+        bookings = service.get_all_bookings()
+        samakan(service.agregat, hitung_ulang(bookings))
+        # Pembanding independen tanpa AgregatPendapatan sama sekali
+        valid = [b for b in bookings if b.status_booking in STATUS_VALID]
+        assert service.agregat.total_pendapatan() == sum(b.total_biaya for b in valid)
+        assert service.agregat.jumlah_transaksi() == len(valid)
+        for nama, kunci in (("per_metode", lambda b: b.pembayaran.metode),
+                            ("per_kelas", lambda b: type(b.kendaraan).__name__),
+                            ("per_bulan", lambda b: b.tgl_sewa.strftime("%Y-%m"))):
+            harapan = {}
+            for booking in valid:
+                entri = harapan.setdefault(kunci(booking), [0, 0])
+                entri[0] += 1
+                entri[1] += booking.total_biaya
+            assert service.agregat.get_ringkasan(getattr(service.agregat, nama)) == \
+                [(k, n, total) for k, (n, total) in sorted(harapan.items())], nama
+
+    status = {b.status_booking for b in tertunda.get_all_bookings()}
+    assert len(status) == 4, f"riwayat acak harus mencakup semua status, hanya ada {status}"
@@ -0,0 +1,191 @@
+# Validasi endpoint /api lewat panggilan ASGI langsung (tanpa klien HTTP): setiap input buruk harus
+# dijawab 4xx dengan {"error": ...}, bukan 500, dan layanan memakai storage SQLite sementara.
+# Akses: tanpa kunci API 401, kunci klien di endpoint admin 403, booking hanya terlihat oleh pemiliknya.
+import asyncio
+import datetime
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+
+from renex import layanan, api
+from renex.api import buat_app_headless, MAKS_DURASI_SEWA
+
+KUNCI_KLIEN, KUNCI_ADMIN = "klien-uji", "admin-uji"
+
+BESOK = datetime.date.today() + datetime.timedelta(days=1)
+
+def hari(n):
+    return (BESOK + datetime.timedelta(days=n)).isoformat()
+
+def panggil(app, metode, path, body=None, query=None, kunci=KUNCI_KLIEN, token=None):
+    # -> (status, isi JSON)
+    data = json.dumps(body).encode() if body is not None else b""
+    headers = [(b"content-type", b"application/json"), (b"host", b"test")]
+    if kunci:
+        headers.append((b"x-api-key", kunci.encode()))
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": metode,
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+             "query_string": urlencode(query or {}).encode(), "server": ("test", 80), "client": ("test", 1),
+             "headers": headers}
+    keluaran = {}
+
+    async def receive():
+        return {"type": "http.request", "body": data, "more_body": False}
+
+    async def send(pesan):
+        if pesan["type"] == "http.response.start":
+            keluaran["status"] = pesan["status"]
+        elif pesan["type"] == "http.response.body":
+            keluaran["body"] = keluaran.get("body", b"") + pesan.get("body", b"")
+
+    asyncio.run(app(scope, receive, send))
+    return keluaran["status"], json.loads(keluaran["body"])
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(layanan, "DB_PATH", str(tmp_path / "renex.db"))
+    monkeypatch.setattr(layanan, "STORAGE", "sqlite")
+    monkeypatch.setenv("RENEX_LATENSI_GATEWAY", "0")
+    monkeypatch.setattr(layanan, "_layanan", {})
+    monkeypatch.setattr(api, "KUNCI_KLIEN", [KUNCI_KLIEN])
+    monkeypatch.setattr(api, "KUNCI_ADMIN", [KUNCI_ADMIN])
+    yield buat_app_headless()
+    _, service = layanan.get_services()
+    time.sleep(0.1)
+    service.pemroses_pembayaran.hentikan()
+
+def masuk(app, email="budi@renex.id", password="rahasia"):
+    status, isi = panggil(app, "POST", "/api/masuk", {"nama": "Budi", "email": email, "password": password})
+    assert status == 200
+    return isi["token"]
+
+@pytest.fixture
+def token(app):
+    return masuk(app)
+
+def pesanan(**ubah):
+    body = {"metode_bayar": "QRIS", "kendaraan_id": "C01", "tgl_mulai": hari(0), "tgl_selesai": hari(2)}
+    body.update(ubah)
+    return body
+
+@pytest.mark.parametrize("ubah, pesan", [
+    ({"kendaraan_id": ["C01"]}, "kendaraan_id"),
+    ({"kendaraan_id": {"id": "C01"}}, "kendaraan_id"),
+    ({"kendaraan_id": 1}, "kendaraan_id"),
+    ({"tgl_mulai": "besok"}, "tgl_mulai"),
+    ({"tgl_selesai": None}, "tgl_selesai"),
+    ({"tgl_mulai": "2020-01-01"}, "masa lalu"),
+    ({"tgl_mulai": hari(3), "tgl_selesai": hari(1)}, "sebelum"),
+    ({"tgl_mulai": "9999-12-31", "tgl_selesai": "9999-12-31"}, "paling lambat"),
+    ({"tgl_selesai": hari(MAKS_DURASI_SEWA + 1)}, "Durasi"),
+    ({"metode_bayar": ["QRIS"]}, "metode_bayar"),
+    ({"metode_bayar": "Cash"}, "metode_bayar"),
+    ({"mobil": [["C01"]]}, "objek"),
+])
+def test_booking_input_buruk_400(app, token, ubah, pesan):
+    status, isi = panggil(app, "POST", "/api/booking", pesanan(**ubah), token=token)
+    assert status == 400 and pesan in isi["error"]
+    # Tidak ada yang tertahan: mobil masih bisa dipesan untuk rentang yang sama
+    assert panggil(app, "GET", "/api/kutipan", query={"kendaraan_id": "C01", "tgl_mulai": hari(0),
+                                                      "tgl_selesai": hari(2)})[1]["tersedia"]
+
+@pytest.mark.parametrize("query", [
+    {"kendaraan_id": "C01", "tgl_mulai": "9999-12-31", "tgl_selesai": "9999-12-31"},
+    {"kendaraan_id": "C01", "tgl_mulai": hari(0), "tgl_selesai": "9999-12-31"},
+    {"kendaraan_id": "C01", "tgl_mulai": "31-12-2026", "tgl_selesai": hari(1)},
+])
+def test_kutipan_rentang_buruk_400(app, query):
+    assert panggil(app, "GET", "/api/kutipan", query=query)[0] == 400
+
+@pytest.mark.parametrize("query", [
+    {"tgl_dari": "0001-01-01", "tgl_sampai": "9999-12-31"},
+    {"tgl_sampai": "0001-01-05"},
+    {"tgl_dari": "2020-01-01", "tgl_sampai": "2025-12-31"},
+    {"tgl_dari": hari(5), "tgl_sampai": hari(1)},
+])
+def test_analitik_rentang_buruk_400(app, query):
+    assert panggil(app, "GET", "/api/laporan/analitik", query=query, kunci=KUNCI_ADMIN)[0] == 400
+
+def test_analitik_rentang_default(app):
+    status, isi = panggil(app, "GET", "/api/laporan/analitik", kunci=KUNCI_ADMIN)
+    assert status == 200 and isi["jumlah_hari"] == 30
+
+def test_batch_bentrok_dengan_dirinya_409(app, token):
+    item = {"kendaraan_id": "C01", "tgl_mulai": hari(0), "tgl_selesai": hari(2)}
+    status, isi = panggil(app, "POST", "/api/booking", pesanan(mobil=[item, dict(item, kendaraan_id="C02"), item]),
+                          token=token)
+    assert status == 409
+    # Reservasi C01 & C02 dari batch yang gagal sudah dilepas
+    status, isi = panggil(app, "POST", "/api/booking", pesanan(mobil=[item, dict(item, kendaraan_id="C02")]),
+                          token=token)
+    assert status == 201 and len(isi["booking"]) == 2
+
+def tunggu_aktif(app, token, booking_id):
+    for _ in range(100):
+        if panggil(app, "GET", f"/api/booking/{booking_id}", token=token)[1]["status"] == "Active":
+            return
+        time.sleep(0.02)
+
+def test_selesaikan_booking_tidak_aktif_409(app, token):
+    status, isi = panggil(app, "POST", "/api/booking", pesanan(), token=token)
+    assert status == 201
+    booking_id = isi["booking"][0]["booking_id"]
+    tunggu_aktif(app, token, booking_id)
+    assert panggil(app, "POST", f"/api/booking/{booking_id}/selesai", kunci=KUNCI_ADMIN)[0] == 200
+    status, isi = panggil(app, "POST", f"/api/booking/{booking_id}/selesai", kunci=KUNCI_ADMIN)
+    assert status == 409 and "Completed" in isi["error"]
+    assert panggil(app, "POST", "/api/booking/999/selesai", kunci=KUNCI_ADMIN)[0] == 404
+
+def test_mobil_tidak_ada_404(app):
+    assert panggil(app, "GET", "/api/mobil/C99")[0] == 404
+    assert panggil(app, "GET", "/api/kutipan", query={"kendaraan_id": "C99", "tgl_mulai": hari(0),
+                                                      "tgl_selesai": hari(1)})[0] == 404
+
+def test_email_terdaftar_butuh_password_yang_sama(app, token):
+    status, isi = panggil(app, "POST", "/api/masuk", {"nama": "Penyusup", "email": "budi@renex.id",
+                                                      "password": "tebakan"})
+    assert status == 401 and "password" in isi["error"]
+    assert layanan.get_user("Budi", "budi@renex.id", "rahasia") is not None
+    # User dari database lama (tanpa password) tidak bisa diambil alih hanya dengan email
+    layanan.get_storage().buat_user("Lama", "lama@renex.id")
+    assert layanan.get_user("Lama", "lama@renex.id", "apa saja") is None
+
+@pytest.mark.parametrize("metode, path", [
+    ("GET", "/api/status"), ("GET", "/api/mobil"), ("GET", "/api/kutipan"), ("POST", "/api/masuk"),
+    ("GET", "/api/booking"), ("POST", "/api/booking"), ("GET", "/api/booking/1"),
+    ("POST", "/api/booking/1/selesai"), ("GET", "/api/laporan"), ("GET", "/api/laporan/analitik"),
+])
+def test_tanpa_kunci_api_401(app, metode, path):
+    assert panggil(app, metode, path, kunci=None)[0] == 401
+    assert panggil(app, metode, path, kunci="kunci-palsu")[0] == 401
+
+@pytest.mark.parametrize("metode, path", [
+    ("POST", "/api/booking/1/selesai"), ("GET", "/api/laporan"), ("GET", "/api/laporan/analitik"),
+])
+def test_endpoint_admin_menolak_kunci_klien_403(app, token, metode, path):
+    assert panggil(app, metode, path, token=token)[0] == 403
+    assert panggil(app, metode, path, kunci=KUNCI_ADMIN)[0] != 403
+
+def test_booking_butuh_token_user_401(app):
+    assert panggil(app, "POST", "/api/booking", pesanan())[0] == 401
+    assert panggil(app, "GET", "/api/booking", query={"email": "budi@renex.id"})[0] == 401
+    assert panggil(app, "GET", "/api/booking", token="token-palsu")[0] == 401
+
+def test_booking_hanya_terlihat_oleh_pemiliknya(app, token):
+    status, isi = panggil(app, "POST", "/api/booking", pesanan(), token=token)
+    assert status == 201
+    booking_id = isi["booking"][0]["booking_id"]
+    lain = masuk(app, "ani@renex.id", "rahasia-ani")
+    assert panggil(app, "GET", f"/api/booking/{booking_id}", token=lain)[0] == 404
+    # ?email= dari kunci klien diabaikan: yang dikembalikan tetap riwayat pemilik token
+    status, isi = panggil(app, "GET", "/api/booking", query={"email": "budi@renex.id"}, token=lain)
+    assert status == 200 and isi["jumlah"] == 0
+    status, isi = panggil(app, "GET", "/api/booking", token=token)
+    assert status == 200 and [b["booking_id"] for b in isi["booking"]] == [booking_id]
+    status, isi = panggil(app, "GET", "/api/booking", query={"email": "budi@renex.id"}, kunci=KUNCI_ADMIN)
+    assert status == 200 and isi["jumlah"] == 1
+    assert panggil(app, "GET", f"/api/booking/{booking_id}", kunci=KUNCI_ADMIN)[0] == 200
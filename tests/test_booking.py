@@ -0,0 +1,176 @@
+# Reservasi jadwal diambil sebelum pembayaran dibuat dan booking disimpan: setiap kegagalan sesudahnya
+# harus melepas reservasi, kalau tidak mobil tertahan sampai proses di-restart.
+import datetime
+import time
+
+import pytest
+
+from renex import BookingService, InventoryManager, User, MetodeBayar, StatusBooking, Sedan
+
+MULAI = datetime.date.today() + datetime.timedelta(days=7)
+SELESAI = MULAI + datetime.timedelta(days=2)
+
+class StorageGagal:
+    # Cukup antarmuka yang dipakai BookingService; penulisan booking selalu gagal
+    def get_id_terakhir(self, tabel, kolom):
+        return 0
+
+    def load_bookings(self, inventory_manager):
+        return []
+
+    def simpan_booking(self, booking):
+        raise RuntimeError("storage mati")
+
+    def simpan_booking_batch(self, daftar_booking):
+        raise RuntimeError("storage mati")
+
+@pytest.fixture
+def inv():
+    inv = InventoryManager()
+    inv.tambah_unit_batch([Sedan(f"C0{i}", f"Mobil {i}", f"L {i} XX", 500000, "", "High") for i in range(1, 4)])
+    return inv
+
+USER = User(1, "Budi", "budi@renex.id")
+
+def test_metode_tidak_valid_tidak_menahan_mobil(inv):
+    service = BookingService(inv)
+    with pytest.raises(ValueError):
+        service.buat_pesanan(USER, "C01", MULAI, SELESAI, "Cash")
+    assert inv.is_tersedia("C01", MULAI, SELESAI)
+    assert service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS) is not None
+
+def test_storage_gagal_melepas_reservasi(inv):
+    service = BookingService(inv, StorageGagal())
+    with pytest.raises(RuntimeError):
+        service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS)
+    assert inv.is_tersedia("C01", MULAI, SELESAI)
+    assert service.get_all_bookings() == []
+
+def test_batch_metode_tidak_valid_tidak_menahan_mobil(inv):
+    service = BookingService(inv)
+    permintaan = [("C01", MULAI, SELESAI), ("C02", MULAI, SELESAI)]
+    with pytest.raises(ValueError):
+        service.buat_pesanan_batch(USER, permintaan, "Cash")
+    assert inv.is_tersedia("C01", MULAI, SELESAI) and inv.is_tersedia("C02", MULAI, SELESAI)
+
+def test_batch_gagal_melepas_semua_reservasi(inv):
+    permintaan = [(f"C0{i}", MULAI, SELESAI) for i in range(1, 4)]
+    with pytest.raises(RuntimeError):
+        BookingService(inv, StorageGagal()).buat_pesanan_batch(USER, permintaan, MetodeBayar.QRIS)
+    assert all(inv.is_tersedia(kendaraan_id, MULAI, SELESAI) for kendaraan_id, _, _ in permintaan)
+    # Satu mobil bentrok di tengah batch: reservasi sebelumnya ikut dilepas
+    service = BookingService(inv)
+    assert service.buat_pesanan_batch(USER, permintaan + [("C01", MULAI, SELESAI)], MetodeBayar.QRIS) is None
+    assert all(inv.is_tersedia(kendaraan_id, MULAI, SELESAI) for kendaraan_id, _, _ in permintaan)
+
+class StorageStatusGagal(StorageGagal):
+    # Booking tersimpan, tetapi perubahan status sesudahnya gagal (mis. database terkunci terlalu lama)
+    def simpan_booking(self, booking):
+        pass
+
+    def update_status_booking(self, booking_id, status):
+        raise RuntimeError("database is locked")
+
+    def konfirmasi_pembayaran(self, booking, status, sukses):
+        raise RuntimeError("database is locked")
+
+def test_selesaikan_gagal_di_storage_tidak_mengubah_memori(inv):
+    service = BookingService(inv, StorageStatusGagal())
+    booking = service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS)
+    with pytest.raises(RuntimeError):
+        service.selesaikan_pesanan(booking)
+    assert booking.status_booking == StatusBooking.ACTIVE
+    assert service.get_bookings_aktif() == [booking]
+    assert service.agregat.jumlah_transaksi() == 1
+    assert not inv.is_tersedia("C01", MULAI, SELESAI)
+
+class PemrosesDitahan:
+    # Verifikasi tidak pernah dijalankan: booking tetap "Pending Payment" sampai test memanggil hasilnya
+    def ajukan(self, pembayaran, selesai):
+        pass
+
+class StorageKonfirmasiGagal(StorageStatusGagal):
+    # konfirmasi_pembayaran gagal sebanyak `gagal` kali, lalu berhasil
+    def __init__(self, gagal):
+        self.gagal = gagal
+        self.percobaan = 0
+
+    def konfirmasi_pembayaran(self, booking, status, sukses):
+        self.percobaan += 1
+        if self.percobaan <= self.gagal:
+            raise RuntimeError("database is locked")
+
+def tunggu(kondisi, batas=5):
+    akhir = time.monotonic() + batas
+    while not kondisi() and time.monotonic() < akhir:
+        time.sleep(0.01)
+    return kondisi()
+
+def test_konfirmasi_gagal_di_storage_dicoba_ulang(inv):
+    storage = StorageKonfirmasiGagal(gagal=2)
+    service = BookingService(inv, storage, PemrosesDitahan())
+    service.JEDA_RETRY_KONFIRMASI = 0.01
+    booking = service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS)
+    service._selesaikan_pembayaran(booking, True)
+    # Selama storage belum tertulis, memori tetap sama dengan storage
+    assert booking.status_booking == StatusBooking.PENDING
+    assert tunggu(lambda: booking.status_booking == StatusBooking.ACTIVE)
+    assert storage.percobaan == 3 and service.get_bookings_aktif() == [booking]
+
+def test_konfirmasi_terus_gagal_melepas_mobil(inv):
+    storage = StorageKonfirmasiGagal(gagal=100)
+    service = BookingService(inv, storage, PemrosesDitahan())
+    service.JEDA_RETRY_KONFIRMASI = 0.01
+    booking = service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS)
+    service._selesaikan_pembayaran(booking, True)
+    assert tunggu(lambda: booking.status_booking == StatusBooking.CANCELLED)
+    assert storage.percobaan == service.MAKS_PERCOBAAN_KONFIRMASI
+    assert inv.is_tersedia("C01", MULAI, SELESAI)
+    assert service.agregat.jumlah_transaksi() == 0 and service.get_bookings_aktif() == []
+
+def test_booking_baru_belum_terlihat_sebelum_ledger_dan_agregat(inv):
+    # Selama ledger dicatat, booking belum boleh bisa diambil (dan diselesaikan) oleh thread lain
+    service = BookingService(inv)
+    terlihat = []
+    tambah_asli = service.ledger.tambah
+
+    def tambah(booking):
+        terlihat.append(service.get_booking(booking.booking_id))
+        return tambah_asli(booking)
+
+    service.ledger.tambah = tambah
+    booking = service.buat_pesanan(USER, "C01", MULAI, SELESAI, MetodeBayar.QRIS)
+    assert terlihat == [None]
+    assert service.selesaikan_pesanan(booking)
+    assert service.ledger.get_baris(booking.baris_ledger)["status"] == StatusBooking.COMPLETED
+    assert service.agregat.get_ringkasan(service.agregat.per_status) == [
+        (StatusBooking.COMPLETED, 1, booking.total_biaya)]
+
+def test_pesanan_saya_terbaru_dulu_per_halaman(inv):
+    service = BookingService(inv)
+    lain = User(2, "Ani", "ani@renex.id")
+    milik_budi = []
+    for i in range(7):
+        mulai = MULAI + datetime.timedelta(days=3 * i)
+        milik_budi.append(service.buat_pesanan(USER, "C01", mulai, mulai + datetime.timedelta(days=2),
+                                               MetodeBayar.QRIS))
+        service.buat_pesanan(lain, "C02", mulai, mulai + datetime.timedelta(days=2), MetodeBayar.QRIS)
+    assert service.jumlah_bookings_user(USER.user_id) == 7
+    halaman = [service.get_bookings_user(USER.user_id, offset, 3) for offset in (0, 3, 6, 9)]
+    assert halaman[0] == milik_budi[6:3:-1]
+    assert halaman[1] == milik_budi[3:0:-1] and halaman[2] == [milik_budi[0]] and halaman[3] == []
+    # Riwayat user lain tidak pernah tercampur
+    assert all(b.user is lain for b in service.get_bookings_user(2, 0, 100))
+    assert service.jumlah_bookings_user(2) == 7 and service.jumlah_bookings_user(3) == 0
+    assert service.get_bookings_user(3) == []
+
+def test_booking_selesai_keluar_dari_daftar_aktif(inv):
+    service = BookingService(inv)
+    bookings = [service.buat_pesanan(USER, f"C0{i}", MULAI, SELESAI, MetodeBayar.QRIS) for i in range(1, 4)]
+    assert service.jumlah_bookings_aktif() == 3 and service.get_bookings_aktif() == bookings
+    assert service.get_bookings_aktif(offset=1, limit=1) == [bookings[1]]
+    assert service.selesaikan_pesanan(bookings[1])
+    assert service.jumlah_bookings_aktif() == 2 and service.get_bookings_aktif() == [bookings[0], bookings[2]]
+    # Riwayat user tetap utuh; booking selesai hanya keluar dari himpunan aktif
+    assert service.jumlah_bookings_user(USER.user_id) == 3
+    assert not service.selesaikan_pesanan(bookings[1])
@@ -0,0 +1,52 @@
+# Hasil ekspor dipakai langsung sebagai data st.download_button (lewat callable), jadi harus berupa tipe
+# yang diterima konverter Streamlit dan tetap terbaca utuh sebagai CSV / Parquet.
+import csv
+import datetime
+import io
+
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from renex import BookingService, InventoryManager, User, MetodeBayar, StatusBooking, Sedan, SUV
+from renex.ekspor import EksporLaporan, pa
+
+@pytest.fixture
+def eksportir():
+    inv = InventoryManager()
+    inv.tambah_unit_batch([Sedan("C01", "Civic", "L 1 AA", 500000, "", "High"),
+                           SUV("C02", "Fortuner, VRZ", "L 2 AA", 900000, "", True)])
+    service = BookingService(inv)
+    user = User(1, 'Budi "B" Santoso', "budi@test.renex.id")
+    awal = datetime.date(2026, 3, 1)
+    for i in range(6_000):
+        mulai = awal + datetime.timedelta(days=2 * i)
+        service.buat_pesanan(user, ("C01", "C02")[i % 2], mulai, mulai + datetime.timedelta(days=1),
+                             MetodeBayar.QRIS)
+    service.get_all_bookings()[0].status_booking = StatusBooking.CANCELLED
+    return EksporLaporan(service)
+
+def konversi(data):
+    return convert_data_to_bytes_and_infer_mime(data, RuntimeError("tipe data tidak didukung"))
+
+def test_csv_diterima_download_button(eksportir):
+    data, _ = konversi(eksportir.ke_csv())
+    baris = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+    assert baris[0] == EksporLaporan.KOLOM
+    # Booking yang dibatalkan tidak ikut; isi melewati beberapa chunk tanpa baris hilang / ganda
+    assert [int(b[0]) for b in baris[1:]] == list(range(2, 6_001))
+    assert baris[1][3] == 'Budi "B" Santoso' and baris[1][4] == "Fortuner, VRZ (L 2 AA)"
+
+def test_csv_filter_tanggal(eksportir):
+    data, _ = konversi(eksportir.ke_csv(datetime.date(2026, 3, 3), datetime.date(2026, 3, 7)))
+    assert [b[1] for b in csv.reader(io.StringIO(data.decode("utf-8")))][1:] == \
+        ["2026-03-03", "2026-03-05", "2026-03-07"]
+
+@pytest.mark.skipif(pa is None, reason="pyarrow tidak terpasang")
+def test_parquet_diterima_download_button(eksportir):
+    import pyarrow.parquet as pq
+
+    data, _ = konversi(eksportir.ke_parquet())
+    tabel = pq.read_table(io.BytesIO(data))
+    assert tabel.num_rows == 5_999
+    assert tabel.column("id_booking").to_pylist() == list(range(2, 6_001))
+    assert tabel.column("tgl_sewa")[0].as_py() == datetime.date(2026, 3, 3)
@@ -0,0 +1,74 @@
+# EventStore: event ditulis ke log sebelum diterapkan; perubahan untuk id yang tidak ada ditolak tanpa
+# meninggalkan event di log, sehingga replay menghasilkan state yang sama dengan proyeksi.
+import os
+
+import pytest
+
+from renex import EventStore, StatusBooking, Sedan
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(str(tmp_path))
+    store.simpan_kendaraan(Sedan("C01", "Honda Civic", "L 5678 DEF", 500000, "", "High"))
+    yield store
+    store.tutup()
+
+def test_id_tidak_dikenal_tidak_dicatat(store, tmp_path):
+    seq = store.log.seq_terakhir
+    with pytest.raises(KeyError):
+        store.update_status_kendaraan("C99", False)
+    with pytest.raises(KeyError):
+        store.update_status_booking(12345, StatusBooking.COMPLETED)
+    assert store.log.seq_terakhir == seq
+
+    store.update_status_kendaraan("C01", False)
+    store.tutup()
+    ulang = EventStore(str(tmp_path))
+    assert [k.is_available for k in ulang.load_kendaraan()] == [False]
+    ulang.tutup()
+
+def isi_armada(folder, jumlah):
+    store = EventStore(folder)
+    for i in range(jumlah):
+        store.simpan_kendaraan(Sedan(f"C{i}", f"Mobil {i}", f"L {i} XX", 500000, "", "High"))
+    store.tutup()
+    (nama,) = [nama for nama in os.listdir(folder) if nama.endswith(".log")]
+    return os.path.join(folder, nama)
+
+def test_ekor_terpotong_dibuang(tmp_path):
+    path = isi_armada(str(tmp_path), 5)
+    with open(path, "ab") as f:
+        f.write(b"0badc0de [6,1.0,\"Kendaraan")
+    store = EventStore(str(tmp_path))
+    assert [k.id for k in store.load_kendaraan()] == [f"C{i}" for i in range(5)]
+    assert store.log.seq_terakhir == 5
+    store.simpan_kendaraan(Sedan("C9", "Mobil 9", "L 9 XX", 500000, "", "High"))
+    store.tutup()
+    ulang = EventStore(str(tmp_path))
+    assert len(ulang.load_kendaraan()) == 6
+    ulang.tutup()
+
+def balik_byte(baris, posisi):
+    return baris[:posisi] + bytes([baris[posisi] ^ 0x01]) + baris[posisi + 1:]
+
+@pytest.mark.parametrize("rusak", [
+    lambda baris: balik_byte(baris, 20),  # isi JSON berubah: crc tidak cocok
+    lambda baris: b"zz" + baris[2:],      # crc bukan hex
+    lambda baris: baris[:12] + b"x" + baris[13:],  # seq bukan angka
+])
+def test_korupsi_di_tengah_segmen_ditolak(tmp_path, rusak):
+    path = isi_armada(str(tmp_path), 5)
+    with open(path, "rb") as f:
+        baris = f.readlines()
+    baris[2] = rusak(baris[2])
+    with open(path, "wb") as f:
+        f.writelines(baris)
+    with pytest.raises(ValueError, match="rusak"):
+        EventStore(str(tmp_path))
+    # Baris terakhir ikut rusak: pemulihan tidak boleh memotong log di baris ke-3
+    with open(path, "ab") as f:
+        f.write(b"garbage\n")
+    with pytest.raises(ValueError, match="rusak"):
+        EventStore(str(tmp_path))
+    with open(path, "rb") as f:
+        assert f.read().count(b"\n") == 6
@@ -0,0 +1,90 @@
+# GambarStore diuji offline: pengunduh diganti sumber lokal yang mencatat setiap URL yang diminta.
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+from renex import GambarStore
+
+def png(lebar=1200, tinggi=800):
+    buffer = io.BytesIO()
+    Image.new("RGB", (lebar, tinggi), (200, 30, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+class PengunduhLokal:
+    def __init__(self, isi):
+        self.isi = isi
+        self.diminta = []
+
+    def __call__(self, url):
+        self.diminta.append(url)
+        data = self.isi.get(url)
+        if data is None:
+            raise OSError(f"404: {url}")
+        return data
+
+URL = "https://contoh.renex.id/mobil.png"
+
+@pytest.fixture
+def pengunduh():
+    return PengunduhLokal({URL: png()})
+
+def lebar_webp(data):
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.format == "WEBP"
+        return img.size[0]
+
+def test_url_diunduh_sekali_untuk_semua_ukuran(tmp_path, pengunduh):
+    store = GambarStore(str(tmp_path), pengunduh=pengunduh, unduh_latar=False)
+    for ukuran, lebar in GambarStore.UKURAN.items():
+        assert lebar_webp(store.get(URL, ukuran)) == lebar
+    assert store.get(URL, "kecil") is store.get(URL, "kecil")
+    assert pengunduh.diminta == [URL]
+
+def test_unduhan_latar_tidak_menahan_render(tmp_path, pengunduh):
+    lepas = threading.Event()
+
+    def pengunduh_lambat(url):
+        lepas.wait(10)
+        return pengunduh(url)
+
+    store = GambarStore(str(tmp_path), pengunduh=pengunduh_lambat)
+    # Selama unduhan berjalan, sumber asli dikembalikan tanpa menunggu dan tanpa masuk cache
+    assert store.get(URL, "sedang") == URL
+    assert store.get(URL, "kecil") == URL
+    lepas.set()
+    store.tunggu_unduhan()
+    assert lebar_webp(store.get(URL, "sedang")) == GambarStore.UKURAN["sedang"]
+    assert pengunduh.diminta == [URL]
+
+def test_thumbnail_di_disk_dipakai_ulang_setelah_restart(tmp_path, pengunduh):
+    GambarStore(str(tmp_path), pengunduh=pengunduh, unduh_latar=False).get(URL, "sedang")
+    # Store baru (proses baru) dengan folder yang sama tidak mengunduh lagi
+    store_baru = GambarStore(str(tmp_path), pengunduh=pengunduh)
+    assert lebar_webp(store_baru.get(URL, "besar")) == GambarStore.UKURAN["besar"]
+    assert pengunduh.diminta == [URL]
+
+@pytest.mark.parametrize("unduh_latar", [False, True])
+def test_gagal_unduh_dicoba_ulang_setelah_ttl(tmp_path, pengunduh, unduh_latar):
+    store = GambarStore(str(tmp_path), pengunduh=pengunduh, unduh_latar=unduh_latar)
+    url = "https://contoh.renex.id/sementara.png"
+    assert store.get(url, "sedang") == url
+    store.tunggu_unduhan()
+    assert store.get(url, "sedang") == url
+    assert pengunduh.diminta == [url]
+    # Jaringan pulih: setelah GAGAL_TTL gambar diunduh lagi, bukan sumber asli yang tertahan di cache
+    pengunduh.isi[url] = png()
+    store._gagal[url] = 0
+    store.get(url, "sedang")
+    store.tunggu_unduhan()
+    assert lebar_webp(store.get(url, "sedang")) == GambarStore.UKURAN["sedang"]
+    assert pengunduh.diminta == [url, url]
+
+def test_upload_tanpa_unduhan(tmp_path, pengunduh):
+    store = GambarStore(str(tmp_path), pengunduh=pengunduh)
+    path = store.simpan_upload(png(300, 200))
+    assert lebar_webp(store.get(path, "kecil")) == GambarStore.UKURAN["kecil"]
+    # Gambar lebih kecil dari ukuran target tidak diperbesar
+    assert lebar_webp(store.get(path, "besar")) == 300
+    assert pengunduh.diminta == []
@@ -0,0 +1,53 @@
+# Memo kutipan MesinHarga: hasil yang dihitung dengan aturan lama tidak boleh tersimpan setelah
+# set_aturan mengganti memo di tengah perhitungan.
+import datetime
+
+import pytest
+
+from renex import ATURAN_HARGA, MesinHarga, Sedan
+
+def test_kutipan_aturan_lama_tidak_masuk_memo_baru():
+    mesin = MesinHarga(ATURAN_HARGA)
+    mobil = Sedan("C01", "Honda Civic", "L 5678 DEF", 500000, "", "High")
+    mulai = datetime.date.today() + datetime.timedelta(days=3)
+    selesai = mulai + datetime.timedelta(days=7)
+    aturan_baru = dict(ATURAN_HARGA, tambahan_akhir_pekan=0.5)
+    asli = mesin._jumlah_pengali
+
+    def ganti_aturan_di_tengah(*args):
+        hasil = asli(*args)
+        mesin.set_aturan(aturan_baru)
+        return hasil
+
+    mesin._jumlah_pengali = ganti_aturan_di_tengah
+    mesin.kutipan(mobil, mulai, selesai)
+    mesin._jumlah_pengali = asli
+    assert mesin.kutipan(mobil, mulai, selesai) == MesinHarga(aturan_baru).kutipan(mobil, mulai, selesai)
+
+# Total yang dipatok dihitung manual dari ATURAN_HARGA (akhir pekan +10%, libur +15%, diskon 7/30 hari)
+# untuk Sedan Rp500.000/hari. Tanggal tetap: di dalam atau di luar horizon hasilnya harus sama.
+SEDAN = Sedan("C01", "Honda Civic", "L 5678 DEF", 500000, "", "High")
+
+def tgl(teks):
+    return datetime.date.fromisoformat(teks)
+
+@pytest.mark.parametrize("mulai, selesai, total", [
+    # Senin-Kamis, tanpa akhir pekan: 4 x 500.000
+    ("2027-03-08", "2027-03-12", 2_000_000),
+    # Kamis-Minggu: 2 hari biasa + Sabtu & Minggu x 1,10
+    ("2027-03-11", "2027-03-15", 2_100_000),
+    # Senin-Rabu dengan 17 Agustus (Selasa) x 1,15
+    ("2027-08-16", "2027-08-19", 1_575_000),
+    # 6 hari (Senin-Sabtu): belum dapat diskon, 5 + 1,1 hari
+    ("2027-03-01", "2027-03-07", 3_050_000),
+    # 7 hari (Senin-Minggu): 5 + 2,2 hari, diskon 10%
+    ("2027-03-01", "2027-03-08", 3_240_000),
+    # 29 hari: 21 + 8 x 1,1 hari, masih diskon 10%
+    ("2027-03-01", "2027-03-30", 13_410_000),
+    # 30 hari: 22 + 8 x 1,1 hari, diskon 20%
+    ("2027-03-01", "2027-03-31", 12_320_000),
+])
+def test_total_kutipan(mulai, selesai, total):
+    mesin = MesinHarga(ATURAN_HARGA)
+    assert mesin.kutipan(SEDAN, tgl(mulai), tgl(selesai)) == total
+    assert mesin.kutipan_batch([SEDAN], tgl(mulai), tgl(selesai)).tolist() == [total]
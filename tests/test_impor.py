@@ -0,0 +1,66 @@
+import json
+
+from renex import InventoryManager, Sedan
+from renex.impor import ImportArmada
+
+GAMBAR = {"Hatchback": "img-hatchback", "Sedan": "img-sedan", "SUV": "img-suv"}
+
+def impor(inv, data, nama_file):
+    importer = ImportArmada(inv, GAMBAR)
+    return importer.validasi(importer.baca(data, nama_file))
+
+def test_json_null_dan_tipe_atribut():
+    inv = InventoryManager()
+    inv.tambah_unit(Sedan("C01", "Vios", "L 1 AA", 350000, "", "High"))
+    data = json.dumps([
+        {"kelas": "Hatchback", "merk": "Jazz", "nopol": "l 2 aa", "harga_sewa": 300000, "atribut": 200,
+         "image_url": None},
+        {"kelas": "Sedan", "merk": "Civic", "nopol": "L 3 AA", "harga_sewa": 400000, "atribut": None},
+        {"kelas": "SUV", "merk": "Pajero", "nopol": "L 4 AA", "harga_sewa": 600000, "atribut": True},
+        {"kelas": "Sedan", "merk": None, "nopol": "L 5 AA", "harga_sewa": 400000},
+        {"kelas": "SUV", "merk": "Fortuner", "nopol": "L 1 AA", "harga_sewa": 600000},
+    ]).encode()
+    kendaraan, kesalahan = impor(inv, data, "armada.json")
+
+    jazz, civic, pajero = kendaraan
+    assert jazz.nopol == "L 2 AA" and jazz.image_url == "img-hatchback"
+    assert jazz.kapasitas_bagasi == 200 and type(jazz.kapasitas_bagasi) is int
+    # null tidak boleh menjadi teks "None"
+    assert civic.tingkat_kenyamanan == "Standard" and civic.image_url == "img-sedan"
+    assert pajero.four_wheel_drive is True
+    assert kesalahan == [(4, "merk kosong"), (5, "nopol sudah terdaftar")]
+
+def test_csv_bagasi_int():
+    data = (b"kelas,merk,nopol,harga_sewa,atribut\nHatchback,Brio,L 9 AA,250000,180\n"
+            b"Sedan,Camry,L 7 AA,450000,Luxury\nHatchback,Yaris,L 8 AA,250000,x\n")
+    kendaraan, kesalahan = impor(InventoryManager(), data, "armada.csv")
+    brio, camry = kendaraan
+    assert brio.kapasitas_bagasi == 180 and type(brio.kapasitas_bagasi) is int
+    assert brio.get_detail_info() == "Hatchback - Bagasi: 180L"
+    assert camry.tingkat_kenyamanan == "Luxury"
+    assert kesalahan == [(3, "kapasitas bagasi tidak valid")]
+
+def test_nopol_form_dan_impor_tidak_bisa_ganda():
+    inv = InventoryManager()
+    # Ditambahkan lewat form apa adanya (huruf kecil), lalu file impor memakai huruf besar
+    assert inv.tambah_unit(Sedan("C01", "Vios", "l 1 aa", 350000, "", "High"))
+    data = b"kelas,merk,nopol,harga_sewa,atribut\nSedan,Civic,L 1 AA,400000,High\n"
+    kendaraan, kesalahan = impor(inv, data, "armada.csv")
+    assert kendaraan == [] and kesalahan == [(1, "nopol sudah terdaftar")]
+
+def test_pratinjau_tidak_memakai_id_dan_harga_pecahan_ditolak():
+    inv = InventoryManager()
+    inv.tambah_unit(Sedan("C01", "Vios", "L 1 AA", 350000, "", "High"))
+    data = (b"kelas,merk,nopol,harga_sewa,atribut\nSedan,Civic,L 2 AA,400000,High\n"
+            b"Sedan,Camry,L 3 AA,350000.75,Luxury\nSedan,Altis,L 4 AA,450000.0,High\n")
+    importer = ImportArmada(inv, GAMBAR)
+    df = importer.baca(data, "armada.csv")
+    for _ in range(3):
+        kendaraan, kesalahan = importer.validasi(df)
+    assert [k.id for k in kendaraan] == [None, None]
+    assert [k.harga_sewa for k in kendaraan] == [400000, 450000]
+    assert kesalahan == [(2, "harga_sewa harus bilangan bulat")]
+    # Id baru dialokasikan saat disimpan, melanjutkan id terakhir tanpa celah dari pratinjau
+    assert importer.simpan(kendaraan)
+    assert [k.id for k in kendaraan] == ["C02", "C03"]
+    assert inv.get_mobil_by_nopol("L 4 AA").id == "C03"
@@ -0,0 +1,98 @@
+# Index InventoryManager (id, nopol, kelas, harga) harus selalu sejalan dengan daftar_mobil:
+# unit duplikat ditolak tanpa meninggalkan jejak di index mana pun, baik lewat tambah_unit maupun batch.
+import datetime
+
+import pytest
+
+from renex import Database, EventStore, InventoryManager, KonflikData, Hatchback, Sedan, SUV
+
+def mobil(nomor, kelas=Sedan, harga=500000):
+    atribut = {Hatchback: 250, Sedan: "High", SUV: True}[kelas]
+    return kelas(f"C{nomor:02d}", f"Mobil {nomor}", f"L {nomor} XX", harga, "", atribut)
+
+def cek_index(inv):
+    daftar = inv.get_all_mobil()
+    assert {k.id for k in daftar} == set(inv._by_id) and len(inv._by_id) == len(daftar)
+    assert {k.nopol for k in daftar} == set(inv._by_nopol) and len(inv._by_nopol) == len(daftar)
+    for k in daftar:
+        assert inv.get_mobil_by_id(k.id) is k and inv.get_mobil_by_nopol(k.nopol) is k
+        assert k.id in inv._by_kelas[type(k).__name__]
+    assert sum(len(ids) for ids in inv._by_kelas.values()) == len(daftar)
+    assert inv._harga_keys == sorted(k.harga_sewa for k in daftar)
+    assert sorted(inv._harga_ids) == sorted(inv._by_id)
+
+@pytest.fixture(params=["memori", "sqlite"])
+def inv(request, tmp_path):
+    return InventoryManager(Database(str(tmp_path / "renex.db")) if request.param == "sqlite" else None)
+
+def test_tambah_unit_mengisi_semua_index(inv):
+    assert inv.tambah_unit(mobil(1, Hatchback, 300000))
+    assert inv.tambah_unit(mobil(2, SUV, 700000))
+    assert inv.tambah_unit(mobil(3, Sedan, 500000))
+    cek_index(inv)
+    assert [k.id for k in inv.get_mobil_by_harga(400000, 700000)] == ["C03", "C02"]
+
+def test_tambah_unit_duplikat_ditolak(inv):
+    assert inv.tambah_unit(mobil(1))
+    duplikat_id = Sedan("C01", "Lain", "L 99 ZZ", 400000, "", "High")
+    duplikat_nopol = Sedan("C09", "Lain", "L 1 XX", 400000, "", "High")
+    assert not inv.tambah_unit(duplikat_id)
+    assert not inv.tambah_unit(duplikat_nopol)
+    cek_index(inv)
+    assert inv.get_mobil_by_nopol("L 99 ZZ") is None and inv.get_mobil_by_id("C09") is None
+
+def test_tambah_unit_batch(inv):
+    assert inv.tambah_unit_batch([mobil(i, [Hatchback, Sedan, SUV][i % 3], 300000 + 1000 * (i % 5))
+                                  for i in range(1, 21)])
+    cek_index(inv)
+    assert len(inv._by_kelas["SUV"]) == 7
+    assert inv.alokasi_id(2) == ["C21", "C22"]
+
+# Id sudah terdaftar, nopol sudah terdaftar, dan duplikat di dalam batch itu sendiri
+@pytest.mark.parametrize("batch", [
+    [mobil(5), mobil(1)],
+    [mobil(5), Sedan("C06", "Lain", "L 2 XX", 500000, "", "High")],
+    [mobil(5), mobil(5)],
+])
+def test_tambah_unit_batch_duplikat_ditolak_semua(inv, batch):
+    assert inv.tambah_unit_batch([mobil(1), mobil(2)])
+    assert not inv.tambah_unit_batch(batch)
+    cek_index(inv)
+    assert [k.id for k in inv.get_all_mobil()] == ["C01", "C02"]
+
+def test_reservasi_tidak_membuang_cache_pencarian_tanpa_tanggal():
+    inv = InventoryManager()
+    inv.tambah_unit_batch([mobil(i) for i in range(1, 4)])
+    mulai, selesai = datetime.date(2026, 6, 1), datetime.date(2026, 6, 3)
+    tanpa_tanggal = inv.cari_mobil(kelas="Sedan", urutan="merk")
+    dengan_tanggal = inv.cari_mobil(tgl_mulai=mulai, tgl_selesai=selesai)
+    assert inv.reservasi("C01", mulai, selesai, 1)
+    # Objek hasil yang sama: diambil dari cache, bukan dihitung ulang
+    assert inv.cari_mobil(kelas="Sedan", urutan="merk") is tanpa_tanggal
+    hasil = inv.cari_mobil(tgl_mulai=mulai, tgl_selesai=selesai)
+    assert hasil is not dengan_tanggal and [k.id for k in hasil] == ["C02", "C03"]
+    # Unit baru tetap membuang keduanya
+    inv.tambah_unit(mobil(4))
+    assert len(inv.cari_mobil(kelas="Sedan", urutan="merk")) == 4
+
+def test_nopol_dinormalisasi_di_semua_jalur(inv):
+    assert inv.tambah_unit(Sedan("C01", "Vios", "l  1 aa ", 350000, "", "High"))
+    assert inv.get_mobil_by_id("C01").nopol == "L 1 AA"
+    assert inv.get_mobil_by_nopol("l 1 Aa") is inv.get_mobil_by_id("C01")
+    assert not inv.tambah_unit(Sedan("C02", "Civic", "L 1 AA", 400000, "", "High"))
+    assert not inv.tambah_unit_batch([Sedan("C03", "Camry", "L 1 aa", 450000, "", "High")])
+    cek_index(inv)
+
+@pytest.mark.parametrize("backend", ["sqlite", "eventlog"])
+def test_konflik_storage_sama_di_semua_backend(backend, tmp_path):
+    storage = Database(str(tmp_path / "renex.db")) if backend == "sqlite" else EventStore(str(tmp_path))
+    storage.simpan_kendaraan(mobil(1))
+    with pytest.raises(KonflikData):
+        storage.simpan_kendaraan_batch([mobil(2), mobil(1)])
+    # Unit ditulis proses lain setelah index dimuat: bentrok baru ketahuan di storage
+    inv = InventoryManager()
+    inv.storage = storage
+    assert not inv.tambah_unit(mobil(1))
+    assert not inv.tambah_unit_batch([mobil(3), mobil(1)])
+    if backend == "eventlog":
+        storage.tutup()
@@ -0,0 +1,69 @@
+# Jadwal sewa per kendaraan: interval [mulai, selesai), jadi sewa yang berakhir di hari sewa berikutnya dimulai
+# tidak bentrok. Reservasi yang dibatalkan (per booking_id) langsung membebaskan rentangnya lagi.
+import datetime
+
+import pytest
+
+from renex import InventoryManager, JadwalSewa, Sedan
+
+HARI = datetime.date(2026, 6, 1)
+
+def tgl(n):
+    return HARI + datetime.timedelta(days=n)
+
+@pytest.fixture
+def jadwal():
+    jadwal = JadwalSewa()
+    assert jadwal.tambah(tgl(10), tgl(15), 1)
+    return jadwal
+
+@pytest.mark.parametrize("mulai, selesai", [
+    (10, 15),  # sama persis
+    (8, 11),   # menutup awal
+    (14, 20),  # menutup akhir
+    (11, 13),  # di dalam
+    (5, 25),   # membungkus
+])
+def test_rentang_tumpang_tindih_ditolak(jadwal, mulai, selesai):
+    assert jadwal.bentrok(tgl(mulai), tgl(selesai))
+    assert not jadwal.tambah(tgl(mulai), tgl(selesai), 2)
+    assert jadwal.get_jadwal() == [(tgl(10), tgl(15), 1)]
+
+@pytest.mark.parametrize("mulai, selesai", [(5, 10), (15, 20)])
+def test_rentang_bersentuhan_boleh(jadwal, mulai, selesai):
+    assert not jadwal.bentrok(tgl(mulai), tgl(selesai))
+    assert jadwal.tambah(tgl(mulai), tgl(selesai), 2)
+    assert len(jadwal) == 2
+
+def test_rentang_berdampingan_tetap_terurut(jadwal):
+    assert jadwal.tambah(tgl(15), tgl(20), 3)
+    assert jadwal.tambah(tgl(5), tgl(10), 2)
+    assert jadwal.tambah(tgl(0), tgl(3), 4)
+    assert [booking_id for _, _, booking_id in jadwal.get_jadwal()] == [4, 2, 1, 3]
+    # Celah [3, 5) masih bisa diisi, satu hari lebih panjang sudah bentrok
+    assert not jadwal.bentrok(tgl(3), tgl(5)) and jadwal.bentrok(tgl(3), tgl(6))
+    # get_jadwal(dari_tgl) hanya interval yang belum berakhir
+    assert [booking_id for _, _, booking_id in jadwal.get_jadwal(tgl(10))] == [1, 3]
+
+def test_batal_lalu_pesan_ulang(jadwal):
+    snapshot = jadwal.get_jadwal()
+    # booking_id lain dengan tanggal mulai sama tidak ikut terhapus
+    assert not jadwal.hapus(tgl(10), 99)
+    assert jadwal.hapus(tgl(10), 1)
+    assert not jadwal.hapus(tgl(10), 1)
+    assert snapshot == [(tgl(10), tgl(15), 1)]  # copy-on-write: salinan lama tidak berubah
+    assert jadwal.tambah(tgl(12), tgl(14), 2)
+    assert jadwal.get_jadwal() == [(tgl(12), tgl(14), 2)]
+
+def test_reservasi_inventory_menolak_double_booking():
+    inv = InventoryManager()
+    inv.tambah_unit(Sedan("C01", "Honda Civic", "L 1 XX", 500000, "", "High"))
+    assert inv.reservasi("C01", tgl(1), tgl(3), 1)
+    assert not inv.reservasi("C01", tgl(2), tgl(4), 2)
+    assert not inv.is_tersedia("C01", tgl(2), tgl(2))
+    # Sewa di hari yang sama dihitung satu hari: [3, 4) bersentuhan dengan [1, 3)
+    assert inv.reservasi("C01", tgl(3), tgl(3), 3)
+    assert not inv.reservasi("C99", tgl(1), tgl(3), 4)
+    assert inv.batalkan_reservasi("C01", tgl(1), 1)
+    assert inv.is_tersedia("C01", tgl(1), tgl(3))
+    assert inv.reservasi("C01", tgl(1), tgl(3), 5)
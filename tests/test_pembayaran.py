@@ -0,0 +1,116 @@
+# Verifikasi pembayaran berjalan di worker asyncio: thread pemanggil (script Streamlit / API) tidak boleh
+# ikut menunggu gateway, dan retry hanya untuk timeout / error, bukan untuk penolakan.
+import asyncio
+import datetime
+import gc
+import threading
+import time
+
+import pytest
+
+from renex import (BookingService, InventoryManager, GatewayPembayaran, GatewayPalsu, PemrosesPembayaran,
+                   Pembayaran, User, MetodeBayar, StatusBooking, Sedan)
+
+class GatewayUrutan(GatewayPembayaran):
+    # Menjalankan skenario per panggilan: True / False dijawab, "timeout" menggantung, "error" melempar
+    def __init__(self, skenario):
+        self.skenario = list(skenario)
+        self.panggilan = 0
+
+    async def verifikasi(self, pembayaran):
+        langkah = self.skenario[min(self.panggilan, len(self.skenario) - 1)]
+        self.panggilan += 1
+        if langkah == "timeout":
+            await asyncio.sleep(60)
+        if langkah == "error":
+            raise ConnectionError("gateway tidak bisa dihubungi")
+        return langkah
+
+def verifikasi(pemroses, metode=MetodeBayar.QRIS):
+    hasil = []
+    selesai = threading.Event()
+    pemroses.ajukan(Pembayaran(1, 100000, metode), lambda sukses: (hasil.append(sukses), selesai.set()))
+    assert selesai.wait(10), "callback tidak pernah dipanggil"
+    return hasil[0]
+
+@pytest.fixture
+def buat_pemroses():
+    daftar = []
+
+    def buat(gateways, **kwargs):
+        daftar.append(PemrosesPembayaran(gateways, **kwargs))
+        return daftar[-1]
+
+    yield buat
+    # Beri waktu _proses yang baru saja memanggil callback untuk selesai sebelum loop dihentikan
+    time.sleep(0.1)
+    for pemroses in daftar:
+        pemroses.hentikan()
+
+def test_throughput_booking_tidak_bergantung_latensi_gateway(buat_pemroses):
+    jumlah = 200
+    waktu = {}
+    for latensi in (0.0, 0.5, 2.0):
+        inv = InventoryManager()
+        inv.tambah_unit_batch([Sedan(f"C{i:03d}", f"Mobil {i}", f"L {i:03d} XX", 500000, "", "High")
+                               for i in range(jumlah)])
+        pemroses = buat_pemroses({metode: GatewayPalsu(latensi) for metode in MetodeBayar}, maks_paralel=jumlah)
+        service = BookingService(inv, pemroses_pembayaran=pemroses)
+        user = User(1, "Budi", "budi@test.renex.id")
+        mulai = datetime.date(2026, 6, 1)
+
+        # Full GC (generasi 2) dengan banyak objek dari tes lain bisa jatuh di jendela ukur
+        gc.collect()
+        t0 = time.perf_counter()
+        bookings = [service.buat_pesanan(user, f"C{i:03d}", mulai, mulai + datetime.timedelta(days=2),
+                                         MetodeBayar.QRIS) for i in range(jumlah)]
+        waktu[latensi] = time.perf_counter() - t0
+        if latensi:
+            assert all(b.status_booking == StatusBooking.PENDING for b in bookings)
+
+        batas = time.monotonic() + latensi + 5
+        while service.jumlah_bookings_aktif() < jumlah and time.monotonic() < batas:
+            time.sleep(0.02)
+        assert service.jumlah_bookings_aktif() == jumlah
+
+    # Membuat 200 booking jauh lebih cepat dari satu round-trip gateway, dan tidak melambat bila gateway lambat
+    assert waktu[2.0] < 0.5
+    assert waktu[2.0] < 3 * waktu[0.0] + 0.05, waktu
+
+def test_penolakan_tidak_dicoba_ulang(buat_pemroses):
+    gateway = GatewayUrutan([False])
+    pemroses = buat_pemroses({MetodeBayar.QRIS: gateway}, maks_percobaan=3, jeda_retry=1.0)
+    t0 = time.perf_counter()
+    assert verifikasi(pemroses) is False
+    assert gateway.panggilan == 1
+    assert time.perf_counter() - t0 < 0.5
+
+def test_timeout_dan_error_dicoba_ulang(buat_pemroses):
+    gateway = GatewayUrutan(["timeout", "error", True])
+    pemroses = buat_pemroses({MetodeBayar.QRIS: gateway}, timeout=0.1, maks_percobaan=3, jeda_retry=0.05)
+    assert verifikasi(pemroses) is True
+    assert gateway.panggilan == 3
+
+def test_tidak_ada_backoff_setelah_percobaan_terakhir(buat_pemroses):
+    gateway = GatewayUrutan(["error"])
+    pemroses = buat_pemroses({MetodeBayar.QRIS: gateway}, maks_percobaan=3, jeda_retry=0.2)
+    t0 = time.perf_counter()
+    assert verifikasi(pemroses) is False
+    # Jeda 0.2 + 0.4 di antara tiga percobaan; backoff 0.8 setelah percobaan terakhir tidak boleh ada
+    assert gateway.panggilan == 3
+    assert time.perf_counter() - t0 < 1.0
+
+def test_backoff_tidak_menahan_slot_paralel(buat_pemroses):
+    gagal = GatewayUrutan(["error", True])
+    lancar = GatewayUrutan([True])
+    pemroses = buat_pemroses({MetodeBayar.QRIS: gagal, MetodeBayar.TRANSFER_BANK: lancar},
+                             maks_percobaan=2, jeda_retry=1.0, maks_paralel=1)
+    pertama = threading.Event()
+    pemroses.ajukan(Pembayaran(1, 100000, MetodeBayar.QRIS), lambda sukses: pertama.set())
+    while gagal.panggilan == 0:
+        time.sleep(0.01)
+    # Pembayaran pertama sedang backoff 1 detik; satu-satunya slot harus bebas untuk pembayaran lain
+    t0 = time.perf_counter()
+    assert verifikasi(pemroses, MetodeBayar.TRANSFER_BANK) is True
+    assert time.perf_counter() - t0 < 0.5
+    assert pertama.wait(5) and gagal.panggilan == 2
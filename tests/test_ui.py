@@ -0,0 +1,48 @@
+# Menu UI lewat AppTest Streamlit: Admin Dashboard (semua pesanan, impor armada, laporan keuangan) hanya
+# untuk email di RENEX_ADMIN_EMAILS; user yang mendaftar sendiri tidak mendapat menu itu.
+import os
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from renex import layanan
+
+SCRIPT_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+@pytest.fixture
+def layanan_sementara(tmp_path, monkeypatch):
+    # Dijalankan dari folder sementara agar thumbnail GambarStore ("car_images") tidak mengotori repo
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(layanan, "DB_PATH", str(tmp_path / "renex.db"))
+    monkeypatch.setattr(layanan, "STORAGE", "sqlite")
+    monkeypatch.setattr(layanan, "ADMIN_EMAILS", {"admin@renex.id"})
+    monkeypatch.setenv("RENEX_LATENSI_GATEWAY", "0")
+    monkeypatch.setattr(layanan, "_layanan", {})
+    yield
+    _, service = layanan.get_services()
+    time.sleep(0.1)
+    service.pemroses_pembayaran.hentikan()
+
+def buka(user, menu=None):
+    at = AppTest.from_file(SCRIPT_APP, default_timeout=60)
+    at.session_state["user"] = user
+    if menu:
+        at.session_state["menu"] = menu
+    at.run()
+    assert not at.exception
+    return at
+
+def test_user_biasa_tidak_mendapat_menu_admin(layanan_sementara):
+    user = layanan.get_user("Budi", "budi@renex.id", "rahasia")
+    at = buka(user)
+    assert list(at.sidebar.radio(key="menu").options) == ["Katalog Mobil", "Pesanan Saya"]
+    # Menu admin yang dipaksa lewat session state jatuh kembali ke katalog
+    at = buka(user, "Admin Dashboard")
+    assert at.session_state["menu"] == "Katalog Mobil"
+    assert "Panel Admin" not in [judul.value for judul in at.title]
+
+def test_admin_mendapat_menu_admin(layanan_sementara):
+    admin = layanan.get_user("Admin", "admin@renex.id", "rahasia-admin")
+    assert "Admin Dashboard" in buka(admin).sidebar.radio(key="menu").options
+    assert "Panel Admin" in [judul.value for judul in buka(admin, "Admin Dashboard").title]